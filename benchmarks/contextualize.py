@@ -0,0 +1,107 @@
+"""Measure the contention of ``contextualize()`` across threads and asyncio tasks.
+
+Run with ``python benchmarks/contextualize.py``. The current implementation is compared to the
+previous one, which acquired the lock of the core on entry and on exit (it is re-implemented
+below). Each scenario is run while the logger is idle, then while a background thread adds and
+removes a handler in a loop, the sink taking some time to be stopped.
+"""
+
+import asyncio
+import contextlib
+import threading
+import time
+
+from loguru import logger
+from loguru._logger import context
+
+THREADS = 8
+THREAD_ITERATIONS = 5000
+TASKS = 100
+TASK_ITERATIONS = 500
+STOP_DURATION = 0.002
+
+
+@contextlib.contextmanager
+def locked_contextualize(**kwargs):
+    with logger._core.lock:
+        token = context.set({**context.get(), **kwargs})
+    try:
+        yield
+    finally:
+        with logger._core.lock:
+            context.reset(token)
+
+
+class SlowStoppingSink:
+    def write(self, message):
+        pass
+
+    def stop(self):
+        time.sleep(STOP_DURATION)
+
+
+def churn(stopped):
+    while not stopped.is_set():
+        handler_id = logger.add(SlowStoppingSink())
+        logger.remove(handler_id)
+
+
+def run_threads(contextualize):
+    def worker(index):
+        for _ in range(THREAD_ITERATIONS):
+            with contextualize(request_id=index):
+                pass
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(THREADS)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return THREADS * THREAD_ITERATIONS / (time.perf_counter() - start)
+
+
+def run_tasks(contextualize):
+    async def worker(index):
+        for _ in range(TASK_ITERATIONS):
+            with contextualize(request_id=index):
+                await asyncio.sleep(0)
+
+    async def main():
+        await asyncio.gather(*(worker(i) for i in range(TASKS)))
+
+    start = time.perf_counter()
+    asyncio.run(main())
+    return TASKS * TASK_ITERATIONS / (time.perf_counter() - start)
+
+
+def measure(with_churn):
+    results = []
+    for run in (run_threads, run_tasks):
+        for contextualize in (locked_contextualize, logger.contextualize):
+            stopped = threading.Event()
+            churner = threading.Thread(target=churn, args=(stopped,))
+            if with_churn:
+                churner.start()
+            try:
+                results.append(run(contextualize))
+            finally:
+                stopped.set()
+                if with_churn:
+                    churner.join()
+    return results
+
+
+def main():
+    logger.remove()
+    print("scenario | threads: locked / current (ctx/s) | tasks: locked / current (ctx/s)")
+    for name, with_churn in [("idle", False), ("churn", True)]:
+        threads_locked, threads_current, tasks_locked, tasks_current = measure(with_churn)
+        print(
+            "%-8s | %15.0f / %-15.0f | %13.0f / %-13.0f"
+            % (name, threads_locked, threads_current, tasks_locked, tasks_current)
+        )
+
+
+if __name__ == "__main__":
+    main()
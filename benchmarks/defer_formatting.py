@@ -0,0 +1,63 @@
+"""Measure the cost of a logging call for enqueued handlers, depending on ``defer_formatting``.
+
+Run with ``python benchmarks/defer_formatting.py``. The writer thread is kept waiting while the
+messages are logged, so that only the work done by the caller is measured (with a running writer,
+both threads would compete for the GIL). This requires ``enqueue="thread"``: a multiprocessing
+queue can't hold that many messages without its writer consuming them.
+"""
+
+import threading
+import timeit
+
+from loguru import logger
+
+NUMBER = 20000
+REPEAT = 5
+
+FORMAT = (
+    "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | "
+    "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> | "
+    "{extra[request_id]} - <level>{message}</level>"
+)
+
+
+def measure(defer_formatting, **kwargs):
+    released = threading.Event()
+
+    def sink(message):
+        released.wait()
+
+    logger.remove()
+    logger.add(
+        sink,
+        format=FORMAT,
+        colorize=True,
+        enqueue="thread",
+        defer_formatting=defer_formatting,
+        **kwargs,
+    )
+    request_logger = logger.bind(request_id="8f3a9c")
+
+    timings = []
+    for _ in range(REPEAT):
+        released.clear()
+        timings.append(
+            timeit.timeit(lambda: request_logger.info("User {} fetched", 42), number=NUMBER)
+        )
+        released.set()
+        logger.complete()
+
+    logger.remove()
+    return min(timings) / NUMBER
+
+
+def main():
+    print("options         | eager (us) | deferred (us)")
+    for name, kwargs in [("-", {}), ("serialize=True", {"serialize": True})]:
+        eager = measure(False, **kwargs)
+        deferred = measure(True, **kwargs)
+        print("%-15s | %10.2f | %13.2f" % (name, eager * 1e6, deferred * 1e6))
+
+
+if __name__ == "__main__":
+    main()
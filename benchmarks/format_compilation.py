@@ -0,0 +1,81 @@
+"""Measure the rendering of handler formats compiled into functions, against ``str.format_map()``.
+
+Run with ``python benchmarks/format_compilation.py``. For each format, it prints the average time
+to render a record with the compiled function and with the ``format_map()`` fallback, then the
+average duration of a logging call to three handlers in both cases (their formats slightly differ,
+so that each of them renders the message).
+"""
+
+import timeit
+
+import loguru._format_compiler
+from loguru import logger
+
+NUMBER = 100000
+LOGGING_NUMBER = 20000
+REPEAT = 5
+
+FORMATS = [
+    "{level: <8} | {name}:{function}:{line} - {message}",
+    "{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {name}:{function}:{line} - {message}",
+    "{time:HH:mm} {level.name} [{extra[request_id]}] {thread.name} - {message}",
+]
+
+
+def capture_record():
+    records = []
+    logger.remove()
+    logger.add(lambda message: records.append(message.record), format="{message}")
+    logger.bind(request_id="8f3a9c").info("Message")
+    logger.remove()
+    return records[0]
+
+
+def measure_rendering(format_, record):
+    compiled = loguru._format_compiler._generate_renderer(format_)
+    fallback = loguru._format_compiler._make_fallback_renderer(format_)
+    results = []
+    for render in (compiled, fallback):
+        timings = timeit.repeat(
+            lambda render=render: render(record, "", "Message"), number=NUMBER, repeat=REPEAT
+        )
+        results.append(min(timings) / NUMBER)
+    return results
+
+
+def measure_logging(format_, compiled):
+    generate_renderer = loguru._format_compiler._generate_renderer
+    if not compiled:
+        loguru._format_compiler._generate_renderer = lambda _: None
+    try:
+        logger.remove()
+        for i in range(3):
+            logger.add(lambda _: None, format=format_ + " " * i)
+    finally:
+        loguru._format_compiler._generate_renderer = generate_renderer
+
+    request_logger = logger.bind(request_id="8f3a9c")
+    timings = timeit.repeat(
+        lambda: request_logger.info("Message"), number=LOGGING_NUMBER, repeat=REPEAT
+    )
+    logger.remove()
+    return min(timings) / LOGGING_NUMBER
+
+
+def main():
+    record = capture_record()
+    for format_ in FORMATS:
+        compiled, fallback = measure_rendering(format_, record)
+        print(format_)
+        print(
+            "  render:  compiled %6.3f us | format_map %6.3f us" % (compiled * 1e6, fallback * 1e6)
+        )
+        compiled = measure_logging(format_, True)
+        fallback = measure_logging(format_, False)
+        print(
+            "  logging: compiled %6.2f us | format_map %6.2f us" % (compiled * 1e6, fallback * 1e6)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Measure the throughput and the precision of the ``time_resolution`` option of ``configure()``.
+
+Run with ``python benchmarks/time_resolution.py``. For each resolution, it prints the average
+duration of a call to the clock and of a logging call, and how much older than the actual time of
+the call the time of the record is (on average and at worst).
+"""
+
+import timeit
+from datetime import datetime, timedelta, timezone
+
+from loguru import logger
+
+RESOLUTIONS = [0, 0.0001, 0.001, 0.01]
+NUMBER = 100000
+REPEAT = 5
+
+
+def measure_throughput(resolution):
+    logger.remove()
+    logger.configure(time_resolution=resolution)
+    logger.add(lambda _: None, format="{time} {level} {message}")
+    clock = logger._core.clock
+    clock_timings = timeit.repeat(clock, number=NUMBER, repeat=REPEAT)
+    call_timings = timeit.repeat(lambda: logger.info("Message"), number=NUMBER, repeat=REPEAT)
+    return min(clock_timings) / NUMBER, min(call_timings) / NUMBER
+
+
+def measure_precision(resolution):
+    lags = []
+
+    def sink(message):
+        lags.append(datetime.now(timezone.utc) - message.record["time"])
+
+    logger.remove()
+    logger.configure(time_resolution=resolution)
+    logger.add(sink, format="{message}")
+    for _ in range(NUMBER):
+        logger.info("Message")
+
+    return sum(lags, timedelta()) / len(lags), max(lags)
+
+
+def main():
+    print("resolution (s) | clock (us) | call (us) | mean lag (us) | max lag (us)")
+    for resolution in RESOLUTIONS:
+        clock_duration, call_duration = measure_throughput(resolution)
+        mean_lag, max_lag = measure_precision(resolution)
+        print(
+            "%14g | %10.3f | %9.2f | %13.1f | %12.1f"
+            % (
+                resolution,
+                clock_duration * 1e6,
+                call_duration * 1e6,
+                mean_lag.total_seconds() * 1e6,
+                max_lag.total_seconds() * 1e6,
+            )
+        )
+    logger.remove()
+    logger.configure(time_resolution=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -41,9 +41,9 @@ else:
     from typing_extensions import ContextManager
 
 if sys.version_info >= (3, 8):
-    from typing import Protocol, TypedDict
+    from typing import Literal, Protocol, TypedDict
 else:
-    from typing_extensions import Protocol, TypedDict
+    from typing_extensions import Literal, Protocol, TypedDict
 
 if sys.version_info >= (3, 14):
     import string.templatelib
@@ -117,6 +117,7 @@ class Record(TypedDict):
 
 class Message(str):
     record: Record
+    sequence: Optional[int]
 
 class Writable(Protocol):
     def write(self, message: Message) -> Any: ...
@@ -140,7 +141,15 @@ class BasicHandlerConfig(TypedDict, total=False):
     serialize: bool
     backtrace: bool
     diagnose: bool
-    enqueue: bool
+    enqueue: Union[bool, Literal["thread", "shared_memory"]]
+    defer_formatting: bool
+    batch_size: int
+    batch_bytes: int
+    queue_size: Optional[int]
+    overflow: str
+    shedding: Optional[Union[float, timedelta]]
+    priority: Optional[Union[str, int]]
+    on_fork: Literal["share", "restart"]
     catch: bool
 
 class FileHandlerConfig(TypedDict, total=False):
@@ -152,7 +161,15 @@ class FileHandlerConfig(TypedDict, total=False):
     serialize: bool
     backtrace: bool
     diagnose: bool
-    enqueue: bool
+    enqueue: Union[bool, Literal["thread", "shared_memory"]]
+    defer_formatting: bool
+    batch_size: int
+    batch_bytes: int
+    queue_size: Optional[int]
+    overflow: str
+    shedding: Optional[Union[float, timedelta]]
+    priority: Optional[Union[str, int]]
+    on_fork: Literal["share", "restart"]
     catch: bool
     rotation: Optional[
         Union[
@@ -177,7 +194,7 @@ class FileHandlerConfig(TypedDict, total=False):
     opener: Optional[StandardOpener]
 
 class AsyncHandlerConfig(TypedDict, total=False):
-    sink: Callable[[Message], Awaitable[None]]
+    sink: Union[Callable[[Message], Awaitable[None]], Callable[[List[Message]], Awaitable[None]]]
     level: Union[str, int]
     format: Union[str, FormatFunction]
     filter: Optional[Union[str, FilterFunction, FilterDict]]
@@ -185,10 +202,20 @@ class AsyncHandlerConfig(TypedDict, total=False):
     serialize: bool
     backtrace: bool
     diagnose: bool
-    enqueue: bool
+    enqueue: Union[bool, Literal["thread", "shared_memory"]]
+    defer_formatting: bool
+    batch_size: int
+    batch_bytes: int
+    queue_size: Optional[int]
+    overflow: str
+    shedding: Optional[Union[float, timedelta]]
+    priority: Optional[Union[str, int]]
+    on_fork: Literal["share", "restart"]
     catch: bool
     context: Optional[Union[str, BaseContext]]
     loop: Optional[AbstractEventLoop]
+    batch: Optional[int]
+    max_in_flight: Optional[int]
 
 HandlerConfig = Union[BasicHandlerConfig, FileHandlerConfig, AsyncHandlerConfig]
 
@@ -213,14 +240,24 @@ class Logger:
         serialize: bool = ...,
         backtrace: bool = ...,
         diagnose: bool = ...,
-        enqueue: bool = ...,
+        enqueue: Union[bool, Literal["thread", "shared_memory"]] = ...,
+        defer_formatting: bool = ...,
+        batch_size: int = ...,
+        batch_bytes: int = ...,
+        queue_size: Optional[int] = ...,
+        overflow: str = ...,
+        shedding: Optional[Union[float, timedelta]] = ...,
+        priority: Optional[Union[str, int]] = ...,
+        on_fork: Literal["share", "restart"] = ...,
         context: Optional[Union[str, BaseContext]] = ...,
         catch: bool = ...
     ) -> int: ...
     @overload
     def add(
         self,
-        sink: Callable[[Message], Awaitable[None]],
+        sink: Union[
+            Callable[[Message], Awaitable[None]], Callable[[List[Message]], Awaitable[None]]
+        ],
         *,
         level: Union[str, int] = ...,
         format: Union[str, FormatFunction] = ...,
@@ -229,10 +266,20 @@ class Logger:
         serialize: bool = ...,
         backtrace: bool = ...,
         diagnose: bool = ...,
-        enqueue: bool = ...,
+        enqueue: Union[bool, Literal["thread", "shared_memory"]] = ...,
+        defer_formatting: bool = ...,
+        batch_size: int = ...,
+        batch_bytes: int = ...,
+        queue_size: Optional[int] = ...,
+        overflow: str = ...,
+        shedding: Optional[Union[float, timedelta]] = ...,
+        priority: Optional[Union[str, int]] = ...,
+        on_fork: Literal["share", "restart"] = ...,
         catch: bool = ...,
         context: Optional[Union[str, BaseContext]] = ...,
-        loop: Optional[AbstractEventLoop] = ...
+        loop: Optional[AbstractEventLoop] = ...,
+        batch: Optional[int] = ...,
+        max_in_flight: Optional[int] = ...
     ) -> int: ...
     @overload
     def add(
@@ -246,7 +293,15 @@ class Logger:
         serialize: bool = ...,
         backtrace: bool = ...,
         diagnose: bool = ...,
-        enqueue: bool = ...,
+        enqueue: Union[bool, Literal["thread", "shared_memory"]] = ...,
+        defer_formatting: bool = ...,
+        batch_size: int = ...,
+        batch_bytes: int = ...,
+        queue_size: Optional[int] = ...,
+        overflow: str = ...,
+        shedding: Optional[Union[float, timedelta]] = ...,
+        priority: Optional[Union[str, int]] = ...,
+        on_fork: Literal["share", "restart"] = ...,
         context: Optional[Union[str, BaseContext]] = ...,
         catch: bool = ...,
         rotation: Optional[
@@ -318,6 +373,7 @@ class Logger:
     ) -> Level: ...
     def disable(self, name: Optional[str]) -> None: ...
     def enable(self, name: Optional[str]) -> None: ...
+    def is_enabled(self, level: Union[int, str]) -> bool: ...
     def configure(
         self,
         *,
@@ -325,7 +381,9 @@ class Logger:
         levels: Optional[Sequence[LevelConfig]] = ...,
         extra: Optional[Dict[Any, Any]] = ...,
         patcher: Optional[PatcherFunction] = ...,
-        activation: Optional[Sequence[ActivationConfig]] = ...
+        activation: Optional[Sequence[ActivationConfig]] = ...,
+        time_resolution: Optional[Union[float, timedelta]] = ...,
+        writers: Optional[int] = ...
     ) -> List[int]: ...
     def reinstall(self) -> None: ...
     # @staticmethod cannot be used with @overload in mypy (python/mypy#7781).
@@ -1,5 +1,6 @@
 import re
 from contextlib import contextmanager
+from functools import lru_cache
 from string import Formatter
 
 
@@ -387,6 +388,88 @@ class ColoredFormat:
         return coloring
 
 
+class ColoredTemplate:
+    """A message parsed once, whose fields only need to be formatted for each logging call."""
+
+    _formatter = Formatter()
+
+    def __init__(self, tokens, fields):
+        self._tokens = tokens
+        self._fields = fields
+
+    def format(self, args, kwargs):
+        formatter = self._formatter
+        tokens = list(self._tokens)
+
+        for index, field_name, conversion, format_spec in self._fields:
+            with try_formatting(KeyError, IndexError, AttributeError):
+                obj, _ = formatter.get_field(field_name, args, kwargs)
+
+            obj = formatter.convert_field(obj, conversion)
+            tokens[index] = (TokenType.TEXT, formatter.format_field(obj, format_spec))
+
+        return tokens
+
+
+# The messages longer than this are not cached, so that the cache doesn't keep large strings alive.
+MAX_CACHED_MESSAGE_LENGTH = 512
+
+
+@lru_cache(maxsize=256)
+def parse_template(string):
+    # Only the messages which can be parsed without error and whose format specs don't contain
+    # nested fields are cached. The other ones are handled by "_parse_with_formatting()" which
+    # raises the appropriate error or processes the nested fields according to the arguments.
+    parser = AnsiParser()
+    fields = []
+    auto_arg_index = 0
+
+    try:
+        parsing_output = list(Formatter().parse(string))
+    except ValueError:
+        return None
+
+    for literal_text, field_name, format_spec, conversion in parsing_output:
+        try:
+            parser.feed(literal_text)
+        except ValueError:
+            return None
+
+        if field_name is None:
+            continue
+
+        if "{" in format_spec or "}" in format_spec:
+            return None
+
+        if field_name == "":
+            if auto_arg_index is False:
+                return None
+            field_name = str(auto_arg_index)
+            auto_arg_index += 1
+        elif field_name.isdigit():
+            if auto_arg_index:
+                return None
+            auto_arg_index = False
+
+        fields.append((len(parser._tokens), field_name, conversion, format_spec))
+        parser.feed("", raw=True)
+
+    try:
+        tokens = parser.done()
+    except ValueError:
+        return None
+
+    return ColoredTemplate(tuple(tokens), tuple(fields))
+
+
+@lru_cache(maxsize=256)
+def parse_simple_message(string):
+    parser = AnsiParser()
+    parser.feed(string)
+    tokens = parser.done()
+    return ColoredMessage(tokens)
+
+
 class Colorizer:
     @staticmethod
     def prepare_format(string):
@@ -395,15 +478,23 @@ class Colorizer:
 
     @staticmethod
     def prepare_message(string, args=(), kwargs={}):  # noqa: B006
-        tokens = Colorizer._parse_with_formatting(string, args, kwargs)
+        # Messages are usually constant, their parsing is cached so that only the fields need to
+        # be formatted for each call.
+        if type(string) is str and len(string) <= MAX_CACHED_MESSAGE_LENGTH:
+            template = parse_template(string)
+        else:
+            template = None
+        if template is None:
+            tokens = Colorizer._parse_with_formatting(string, args, kwargs)
+        else:
+            tokens = template.format(args, kwargs)
         return ColoredMessage(tokens)
 
     @staticmethod
     def prepare_simple_message(string):
-        parser = AnsiParser()
-        parser.feed(string)
-        tokens = parser.done()
-        return ColoredMessage(tokens)
+        if len(string) > MAX_CACHED_MESSAGE_LENGTH:
+            return parse_simple_message.__wrapped__(string)
+        return parse_simple_message(string)
 
     @staticmethod
     def ansify(text):
@@ -3,7 +3,9 @@ from calendar import day_abbr, day_name, month_abbr, month_name
 from datetime import datetime as datetime_
 from datetime import timedelta, timezone
 from functools import lru_cache, partial
-from time import localtime, strftime
+from time import localtime, monotonic, strftime, time
+
+from ._defaults import LOGURU_TZ
 
 tokens = r"H{1,2}|h{1,2}|m{1,2}|s{1,2}|S+|YYYY|YY|M{1,4}|D{1,4}|Z{1,2}|zz|A|X|x|E|Q|dddd|ddd|d"
 
@@ -172,8 +174,76 @@ def _get_tzinfo(timestamp):
         return _fallback_tzinfo(timestamp)
 
 
-def aware_now():
+# The local timezone offset can only change at a whole minute boundary (the offsets of all timezones
+# are a whole number of minutes). It's thus enough to compute it once per minute instead of once per
+# logging call. The local wall-clock minute is cached as well, so that a change of the timezone
+# in the middle of the minute (which shifts the local time) invalidates the cache. So does the
+# replacement of the "localtime()" function, e.g. when tests are mocking the time.
+_tzinfo_cache = (0, 0, None, None, None)
+
+
+def _aware_now_local():
+    global _tzinfo_cache
+
+    timestamp = time()
     now = datetime_.now()
-    timestamp = now.timestamp()
-    tzinfo = _get_tzinfo(timestamp)
-    return datetime.combine(now.date(), now.time().replace(tzinfo=tzinfo))
+    start, end, local_minute, cached_localtime, tzinfo = _tzinfo_cache
+    minute = (now.day, now.hour, now.minute)
+
+    if not (start <= timestamp < end and minute == local_minute and cached_localtime is localtime):
+        start = timestamp // 60 * 60
+        tzinfo = _get_tzinfo(timestamp)
+        _tzinfo_cache = (start, start + 60, minute, localtime, tzinfo)
+
+    # Building the datetime from the timestamp would be faster, but the float value does not have
+    # enough precision to always retrieve the exact microseconds.
+    return datetime(
+        now.year, now.month, now.day, now.hour, now.minute, now.second, now.microsecond, tzinfo
+    )
+
+
+def _aware_now_utc():
+    return datetime.now(timezone.utc)
+
+
+def _load_aware_now_function(tz):
+    if tz is None or tz.lower() == "local":
+        return _aware_now_local
+    if tz.upper() == "UTC":
+        return _aware_now_utc
+    raise ValueError(
+        "Invalid environment variable 'LOGURU_TZ' (expected 'local' or 'UTC'): '%s'" % tz
+    )
+
+
+_aware_now = _load_aware_now_function(LOGURU_TZ)
+
+
+def aware_now():
+    return _aware_now()
+
+
+class CoarseClock:
+    """Return the current time, computed at most once per ``resolution`` seconds.
+
+    In between, the same datetime is shared by all the callers. The refresh is driven by the
+    monotonic clock, so it's not affected by changes of the system time.
+    """
+
+    def __init__(self, resolution):
+        self.resolution = resolution
+        self._cache = (float("-inf"), None)
+
+    def __call__(self):
+        timestamp = monotonic()
+        deadline, now = self._cache
+
+        if timestamp >= deadline:
+            now = aware_now()
+            self._cache = (timestamp + self.resolution, now)
+
+        return now
+
+    def __reduce__(self):
+        # The monotonic clock is not shared between processes, the cache must not be transferred.
+        return (CoarseClock, (self.resolution,))
@@ -24,10 +24,18 @@ def env(key, type_, default=None):
             raise ValueError(
                 "Invalid environment variable '%s' (expected an integer): '%s'" % (key, val)
             ) from None
+    if type_ is float:
+        try:
+            return float(val)
+        except ValueError:
+            raise ValueError(
+                "Invalid environment variable '%s' (expected a number): '%s'" % (key, val)
+            ) from None
     raise ValueError("The requested type '%s' is not supported" % type_.__name__)
 
 
 LOGURU_AUTOINIT = env("LOGURU_AUTOINIT", bool, True)
+LOGURU_TZ = env("LOGURU_TZ", str, None)
 
 LOGURU_FORMAT = env(
     "LOGURU_FORMAT",
@@ -43,6 +51,15 @@ LOGURU_SERIALIZE = env("LOGURU_SERIALIZE", bool, False)
 LOGURU_BACKTRACE = env("LOGURU_BACKTRACE", bool, True)
 LOGURU_DIAGNOSE = env("LOGURU_DIAGNOSE", bool, True)
 LOGURU_ENQUEUE = env("LOGURU_ENQUEUE", bool, False)
+LOGURU_DEFER_FORMATTING = env("LOGURU_DEFER_FORMATTING", bool, False)
+LOGURU_BATCH_SIZE = env("LOGURU_BATCH_SIZE", int, 100)
+LOGURU_BATCH_BYTES = env("LOGURU_BATCH_BYTES", int, 65536)
+LOGURU_QUEUE_SIZE = env("LOGURU_QUEUE_SIZE", int, None)
+LOGURU_OVERFLOW = env("LOGURU_OVERFLOW", str, "block")
+LOGURU_SHEDDING = env("LOGURU_SHEDDING", float, None)
+LOGURU_PRIORITY = env("LOGURU_PRIORITY", str, None)
+LOGURU_ON_FORK = env("LOGURU_ON_FORK", str, "share")
+LOGURU_SHARED_MEMORY_SIZE = env("LOGURU_SHARED_MEMORY_SIZE", int, 4194304)
 LOGURU_CONTEXT = env("LOGURU_CONTEXT", str, None)
 LOGURU_CATCH = env("LOGURU_CATCH", bool, True)
 
@@ -212,6 +212,15 @@ class FileSink:
 
         self._file.write(message)
 
+    def write_many(self, messages):
+        if self._file is None or self._watch or self._rotation_function is not None:
+            # The file must be checked before writing each message.
+            for message in messages:
+                self.write(message)
+        else:
+            # The messages are joined because a line-buffered file is flushed after each line.
+            self._file.write("".join(messages))
+
     def stop(self):
         if self._watch:
             self._reopen_if_needed()
@@ -221,6 +230,21 @@ class FileSink:
     def tasks_to_complete(self):
         return []
 
+    def reopen(self):
+        # Called in a forked child process, so that it doesn't share the file object of its parent.
+        # The file is re-opened in append mode, since the parent may keep writing to it.
+        if self._file is None:
+            return
+
+        path = self._file_path
+        self._file.close()
+        self._file = open(path, **{**self._kwargs, "mode": "a"})
+
+        if self._watch:
+            result = os.fstat(self._file.fileno())
+            self._file_dev = result[ST_DEV]
+            self._file_ino = result[ST_INO]
+
     def _create_path(self):
         path = self._path.format_map({"time": FileDateFormatter()})
         return os.path.abspath(path)
@@ -1,3 +1,6 @@
+from functools import partial
+
+
 def filter_none(record):
     return record["name"] is not None
 
@@ -10,15 +13,40 @@ def filter_by_name(record, parent, length):
 
 
 def filter_by_level(record, level_per_module):
-    name = record["name"]
+    level = get_level_by_module(record["name"], level_per_module)
+    if level is False:
+        return False
+    return record["level"].no >= level
+
 
+def get_level_by_module(name, level_per_module):
     while True:
         level = level_per_module.get(name, None)
         if level is False:
             return False
         if level is not None:
-            return record["level"].no >= level
+            return level
         if not name:
-            return True
+            return 0
         index = name.rfind(".")
         name = name[:index] if index != -1 else ""
+
+
+def is_static_filter(filter_):
+    if filter_ is None or filter_ is filter_none:
+        return True
+    return isinstance(filter_, partial) and filter_.func in (filter_by_name, filter_by_level)
+
+
+def get_filter_level(filter_, name):
+    # The minimum severity of messages coming from the "name" module that the filter may accept.
+    # Dynamic filters can't be evaluated in advance, so they are assumed to accept all of them.
+    if filter_ is filter_none:
+        return 0 if name is not None else float("inf")
+    if isinstance(filter_, partial):
+        if filter_.func is filter_by_name:
+            return 0 if filter_by_name({"name": name}, **filter_.keywords) else float("inf")
+        if filter_.func is filter_by_level:
+            level = get_level_by_module(name, **filter_.keywords)
+            return float("inf") if level is False else level
+    return 0
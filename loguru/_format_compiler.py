@@ -0,0 +1,134 @@
+import keyword
+import sys
+from _string import formatter_field_name_split
+from string import Formatter
+
+_conversion_functions = {"s": "str", "r": "repr", "a": "ascii"}
+
+
+def compile_format(format_string):
+    """Build a function rendering a record according to the given format string.
+
+    The returned function takes the record, the formatted exception and the message as arguments.
+    Whenever possible, the format is translated once into a specialized function accessing the
+    record fields directly. Formats which can't be compiled fall back to ``str.format_map()``.
+    """
+    render = _generate_renderer(format_string)
+    if render is None:
+        render = _make_fallback_renderer(format_string)
+    render.format_string = format_string
+    return render
+
+
+def get_format_fields(format_string):
+    """Return the set of record keys referenced by the format string (None if undecidable)."""
+    fields = set()
+
+    for _, field_name, format_spec, _ in Formatter().parse(format_string):
+        if field_name is None:
+            continue
+
+        first, rest = formatter_field_name_split(field_name)
+
+        if not isinstance(first, str) or not first:
+            return None
+
+        # The values of the "extra" dict are retrieved without requiring the whole dict.
+        if first != "extra" or next(rest, (True, None))[0]:
+            fields.add(first)
+
+        if format_spec:
+            spec_fields = get_format_fields(format_spec)
+            if spec_fields is None:
+                return None
+            fields |= spec_fields
+
+    return fields
+
+
+def _make_fallback_renderer(format_string):
+    def render(record, exception, message):
+        formatter_record = record.copy()
+        formatter_record["exception"] = exception
+        formatter_record["message"] = message
+        return format_string.format_map(formatter_record)
+
+    return render
+
+
+def _generate_renderer(format_string):
+    # The format is converted into a single f-string, which is the fastest way to build a string
+    # out of several values (or into a "str.join()" call on Python 3.5). User-provided strings
+    # (literals, keys, specs) are never inlined in the generated code, they are referenced through
+    # variables of the function namespace instead.
+    namespace = {}
+    fragments = []
+    use_fstring = sys.version_info >= (3, 6)
+
+    def constant(value):
+        name = "_c%d" % len(namespace)
+        namespace[name] = value
+        return name
+
+    try:
+        parsed = list(Formatter().parse(format_string))
+    except ValueError:
+        return None
+
+    for literal_text, field_name, format_spec, conversion in parsed:
+        if literal_text:
+            name = constant(literal_text)
+            fragments.append("{%s}" % name if use_fstring else name)
+
+        if field_name is None:
+            continue
+
+        if "{" in format_spec or conversion not in (None, "s", "r", "a"):
+            return None
+
+        first, rest = formatter_field_name_split(field_name)
+
+        if not isinstance(first, str) or not first:
+            return None
+
+        rest = list(rest)
+
+        if first == "exception":
+            expression = "exception"
+        elif first == "message":
+            expression = "message"
+        elif first == "extra" and rest and not rest[0][0]:
+            # The "extra" dict is possibly not built yet, the value is looked up in its layers.
+            expression = "record._get_extra(%s)" % constant(rest.pop(0)[1])
+        else:
+            expression = "record[%s]" % constant(first)
+
+        for is_attribute, key in rest:
+            if is_attribute:
+                if not key.isidentifier() or keyword.iskeyword(key):
+                    return None
+                expression += ".%s" % key
+            else:
+                expression += "[%s]" % constant(key)
+
+        if use_fstring:
+            if conversion is not None:
+                expression += "!%s" % conversion
+            if format_spec:
+                expression += ":{%s}" % constant(format_spec)
+            fragments.append("{%s}" % expression)
+        else:
+            if conversion is not None:
+                expression = "%s(%s)" % (_conversion_functions[conversion], expression)
+            fragments.append("format(%s, %s)" % (expression, constant(format_spec)))
+
+    if use_fstring:
+        body = 'f"%s"' % "".join(fragments)
+    else:
+        body = '"".join((%s))' % "".join(fragment + ", " for fragment in fragments)
+
+    source = "def render(record, exception, message):\n    return %s\n" % body
+    code = compile(source, "<loguru format>", "exec")
+    exec(code, namespace)
+
+    return namespace["render"]
@@ -3,21 +3,32 @@ import json
 import multiprocessing
 import os
 import threading
+import weakref
 from contextlib import contextmanager
-from threading import Thread
+from multiprocessing.util import Finalize, register_after_fork
+from os.path import basename, splitext
+from queue import Full, Queue, SimpleQueue
+from threading import Thread, current_thread
+from time import monotonic
 
+from . import _filters
 from ._colorizer import Colorizer
-from ._locks_machinery import create_handler_lock
+from ._datetime import aware_now
+from ._format_compiler import compile_format, get_format_fields
+from ._get_frame import get_frame
+from ._locks_machinery import create_handler_lock, register_restart_after_fork
+from ._recattrs import Record, RecordFile, RecordProcess, RecordThread
+from ._shared_memory_queue import SharedMemoryQueue
 
 
 def prepare_colored_format(format_, ansi_level):
     colored = Colorizer.prepare_format(format_)
-    return colored, colored.colorize(ansi_level)
+    return colored, compile_format(colored.colorize(ansi_level))
 
 
 def prepare_stripped_format(format_):
     colored = Colorizer.prepare_format(format_)
-    return colored.strip()
+    return compile_format(colored.strip())
 
 
 def memoize(function):
@@ -25,10 +36,24 @@ def memoize(function):
 
 
 class Message(str):
-    __slots__ = ("record",)
+    __slots__ = ("record", "sequence")
+
+    def __reduce__(self):
+        # Pickled explicitly to avoid the generic (and slower) handling of slots.
+        return (Message._restore, (str(self), self.record, self.sequence))
+
+    @classmethod
+    def _restore(cls, text, record, sequence):
+        message = cls(text)
+        message.record = record
+        message.sequence = sequence
+        return message
 
 
 class Handler:
+    # The minimum number of seconds between two reports of the messages dropped by the queue.
+    _dropped_report_interval = 1.0
+
     def __init__(
         self,
         *,
@@ -41,11 +66,24 @@ class Handler:
         colorize,
         serialize,
         enqueue,
+        batch_size,
+        batch_bytes,
+        queue_size,
+        overflow,
+        overflow_timeout,
+        shared_memory_size,
+        shedding,
+        priority,
+        writer_pool,
+        on_fork,
         multiprocessing_context,
         error_interceptor,
         exception_formatter,
         id_,
-        levels_ansi_codes
+        levels_ansi_codes,
+        levels_lookup,
+        format_key=None,
+        defer_formatting=False
     ):
         self._name = name
         self._sink = sink
@@ -53,14 +91,29 @@ class Handler:
         self._formatter = formatter
         self._is_formatter_dynamic = is_formatter_dynamic
         self._filter = filter_
+        self._dynamic_filter = None if _filters.is_static_filter(filter_) else filter_
         self._colorize = colorize
         self._serialize = serialize
         self._enqueue = enqueue
+        self._is_queue_threaded = enqueue == "thread"
+        self._defer_formatting = enqueue and defer_formatting
+        self._batch_size = batch_size
+        self._batch_bytes = batch_bytes
+        self._queue_size = queue_size
+        self._overflow = overflow
+        self._overflow_timeout = overflow_timeout
+        self._shared_memory_size = shared_memory_size
+        self._shedding = shedding
+        self._priority = priority if enqueue else None
+        self._writer_pool = writer_pool if self._is_queue_threaded else None
+        self._on_fork = on_fork
         self._multiprocessing_context = multiprocessing_context
         self._error_interceptor = error_interceptor
         self._exception_formatter = exception_formatter
         self._id = id_
+        self._format_key = format_key
         self._levels_ansi_codes = levels_ansi_codes  # Warning, reference shared among handlers
+        self._levels_lookup = levels_lookup  # Warning, reference shared among handlers
 
         self._decolorized_format = None
         self._precolorized_formats = {}
@@ -73,32 +126,91 @@ class Handler:
         self._queue_lock = None
         self._confirmation_event = None
         self._confirmation_lock = None
+        self._priority_queue = None
+        self._sequence = None
+        self._sequence_lock = None
+        self._queue_slots = None
+        self._shedding_levelno = None
+        self._dropped_count = None
         self._owner_process_pid = None
         self._thread = None
+        self._pending = None
+        self._pending_bytes = 0
+        self._last_dropped_report = None
 
-        if self._is_formatter_dynamic:
-            if self._colorize:
-                self._memoize_dynamic_format = memoize(prepare_colored_format)
+        self._prepare_formats()
+        self._record_fields = self._find_record_fields()
+
+        if self._enqueue:
+            self._queue_lock = create_handler_lock()
+            self._start_queued_writer()
+            if self._on_fork == "restart":
+                register_restart_after_fork(self)
+                register_after_fork(self, Handler._register_stop_at_exit)
+
+    def _start_queued_writer(self):
+        context = self._multiprocessing_context or multiprocessing
+
+        if self._is_queue_threaded:
+            # The oldest message is removed from the middle of the queue by "drop_old", which
+            # requires access to the underlying deque.
+            if self._queue_size is not None and self._overflow == "drop_old":
+                self._queue = Queue()
             else:
-                self._memoize_dynamic_format = memoize(prepare_stripped_format)
+                self._queue = SimpleQueue()
+            self._confirmation_event = threading.Event()
+            self._confirmation_lock = threading.Lock()
         else:
-            if self._colorize:
-                for level_name in self._levels_ansi_codes:
-                    self.update_format(level_name)
+            if self._enqueue == "shared_memory":
+                self._queue = SharedMemoryQueue(
+                    context, self._shared_memory_size, self._get_shared_memory_timeout()
+                )
             else:
-                self._decolorized_format = self._formatter.strip()
-
-        if self._enqueue:
-            if self._multiprocessing_context is None:
-                self._queue = multiprocessing.SimpleQueue()
-                self._confirmation_event = multiprocessing.Event()
-                self._confirmation_lock = multiprocessing.Lock()
+                self._queue = context.SimpleQueue()
+            self._confirmation_event = context.Event()
+            self._confirmation_lock = context.Lock()
+
+        if self._priority is not None:
+            # The messages of the priority lane are put in a separate queue, which is emptied by
+            # the writer thread before writing the other messages.
+            if self._is_queue_threaded:
+                self._priority_queue = SimpleQueue()
+                self._sequence = 0
+                self._sequence_lock = threading.Lock()
             else:
-                self._queue = self._multiprocessing_context.SimpleQueue()
-                self._confirmation_event = self._multiprocessing_context.Event()
-                self._confirmation_lock = self._multiprocessing_context.Lock()
-            self._queue_lock = create_handler_lock()
-            self._owner_process_pid = os.getpid()
+                self._priority_queue = context.SimpleQueue()
+                self._sequence = context.Value("Q", 0)
+                self._sequence_lock = self._sequence.get_lock()
+
+        if self._queue_size is not None:
+            # The slots are acquired by the callers before putting a message in the queue, and
+            # released by the writer thread once the message is written to the sink.
+            if self._is_queue_threaded:
+                self._queue_slots = threading.Semaphore(self._queue_size)
+            else:
+                self._queue_slots = context.Semaphore(self._queue_size)
+
+        if self._shedding is not None:
+            # The minimum severity of the messages accepted, updated by the writer thread.
+            self._shedding_levelno = context.RawValue("i", 0)
+
+        if (
+            self._queue_size is not None
+            or self._shedding is not None
+            or (self._enqueue == "shared_memory" and self._overflow != "block")
+        ):
+            self._dropped_count = context.Value("L", 0)
+
+        # The messages available in the queue are accumulated to be written to the sink at once.
+        self._pending = []
+        self._pending_bytes = 0
+        self._last_dropped_report = monotonic()
+
+        self._owner_process_pid = os.getpid()
+
+        if self._writer_pool is not None:
+            self._writer_pool.attach()
+        else:
             self._thread = Thread(
                 target=self._queued_writer, daemon=True, name="loguru-writer-%d" % self._id
             )
@@ -124,84 +236,89 @@ class Handler:
         finally:
             self._lock_acquired.acquired = False
 
-    def emit(self, record, level_id, from_decorator, is_raw, colored_message):
+    def emit(self, record, level_id, from_decorator, is_raw, colored_message, messages=None):
+        # The level and the static filter are expected to be checked beforehand by the caller.
         try:
-            if self._levelno > record["level"].no:
-                return
-
-            if self._filter is not None:
-                if not self._filter(record):
+            if self._dynamic_filter is not None:
+                if not self._dynamic_filter(record):
                     return
 
-            if self._is_formatter_dynamic:
-                dynamic_format = self._formatter(record)
-
-            formatter_record = record.copy()
-
-            if not record["exception"]:
-                formatter_record["exception"] = ""
-            else:
-                type_, value, tb = record["exception"]
-                formatter = self._exception_formatter
-                lines = formatter.format_exception(type_, value, tb, from_decorator=from_decorator)
-                formatter_record["exception"] = "".join(lines)
-
-            if colored_message is not None and colored_message.stripped != record["message"]:
-                colored_message = None
-
-            if is_raw:
-                if colored_message is None or not self._colorize:
-                    formatted = record["message"]
-                else:
-                    ansi_level = self._levels_ansi_codes[level_id]
-                    formatted = colored_message.colorize(ansi_level)
-            elif self._is_formatter_dynamic:
-                if not self._colorize:
-                    precomputed_format = self._memoize_dynamic_format(dynamic_format)
-                    formatted = self._format_record(precomputed_format, formatter_record)
-                elif colored_message is None:
-                    ansi_level = self._levels_ansi_codes[level_id]
-                    _, precomputed_format = self._memoize_dynamic_format(dynamic_format, ansi_level)
-                    formatted = self._format_record(precomputed_format, formatter_record)
-                else:
-                    ansi_level = self._levels_ansi_codes[level_id]
-                    formatter, precomputed_format = self._memoize_dynamic_format(
-                        dynamic_format, ansi_level
-                    )
-                    coloring_message = formatter.make_coloring_message(
-                        record["message"], ansi_level=ansi_level, colored_message=colored_message
-                    )
-                    formatter_record["message"] = coloring_message
-                    formatted = self._format_record(precomputed_format, formatter_record)
+            # The least severe messages are discarded first while the writer is falling behind,
+            # before paying for their formatting.
+            if (
+                self._shedding_levelno is not None
+                and record["level"].no < self._shedding_levelno.value
+            ):
+                self._count_dropped()
+                return
 
+            format_key = self._format_key
+
+            if self._defer_formatting:
+                # The message is formatted by the writer thread. The exception is formatted right
+                # away though, because its traceback is not picklable.
+                exception = self._format_exception(record, from_decorator)
+                if self._is_queue_threaded:
+                    # The record is not pickled, the writer thread would otherwise see the changes
+                    # made afterwards by the caller or by the other sinks.
+                    record = record.snapshot()
+                str_record = (record, level_id, from_decorator, is_raw, colored_message, exception)
+            elif messages is None or format_key is None:
+                str_record = self._format_message(
+                    record, level_id, from_decorator, is_raw, colored_message
+                )
             else:
-                if not self._colorize:
-                    precomputed_format = self._decolorized_format
-                    formatted = self._format_record(precomputed_format, formatter_record)
-                elif colored_message is None:
-                    ansi_level = self._levels_ansi_codes[level_id]
-                    precomputed_format = self._precolorized_formats[level_id]
-                    formatted = self._format_record(precomputed_format, formatter_record)
-                else:
-                    ansi_level = self._levels_ansi_codes[level_id]
-                    precomputed_format = self._precolorized_formats[level_id]
-                    coloring_message = self._formatter.make_coloring_message(
-                        record["message"], ansi_level=ansi_level, colored_message=colored_message
+                try:
+                    str_record = messages[format_key]
+                except KeyError:
+                    str_record = self._format_message(
+                        record, level_id, from_decorator, is_raw, colored_message
                     )
-                    formatter_record["message"] = coloring_message
-                    formatted = self._format_record(precomputed_format, formatter_record)
+                    messages[format_key] = str_record
 
-            if self._serialize:
-                formatted = self._serialize_record(formatted, record)
+            if self._is_queue_threaded:
+                # The record is shared with the writer thread, it's completed beforehand so that
+                # its lazy values are not computed concurrently.
+                record._fill()
 
-            str_record = Message(formatted)
-            str_record.record = record
+                if self._owner_process_pid != os.getpid():
+                    # The in-process queue can't be consumed by the writer thread of another
+                    # process, the child needs its own one.
+                    with self._protected_lock():
+                        if not self._stopped and self._owner_process_pid != os.getpid():
+                            self._start_queued_writer()
+
+            is_priority = self._priority is not None and record["level"].no >= self._priority
+            has_slot = self._queue_slots is not None and not is_priority
+
+            # The slot is acquired outside of the lock, so that waiting callers don't queue up
+            # behind each other and the time they may be blocked remains bounded.
+            if has_slot and not self._acquire_queue_slot():
+                return
 
             with self._protected_lock():
                 if self._stopped:
+                    if has_slot:
+                        self._queue_slots.release()
                     return
                 if self._enqueue:
-                    self._queue.put(str_record)
+                    try:
+                        if self._priority is None:
+                            self._queue.put(str_record)
+                        else:
+                            self._put_sequenced(str_record, is_priority)
+                    except Full:
+                        # The shared memory has no room left for the message.
+                        if has_slot:
+                            self._queue_slots.release()
+                        self._count_dropped()
+                        return
+                    except Exception:
+                        if has_slot:
+                            self._queue_slots.release()
+                        raise
+                    if self._writer_pool is not None:
+                        self._writer_pool.notify(self)
                 else:
                     self._sink.write(str_record)
         except Exception:
@@ -209,25 +326,207 @@ class Handler:
                 raise
             self._error_interceptor.print(record)
 
+    def _get_shared_memory_timeout(self):
+        # How long a message waits for room in the shared memory before being dropped.
+        if self._overflow == "drop_new":
+            return 0
+        if self._overflow == "block_timeout":
+            return self._overflow_timeout
+        return None
+
+    def _acquire_queue_slot(self):
+        slots = self._queue_slots
+
+        if self._overflow == "block":
+            slots.acquire()
+            return True
+
+        if self._overflow == "drop_old":
+            # The oldest message waiting in the queue is removed, its slot is reused for the new
+            # one. If there is none, all the slots are held by the messages being written and the
+            # new message is dropped instead.
+            if slots.acquire(False) or self._remove_oldest_queued_message():
+                return True
+            self._count_dropped()
+            return False
+
+        if self._overflow == "drop_new":
+            acquired = slots.acquire(False)
+        else:
+            acquired = slots.acquire(timeout=self._overflow_timeout)
+
+        if not acquired:
+            self._count_dropped()
+
+        return acquired
+
+    def _remove_oldest_queued_message(self):
+        # The control messages are left in place, so that the order of the queue is preserved.
+        queue = self._queue
+        with queue.mutex:
+            for index, message in enumerate(queue.queue):
+                if message is not None and message is not True and message is not False:
+                    del queue.queue[index]
+                    break
+            else:
+                return False
+        self._count_dropped()
+        return True
+
+    def _put_sequenced(self, str_record, is_priority):
+        # The number is incremented and the message is enqueued atomically, so that the numbers of
+        # the messages follow their order in each lane.
+        with self._sequence_lock:
+            if self._is_queue_threaded:
+                sequence = self._sequence
+                self._sequence = sequence + 1
+            else:
+                sequence = self._sequence.value
+                self._sequence.value = sequence + 1
+            if is_priority:
+                self._priority_queue.put((sequence, str_record))
+                self._queue.put(False)  # Wake up the writer thread.
+            else:
+                self._queue.put((sequence, str_record))
+
+    def _count_dropped(self):
+        with self._dropped_count.get_lock():
+            self._dropped_count.value += 1
+
+    def _format_exception(self, record, from_decorator):
+        if not record["exception"]:
+            return ""
+        type_, value, tb = record["exception"]
+        formatter = self._exception_formatter
+        lines = formatter.format_exception(type_, value, tb, from_decorator=from_decorator)
+        return "".join(lines)
+
+    def _format_message(
+        self, record, level_id, from_decorator, is_raw, colored_message, exception=None
+    ):
+        if self._is_formatter_dynamic:
+            dynamic_format = self._formatter(record)
+
+        if exception is None:
+            exception = self._format_exception(record, from_decorator)
+
+        message = record["message"]
+
+        if colored_message is not None and colored_message.stripped != message:
+            colored_message = None
+
+        if is_raw:
+            if colored_message is None or not self._colorize:
+                formatted = message
+            else:
+                ansi_level = self._levels_ansi_codes[level_id]
+                formatted = colored_message.colorize(ansi_level)
+        elif self._is_formatter_dynamic:
+            if not self._colorize:
+                precomputed_format = self._memoize_dynamic_format(dynamic_format)
+                formatted = self._format_record(precomputed_format, record, exception, message)
+            elif colored_message is None:
+                ansi_level = self._levels_ansi_codes[level_id]
+                _, precomputed_format = self._memoize_dynamic_format(dynamic_format, ansi_level)
+                formatted = self._format_record(precomputed_format, record, exception, message)
+            else:
+                ansi_level = self._levels_ansi_codes[level_id]
+                formatter, precomputed_format = self._memoize_dynamic_format(
+                    dynamic_format, ansi_level
+                )
+                coloring_message = formatter.make_coloring_message(
+                    message, ansi_level=ansi_level, colored_message=colored_message
+                )
+                formatted = self._format_record(
+                    precomputed_format, record, exception, coloring_message
+                )
+
+        else:
+            if not self._colorize:
+                precomputed_format = self._decolorized_format
+                formatted = self._format_record(precomputed_format, record, exception, message)
+            elif colored_message is None:
+                precomputed_format = self._precolorized_formats[level_id]
+                formatted = self._format_record(precomputed_format, record, exception, message)
+            else:
+                ansi_level = self._levels_ansi_codes[level_id]
+                precomputed_format = self._precolorized_formats[level_id]
+                coloring_message = self._formatter.make_coloring_message(
+                    message, ansi_level=ansi_level, colored_message=colored_message
+                )
+                formatted = self._format_record(
+                    precomputed_format, record, exception, coloring_message
+                )
+
+        if self._serialize:
+            formatted = self._serialize_record(formatted, record)
+
+        str_record = Message(formatted)
+        str_record.record = record
+        str_record.sequence = None
+
+        return str_record
+
     def stop(self):
         with self._protected_lock():
             self._stopped = True
             if self._enqueue:
-                if self._owner_process_pid != os.getpid():
+                if self._owner_process_pid == os.getpid():
+                    if self._writer_pool is None:
+                        self._queue.put(None)
+                        self._thread.join()
+                    else:
+                        with self._confirmation_lock:
+                            self._queue.put(None)
+                            self._writer_pool.notify(self)
+                            self._confirmation_event.wait()
+                        self._writer_pool.detach()
+                    if hasattr(self._queue, "close"):
+                        self._queue.close()
+                    if hasattr(self._priority_queue, "close"):
+                        self._priority_queue.close()
+                elif not self._is_queue_threaded:
                     return
-                self._queue.put(None)
-                self._thread.join()
-                if hasattr(self._queue, "close"):
-                    self._queue.close()
 
             self._sink.stop()
 
+    def restart_after_fork(self):
+        # Called in the child process right after the fork. The handler gets its own queue and
+        # writer thread, instead of sending its messages to the ones of the parent process.
+        if self._stopped or self._owner_process_pid in (None, os.getpid()):
+            return
+
+        try:
+            reopen = getattr(self._sink, "reopen", None)
+            if reopen is not None:
+                reopen()
+            self._start_queued_writer()
+        except Exception:
+            self._error_interceptor.print(None)
+
+    @staticmethod
+    def _register_stop_at_exit(handler):
+        # The child processes of "multiprocessing" exit without calling the "atexit" functions, so
+        # the messages enqueued by a restarted handler would be lost.
+        Finalize(handler, Handler._stop_at_exit, args=(weakref.ref(handler),), exitpriority=10)
+
+    @staticmethod
+    def _stop_at_exit(handler_ref):
+        handler = handler_ref()
+        if handler is not None and not handler._stopped:
+            handler.stop()
+
     def complete_queue(self):
         if not self._enqueue:
             return
 
+        if self._is_queue_threaded and self._owner_process_pid != os.getpid():
+            return
+
         with self._confirmation_lock:
             self._queue.put(True)
+            if self._writer_pool is not None:
+                self._writer_pool.notify(self)
             self._confirmation_event.wait()
             self._confirmation_event.clear()
 
@@ -242,17 +541,51 @@ class Handler:
         if not self._colorize or self._is_formatter_dynamic:
             return
         ansi_code = self._levels_ansi_codes[level_id]
-        self._precolorized_formats[level_id] = self._formatter.colorize(ansi_code)
+        self._precolorized_formats[level_id] = compile_format(self._formatter.colorize(ansi_code))
 
     @property
     def levelno(self):
         return self._levelno
 
+    @property
+    def record_fields(self):
+        return self._record_fields
+
+    @property
+    def format_key(self):
+        return self._format_key
+
+    def get_module_levelno(self, name):
+        return max(self._levelno, _filters.get_filter_level(self._filter, name))
+
+    def _find_record_fields(self):
+        # The record keys required to filter and format the message, or "None" if they can't be
+        # determined statically (in which case all the record values must be computed).
+        if self._is_formatter_dynamic or self._serialize:
+            return None
+        if self._dynamic_filter is not None:
+            return None
+        return get_format_fields(self._formatter.strip())
+
+    def _prepare_formats(self):
+        if self._is_formatter_dynamic:
+            if self._colorize:
+                self._memoize_dynamic_format = memoize(prepare_colored_format)
+            else:
+                self._memoize_dynamic_format = memoize(prepare_stripped_format)
+        else:
+            if self._colorize:
+                for level_name in self._levels_ansi_codes:
+                    self.update_format(level_name)
+            else:
+                self._decolorized_format = compile_format(self._formatter.strip())
+
     @staticmethod
-    def _format_record(log_format, record):
+    def _format_record(precomputed_format, record, exception, message):
         try:
-            return log_format.format_map(record)
+            return precomputed_format(record, exception, message)
         except KeyError as e:
+            log_format = precomputed_format.format_string
             available = ", ".join(map(repr, record.keys()))
             raise ValueError(
                 "Failed to format log record: key %s not found.\n"
@@ -305,43 +638,263 @@ class Handler:
         return json.dumps(serializable, default=str, ensure_ascii=False) + "\n"
 
     def _queued_writer(self):
-        message = None
-        queue = self._queue
+        while True:
+            message = self._get_queued_message()
+            self._process_queued_message(message)
+            if message is None:
+                break
 
-        # We need to use a lock to protect sink during fork.
-        # Particularly, writing to stderr may lead to deadlock in child process.
-        lock = self._queue_lock
+    def serve_queue(self):
+        # Called by a thread of the writer pool. The messages are processed until a batch is
+        # written, so that the other handlers of the pool are not kept waiting.
+        try:
+            while not self._queue.empty():
+                message = self._get_queued_message()
+                if self._process_queued_message(message) or message is None:
+                    break
+        except Exception:
+            with self._queue_lock:
+                self._error_interceptor.print(None)
 
-        while True:
+    def has_queued_messages(self):
+        return not self._queue.empty()
+
+    def _get_queued_message(self):
+        # The value "False" stands for no message (it also wakes up the writer thread when a
+        # message is put in the priority lane).
+        try:
+            return self._queue.get()
+        except Exception:
+            with self._queue_lock:
+                self._error_interceptor.print(None)
+            return False
+
+    def _process_queued_message(self, message):
+        # Return whether the pending messages were written, they're kept in the batch otherwise
+        # because more messages are readily available in the queue.
+        queue = self._queue
+        shedding = self._shedding
+
+        if self._priority_queue is not None and not self._priority_queue.empty():
+            self._write_priority_messages()
+
+        if message is not None and message is not True:
+            if message is not False:
+                taken = self._take_message(message, is_priority=False)
+                if taken is not None:
+                    self._pending.append(taken)
+                    self._pending_bytes += len(taken)
+
+            if (
+                len(self._pending) < self._batch_size
+                and self._pending_bytes < self._batch_bytes
+                and not queue.empty()
+            ):
+                return False
+
+        batch = self._pending
+        if batch:
+            if shedding is not None:
+                # The oldest message of the batch tells how far behind the writer is. The time may
+                # have been replaced by a patcher, the messages are not shed if it's unusable.
+                try:
+                    self._update_shedding(aware_now() - batch[0].record["time"])
+                except Exception:
+                    with self._queue_lock:
+                        self._error_interceptor.print(batch[0].record)
+            self._pending, self._pending_bytes = [], 0
+            self._write_batch(batch)
+            if self._queue_slots is not None:
+                for _ in batch:
+                    self._queue_slots.release()
+
+        if shedding is not None and queue.empty():
+            self._shedding_levelno.value = 0
+
+        if self._dropped_count is not None:
+            is_final = message is None or message is True
+            elapsed = monotonic() - self._last_dropped_report
+            if is_final or elapsed >= self._dropped_report_interval:
+                self._report_dropped()
+                self._last_dropped_report = monotonic()
+
+        # The end of the queue is also confirmed, because "stop()" waits for it when the handler
+        # is served by a writer pool.
+        if message is None or message is True:
+            self._confirmation_event.set()
+
+        return True
+
+    def _write_priority_messages(self):
+        priority_queue = self._priority_queue
+        batch = []
+
+        while not priority_queue.empty():
             try:
-                message = queue.get()
+                message = priority_queue.get()
             except Exception:
-                with lock:
+                with self._queue_lock:
                     self._error_interceptor.print(None)
                 continue
 
-            if message is None:
-                break
+            taken = self._take_message(message, is_priority=True)
+            if taken is not None:
+                batch.append(taken)
 
-            if message is True:
-                self._confirmation_event.set()
-                continue
+        if batch:
+            self._write_batch(batch)
 
-            with lock:
-                try:
-                    self._sink.write(message)
-                except Exception:
-                    self._error_interceptor.print(message.record)
+    def _take_message(self, message, *, is_priority):
+        # Return the message taken out of the queue, ready to be written (or None on error).
+        if self._priority is not None:
+            sequence, message = message
+
+        if self._defer_formatting:
+            try:
+                message = self._format_message(*message)
+            except Exception:
+                # The slot is released right away, since the message won't be written.
+                if self._queue_slots is not None and not is_priority:
+                    self._queue_slots.release()
+                with self._queue_lock:
+                    self._error_interceptor.print(message[0])
+                return None
+
+        if self._priority is not None:
+            message.sequence = sequence
+
+        return message
+
+    def _update_shedding(self, delay):
+        # The messages below "INFO" are shed first, then the ones below "WARNING". They're accepted
+        # again once the delay has decreased well below the threshold which caused them to be shed.
+        seconds = delay.total_seconds()
+        shedding_levelno = self._shedding_levelno.value
+        info_no = self._levels_lookup["INFO"][2]
+        warning_no = self._levels_lookup["WARNING"][2]
+
+        if seconds >= 2 * self._shedding:
+            shedding_levelno = warning_no
+        elif seconds >= self._shedding:
+            shedding_levelno = max(shedding_levelno, info_no)
+        elif seconds >= self._shedding / 2:
+            shedding_levelno = min(shedding_levelno, info_no)
+        else:
+            shedding_levelno = 0
+
+        self._shedding_levelno.value = shedding_levelno
+
+    def _report_dropped(self):
+        with self._dropped_count.get_lock():
+            count = self._dropped_count.value
+            self._dropped_count.value = 0
+
+        if not count:
+            return
+
+        message = None
+
+        try:
+            level_id, _, _, _, level = self._levels_lookup["WARNING"]
+            record = self._make_dropped_record(count, level)
+            message = self._format_message(record, level_id, False, False, None)
+        except Exception:
+            with self._queue_lock:
+                self._error_interceptor.print(None)
+
+        if message is not None:
+            self._write_batch([message])
+
+    @staticmethod
+    def _make_dropped_record(count, level):
+        # Imported here because the logger module depends on this one.
+        from ._logger import start_time
+
+        frame = get_frame(0)
+        file_path = frame.f_code.co_filename
+        thread = current_thread()
+        process = multiprocessing.current_process()
+        time = aware_now()
+
+        return Record(
+            {
+                "elapsed": time - start_time,
+                "exception": None,
+                "extra": {},
+                "file": RecordFile(basename(file_path), file_path),
+                "function": frame.f_code.co_name,
+                "level": level,
+                "line": frame.f_lineno,
+                "message": "%d message%s dropped because the handler could not keep up"
+                % (count, "s" if count > 1 else ""),
+                "module": splitext(basename(file_path))[0],
+                "name": __name__,
+                "process": RecordProcess(process.ident, process.name),
+                "thread": RecordThread(thread.ident, thread.name),
+                "time": time,
+            }
+        )
+
+    def _write_batch(self, batch):
+        write_many = getattr(self._sink, "write_many", None)
+
+        with self._queue_lock:
+            if write_many is None or len(batch) == 1:
+                for message in batch:
+                    try:
+                        self._sink.write(message)
+                    except Exception:
+                        self._error_interceptor.print(message.record)
+                return
+
+            # The sink pulls the messages from the iterator. If one of them can't be written, the
+            # error is reported and the remaining messages are written one by one.
+            current = None
+
+            def iterate():
+                nonlocal current
+                for current in batch:
+                    yield current
+
+            messages = iterate()
+
+            try:
+                write_many(messages)
+            except Exception:
+                self._error_interceptor.print(None if current is None else current.record)
+                for message in messages:
+                    try:
+                        self._sink.write(message)
+                    except Exception:
+                        self._error_interceptor.print(message.record)
 
     def __getstate__(self):
         state = self.__dict__.copy()
         state["_lock"] = None
         state["_lock_acquired"] = None
         state["_memoize_dynamic_format"] = None
-        if self._enqueue:
+        state["_decolorized_format"] = None
+        state["_precolorized_formats"] = {}
+        if self._is_queue_threaded:
+            # The sink is used directly by the writer thread started in the other process.
+            state["_queue"] = None
+            state["_confirmation_event"] = None
+            state["_confirmation_lock"] = None
+            state["_priority_queue"] = None
+            state["_sequence"] = None
+            state["_sequence_lock"] = None
+            state["_queue_slots"] = None
+            state["_shedding_levelno"] = None
+            state["_dropped_count"] = None
+            state["_owner_process_pid"] = None
+            state["_thread"] = None
+            state["_queue_lock"] = None
+            state["_pending"] = None
+        elif self._enqueue:
             state["_sink"] = None
             state["_thread"] = None
             state["_queue_lock"] = None
+            state["_pending"] = None
         return state
 
     def __setstate__(self, state):
@@ -350,8 +903,7 @@ class Handler:
         self._lock_acquired = threading.local()
         if self._enqueue:
             self._queue_lock = create_handler_lock()
-        if self._is_formatter_dynamic:
-            if self._colorize:
-                self._memoize_dynamic_format = memoize(prepare_colored_format)
-            else:
-                self._memoize_dynamic_format = memoize(prepare_stripped_format)
+            if self._on_fork == "restart":
+                register_restart_after_fork(self)
+                register_after_fork(self, Handler._register_stop_at_exit)
+        self._prepare_formats()
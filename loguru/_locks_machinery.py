@@ -10,6 +10,9 @@ if not hasattr(os, "register_at_fork"):
     def create_handler_lock():
         return threading.Lock()
 
+    def register_restart_after_fork(handler):
+        pass
+
 else:
     # While forking, we need to sanitize all locks to make sure the child process doesn't run into
     # a deadlock (if a lock already acquired is inherited) and to protect sink from corrupted state.
@@ -48,3 +51,17 @@ else:
         lock = threading.Lock()
         handler_locks.add(lock)
         return lock
+
+    # Handlers may also need to restart their queue and writer thread in the child process. This
+    # is done once the locks are released, which is why the function is registered afterwards.
+
+    restarted_handlers = weakref.WeakSet()
+
+    def restart_handlers():
+        for handler in list(restarted_handlers):
+            handler.restart_after_fork()
+
+    os.register_at_fork(after_in_child=restart_handlers)
+
+    def register_restart_after_fork(handler):
+        restarted_handlers.add(handler)
@@ -21,6 +21,7 @@
 .. |Any| replace:: :obj:`~typing.Any`
 .. |str| replace:: :class:`str`
 .. |int| replace:: :class:`int`
+.. |float| replace:: :class:`float`
 .. |bool| replace:: :class:`bool`
 .. |tuple| replace:: :class:`tuple`
 .. |namedtuple| replace:: :func:`namedtuple<collections.namedtuple>`
@@ -100,29 +101,32 @@ import builtins
 import contextlib
 import functools
 import logging
+import math
 import re
 import sys
 import threading
 import warnings
 from collections import namedtuple
+from datetime import timedelta
 from inspect import isclass, iscoroutinefunction, isgeneratorfunction
-from multiprocessing import current_process, get_context
+from multiprocessing import get_context
 from multiprocessing.context import BaseContext
-from os.path import basename, splitext
 from threading import current_thread
 
 from . import _asyncio_loop, _colorama, _defaults, _filters
 from ._better_exceptions import ExceptionFormatter
 from ._colorizer import Colorizer, try_formatting
 from ._contextvars import ContextVar
-from ._datetime import aware_now
+from ._datetime import CoarseClock, aware_now
 from ._error_interceptor import ErrorInterceptor
 from ._file_sink import FileSink
 from ._get_frame import get_frame
 from ._handler import Handler
 from ._locks_machinery import create_logger_lock
-from ._recattrs import RecordException, RecordFile, RecordLevel, RecordProcess, RecordThread
+from ._recattrs import PENDING, Record, RecordException, RecordLevel, share_attribute
+from ._shared_memory_queue import SharedMemory
 from ._simple_sinks import AsyncSink, CallableSink, StandardSink, StreamSink
+from ._writer_pool import WriterPool
 
 if sys.version_info >= (3, 6):
     from collections.abc import AsyncGenerator
@@ -211,23 +215,108 @@ class Core:
         # It can also contain integers as keys, it serves to avoid calling "isinstance()" repeatedly
         # when "logger.log()" is used.
         self.levels_lookup = {
-            name: (name, name, level.no, level.icon) for name, level in self.levels.items()
+            name: (
+                name,
+                name,
+                level.no,
+                level.icon,
+                share_attribute(RecordLevel(name, level.no, level.icon)),
+            )
+            for name, level in self.levels.items()
         }
 
         self.handlers_count = 0
         self.handlers = {}
+        self.record_fields = frozenset()
+        self.shared_formats = False
 
         self.extra = {}
         self.patcher = None
+        self.clock = aware_now
+        self.writer_pool = None
 
         self.min_level = float("inf")
-        self.enabled = {}
         self.activation_list = []
         self.activation_none = True
 
+        # Cache used to dispatch messages based on the module they come from. It maps each module
+        # name to its activation status, to the minimum level its messages must have to be accepted
+        # by at least one handler, and to the "(levelno, handler)" pairs of the handlers whose
+        # static filter accepts this module.
+        self.dispatch_table = {}
+
         self.thread_locals = threading.local()
         self.lock = create_logger_lock()
 
+    def update_handlers(self, handlers):
+        # The handlers are replaced last, since the derived values are read without lock by
+        # "_log()".
+        self.min_level = min((h.levelno for h in handlers.values()), default=float("inf"))
+
+        record_fields = set()
+        for handler in handlers.values():
+            if handler.record_fields is None:
+                record_fields = None
+                break
+            record_fields |= handler.record_fields
+
+        if record_fields is None:
+            self.record_fields = None
+        else:
+            self.record_fields = Record.lazy_keys.intersection(record_fields)
+
+        format_keys = [h.format_key for h in handlers.values() if h.format_key is not None]
+        self.shared_formats = len(set(format_keys)) < len(format_keys)
+
+        self.handlers = handlers
+        self.dispatch_table = {}
+
+    def find_level(self, level):
+        # Called when the level is missing from the cache, which happens for unknown names, invalid
+        # values and severities not used yet.
+        if isinstance(level, str):
+            raise ValueError("Level '%s' does not exist" % level) from None
+        if not isinstance(level, int):
+            raise TypeError(
+                "Invalid level, it should be an integer or a string, not: '%s'"
+                % type(level).__name__
+            ) from None
+        if level < 0:
+            raise ValueError(
+                "Invalid level value, it should be a positive integer, not: %d" % level
+            ) from None
+
+        level_name = "Level %d" % level
+        cache = (None, level_name, level, " ", share_attribute(RecordLevel(level_name, level, " ")))
+        self.levels_lookup[level] = cache
+        return cache
+
+    def find_dispatch(self, name):
+        # The cache must be retrieved before the handlers, so that values computed while a handler
+        # is being added are stored in the outdated cache (which is replaced right after).
+        dispatch_table = self.dispatch_table
+
+        if name is None:
+            enabled = self.activation_none
+        else:
+            enabled = True
+            dotted_name = name + "."
+            for dotted_module_name, status in self.activation_list:
+                if dotted_name[: len(dotted_module_name)] == dotted_module_name:
+                    enabled = status
+                    break
+
+        handlers = []
+        for handler in self.handlers.values():
+            levelno = handler.get_module_levelno(name)
+            if levelno != float("inf"):
+                handlers.append((levelno, handler))
+
+        module_level = min((levelno for levelno, _ in handlers), default=float("inf"))
+        dispatch = (enabled, module_level, tuple(handlers))
+        dispatch_table[name] = dispatch
+        return dispatch
+
     def __getstate__(self):
         state = self.__dict__.copy()
         state["thread_locals"] = None
@@ -238,6 +327,9 @@ class Core:
         self.__dict__.update(state)
         self.thread_locals = threading.local()
         self.lock = create_logger_lock()
+        # The level attributes shared between records are unpickled as regular ones.
+        for key, (id_, name, no, icon, level) in self.levels_lookup.items():
+            self.levels_lookup[key] = (id_, name, no, icon, share_attribute(level))
 
 
 class Logger:
@@ -266,10 +358,16 @@ class Logger:
     def __init__(self, core, exception, depth, record, lazy, colors, raw, capture, patchers, extra):
         self._core = core
         self._options = (exception, depth, record, lazy, colors, raw, capture, patchers, extra)
+        self._opt_cache = None
 
     def __repr__(self):
         return "<loguru.logger handlers=%r>" % list(self._core.handlers.values())
 
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_opt_cache"] = None
+        return state
+
     def add(
         self,
         sink,
@@ -282,6 +380,14 @@ class Logger:
         backtrace=_defaults.LOGURU_BACKTRACE,
         diagnose=_defaults.LOGURU_DIAGNOSE,
         enqueue=_defaults.LOGURU_ENQUEUE,
+        defer_formatting=_defaults.LOGURU_DEFER_FORMATTING,
+        batch_size=_defaults.LOGURU_BATCH_SIZE,
+        batch_bytes=_defaults.LOGURU_BATCH_BYTES,
+        queue_size=_defaults.LOGURU_QUEUE_SIZE,
+        overflow=_defaults.LOGURU_OVERFLOW,
+        shedding=_defaults.LOGURU_SHEDDING,
+        priority=_defaults.LOGURU_PRIORITY,
+        on_fork=_defaults.LOGURU_ON_FORK,
         context=_defaults.LOGURU_CONTEXT,
         catch=_defaults.LOGURU_CATCH,
         **kwargs
@@ -314,10 +420,65 @@ class Logger:
         diagnose : |bool|, optional
             Whether the exception trace should display the variables values to ease the debugging.
             This should be set to ``False`` in production to avoid leaking sensitive data.
-        enqueue : |bool|, optional
+        enqueue : |bool| or |str|, optional
             Whether the messages to be logged should first pass through a multiprocessing-safe queue
             before reaching the sink. This is useful while logging to a file through multiple
-            processes. This also has the advantage of making logging calls non-blocking.
+            processes. This also has the advantage of making logging calls non-blocking. If
+            ``"thread"``, the messages are passed to the sink through an in-process queue instead,
+            which avoids the cost of pickling them but can't be used by child processes (a forked
+            or spawned child gets its own queue and writer thread). If ``"shared_memory"``, the
+            messages of all processes are passed through a ring buffer allocated in shared memory
+            instead of a pipe, which is cheaper when many processes are logging heavily. Its size in
+            bytes is set by the ``LOGURU_SHARED_MEMORY_SIZE`` environment variable (4 MiB by
+            default), and the ``overflow`` policy applies when the buffer is full.
+        defer_formatting : |bool|, optional
+            Whether the messages should be formatted by the thread in charge of writing the
+            enqueued messages to the sink, rather than by the thread logging the message. This
+            reduces the cost of logging calls. It has no effect if ``enqueue`` is ``False``.
+        batch_size : |int|, optional
+            The maximum number of enqueued messages written to the sink at once. The messages
+            waiting in the queue are written together, which allows file and stream sinks to be
+            written and flushed only once for all of them. It has no effect if ``enqueue`` is
+            ``False``.
+        batch_bytes : |int|, optional
+            The maximum total length of the enqueued messages written to the sink at once. It has
+            no effect if ``enqueue`` is ``False``.
+        queue_size : |int|, optional
+            The maximum number of enqueued messages not yet written to the sink, including the ones
+            being written. If ``None``, the queue is unbounded. It has no effect if ``enqueue`` is
+            ``False``. Note that the messages of a multiprocessing queue must also fit into the
+            buffer of the underlying pipe, otherwise the callers are blocked regardless of the
+            ``overflow``.
+        overflow : |str|, optional
+            What to do with a message logged while the queue is full: ``"block"`` waits until the
+            queue has room for it, ``"drop_new"`` discards it, ``"drop_old"`` discards the oldest
+            message of the queue instead (only with ``enqueue="thread"``), and
+            ``"block_timeout:<seconds>"`` waits at most the given time before discarding it. The
+            number of dropped messages is periodically reported to the sink as a ``"WARNING"``.
+        shedding : |float| or |timedelta|, optional
+            The delay (in seconds) after which messages waiting in the queue cause the least severe
+            messages to be discarded instead of being enqueued. Messages below ``"INFO"`` are
+            discarded first, then the ones below ``"WARNING"`` if the delay reaches twice this
+            value. They are accepted again once the writer has caught up. Messages with a severity
+            of ``"WARNING"`` or above are never discarded. If ``None``, no message is discarded
+            based on its severity. It has no effect if ``enqueue`` is ``False``.
+        priority : |int| or |str|, optional
+            The minimum severity level from which enqueued messages are put in a separate lane,
+            always written to the sink before the messages waiting in the regular queue. The order
+            of the messages is preserved within each lane, and their ``sequence`` attribute tells
+            the order in which they were logged. Messages of the priority lane are not limited by
+            the ``queue_size``. If ``None``, all messages share the same queue and their
+            ``sequence`` is ``None``. It has no effect if ``enqueue`` is ``False``.
+        on_fork : |str|, optional
+            What a forked child process does with the messages of the handler: ``"share"`` sends
+            them to the queue and writer thread of the parent process (if ``enqueue`` is
+            ``"thread"``, the child starts its own ones on first use instead), while ``"restart"``
+            immediately gives the child its own queue and writer thread, re-opening the file in
+            append mode if the sink is a file path. This is useful for pre-fork servers whose
+            workers would otherwise all depend on the writer of the parent. Since each process
+            would then manage the file on its own, ``"restart"`` can't be used with a file sink
+            configured with a ``rotation``, a ``retention`` or a ``compression``. It has no effect
+            if ``enqueue`` is ``False``.
         context : |multiprocessing.Context| or |str|, optional
             A context object or name that will be used for all tasks involving internally the
             |multiprocessing| module, in particular when ``enqueue=True``. If ``None``, the default
@@ -331,7 +492,7 @@ class Logger:
             below).
 
 
-        If and only if the sink is a coroutine function, the following parameter applies:
+        If and only if the sink is a coroutine function, the following parameters apply:
 
         Parameters
         ----------
@@ -339,6 +500,15 @@ class Logger:
             The event loop in which the asynchronous logging task will be scheduled and executed. If
             ``None``, the loop used is the one returned by |asyncio.get_running_loop| at the time of
             the logging call (task is discarded if there is no loop currently running).
+        batch : |int|, optional
+            If not ``None``, the coroutine function is called with a |list| of at most ``batch``
+            messages instead of a single message, the pending messages being grouped together.
+        max_in_flight : |int|, optional
+            The maximum number of calls to the coroutine function running concurrently. If either
+            this parameter or ``batch`` is not ``None``, the messages are written in order by a
+            single task consuming them as long as there are some pending (by default, one call at a
+            time), instead of a new task being created for each message. Messages logged from a
+            thread which is not running the loop are then passed to it safely.
 
 
         If and only if the sink is a file path, the following parameters apply:
@@ -542,6 +712,11 @@ class Logger:
         |            | logging call was made           |                            |
         +------------+---------------------------------+----------------------------+
 
+        The ``level``, ``file``, ``thread`` and ``process`` objects are shared between the records
+        of messages logged without patchers, their attributes can therefore not be modified by
+        filters, formatters or sinks (an ``AttributeError`` is raised). They can be modified by a
+        patcher (see |patch|), or the whole value of the record key can be replaced instead.
+
         .. _time:
 
         .. rubric:: The time formatting
@@ -778,6 +953,10 @@ class Logger:
         If you want to disable the pre-configured sink, you can set the ``LOGURU_AUTOINIT``
         variable to ``False``.
 
+        The ``record["time"]`` of logged messages uses the local timezone by default. Setting the
+        ``LOGURU_TZ`` variable to ``"UTC"`` makes the logger use UTC instead, which saves the cost
+        of resolving the local timezone.
+
         On Linux, you will probably need to edit the ``~/.profile`` file to make this persistent. On
         Windows, don't forget to restart your terminal for the change to be taken into account.
 
@@ -848,6 +1027,16 @@ class Logger:
             if colorize is None:
                 colorize = False
 
+            # The parent and the restarted children would otherwise race to rotate, remove and
+            # compress the same files.
+            if enqueue and on_fork == "restart":
+                for option in ("rotation", "retention", "compression"):
+                    if kwargs.get(option) is not None:
+                        raise ValueError(
+                            "Invalid on_fork, 'restart' can't be used with a file sink configured "
+                            "with '%s'" % option
+                        )
+
             wrapped_sink = FileSink(path, **kwargs)
             kwargs = {}
             encoding = wrapped_sink.encoding
@@ -887,6 +1076,31 @@ class Logger:
                 colorize = False
 
             loop = kwargs.pop("loop", None)
+            batch = kwargs.pop("batch", None)
+            max_in_flight = kwargs.pop("max_in_flight", None)
+
+            if batch is not None:
+                if not isinstance(batch, int) or isinstance(batch, bool):
+                    raise TypeError(
+                        "Invalid batch, it should be an integer or None, not: '%s'"
+                        % type(batch).__name__
+                    )
+                if batch < 1:
+                    raise ValueError(
+                        "Invalid batch, it should be a strictly positive integer, not: %d" % batch
+                    )
+
+            if max_in_flight is not None:
+                if not isinstance(max_in_flight, int) or isinstance(max_in_flight, bool):
+                    raise TypeError(
+                        "Invalid max_in_flight, it should be an integer or None, not: '%s'"
+                        % type(max_in_flight).__name__
+                    )
+                if max_in_flight < 1:
+                    raise ValueError(
+                        "Invalid max_in_flight, it should be a strictly positive integer, not: %d"
+                        % max_in_flight
+                    )
 
             # The worker thread needs an event loop, it can't create a new one internally because it
             # has to be accessible by the user while calling "complete()", instead we use the global
@@ -903,7 +1117,7 @@ class Logger:
                     ) from e
 
             coro = sink if iscoroutinefunction(sink) else sink.__call__
-            wrapped_sink = AsyncSink(coro, loop, error_interceptor)
+            wrapped_sink = AsyncSink(coro, loop, error_interceptor, batch, max_in_flight)
             encoding = "utf8"
             terminator = "\n"
             exception_prefix = ""
@@ -1023,6 +1237,123 @@ class Logger:
         if not isinstance(encoding, str):
             encoding = "ascii"
 
+        if isinstance(enqueue, str) and enqueue not in ("thread", "shared_memory"):
+            raise ValueError(
+                "Invalid enqueue, it should be a boolean, 'thread' or 'shared_memory', not: '%s'"
+                % enqueue
+            )
+
+        if enqueue == "shared_memory" and SharedMemory is None:
+            raise ValueError(
+                "Invalid enqueue, 'shared_memory' requires the 'multiprocessing.shared_memory' "
+                "module (Python 3.8+)"
+            )
+
+        if not isinstance(batch_size, int) or isinstance(batch_size, bool):
+            raise TypeError(
+                "Invalid batch_size, it should be an integer, not: '%s'" % type(batch_size).__name__
+            )
+
+        if batch_size < 1:
+            raise ValueError(
+                "Invalid batch_size, it should be a strictly positive integer, not: %d" % batch_size
+            )
+
+        if not isinstance(batch_bytes, int) or isinstance(batch_bytes, bool):
+            raise TypeError(
+                "Invalid batch_bytes, it should be an integer, not: '%s'"
+                % type(batch_bytes).__name__
+            )
+
+        if batch_bytes < 1:
+            raise ValueError(
+                "Invalid batch_bytes, it should be a strictly positive integer, not: %d"
+                % batch_bytes
+            )
+
+        if queue_size is not None:
+            if not isinstance(queue_size, int) or isinstance(queue_size, bool):
+                raise TypeError(
+                    "Invalid queue_size, it should be an integer or None, not: '%s'"
+                    % type(queue_size).__name__
+                )
+            if queue_size < 1:
+                raise ValueError(
+                    "Invalid queue_size, it should be a strictly positive integer, not: %d"
+                    % queue_size
+                )
+
+        if not isinstance(overflow, str):
+            raise TypeError(
+                "Invalid overflow, it should be a string, not: '%s'" % type(overflow).__name__
+            )
+
+        overflow_timeout = None
+
+        if overflow.startswith("block_timeout:"):
+            try:
+                overflow_timeout = float(overflow[len("block_timeout:") :])
+            except ValueError:
+                overflow_timeout = -1
+            if not (math.isfinite(overflow_timeout) and overflow_timeout >= 0):
+                raise ValueError(
+                    "Invalid overflow timeout, it should be a positive number of seconds: '%s'"
+                    % overflow
+                )
+            overflow = "block_timeout"
+        elif overflow not in ("block", "drop_new", "drop_old"):
+            raise ValueError(
+                "Invalid overflow, it should be 'block', 'drop_new', 'drop_old' or "
+                "'block_timeout:<seconds>', not: '%s'" % overflow
+            )
+
+        if overflow == "drop_old" and enqueue and enqueue != "thread":
+            raise ValueError(
+                "Invalid overflow, 'drop_old' can only be used with enqueue='thread', "
+                "not with a multiprocessing queue"
+            )
+
+        if shedding is not None:
+            if isinstance(shedding, timedelta):
+                shedding = shedding.total_seconds()
+            elif not isinstance(shedding, (int, float)) or isinstance(shedding, bool):
+                raise TypeError(
+                    "Invalid shedding, it should be a number, a timedelta or None, not: '%s'"
+                    % type(shedding).__name__
+                )
+            if not shedding > 0:
+                raise ValueError(
+                    "Invalid shedding, it should be a strictly positive delay, not: %s" % shedding
+                )
+
+        if priority is None:
+            priority_levelno = None
+        elif isinstance(priority, str):
+            priority_levelno = self.level(priority).no
+        elif isinstance(priority, int) and not isinstance(priority, bool):
+            priority_levelno = priority
+        else:
+            raise TypeError(
+                "Invalid priority, it should be an integer, a string or None, not: '%s'"
+                % type(priority).__name__
+            )
+
+        if priority_levelno is not None and priority_levelno < 0:
+            raise ValueError(
+                "Invalid priority value, it should be a positive integer, not: %d"
+                % priority_levelno
+            )
+
+        if not isinstance(on_fork, str):
+            raise TypeError(
+                "Invalid on_fork, it should be a string, not: '%s'" % type(on_fork).__name__
+            )
+
+        if on_fork not in ("share", "restart"):
+            raise ValueError(
+                "Invalid on_fork, it should be 'share' or 'restart', not: '%s'" % on_fork
+            )
+
         if isinstance(context, str):
             context = get_context(context)
         elif context is not None and not isinstance(context, BaseContext):
@@ -1031,6 +1362,28 @@ class Logger:
                 "not: '%s'" % type(context).__name__
             )
 
+        # Handlers with the same formatting settings produce the same message for a given record,
+        # which can therefore be formatted once and shared. Functions may not be deterministic, or
+        # may modify the record in the case of filters, so they exclude the handler from sharing.
+        # Messages formatted by the writer thread or numbered by the handler are not shared either.
+        if (
+            is_formatter_dynamic
+            or not _filters.is_static_filter(filter_func)
+            or (enqueue and (defer_formatting or priority_levelno is not None))
+        ):
+            format_key = None
+        else:
+            format_key = (
+                format,
+                terminator,
+                colorize,
+                serialize,
+                encoding,
+                diagnose,
+                backtrace,
+                exception_prefix,
+            )
+
         with self._core.lock:
             exception_formatter = ExceptionFormatter(
                 colorize=colorize,
@@ -1051,18 +1404,30 @@ class Logger:
                 colorize=colorize,
                 serialize=serialize,
                 enqueue=enqueue,
+                batch_size=batch_size,
+                batch_bytes=batch_bytes,
+                queue_size=queue_size,
+                overflow=overflow,
+                overflow_timeout=overflow_timeout,
+                shared_memory_size=_defaults.LOGURU_SHARED_MEMORY_SIZE,
+                shedding=shedding,
+                priority=priority_levelno,
+                writer_pool=self._core.writer_pool,
+                on_fork=on_fork,
                 multiprocessing_context=context,
                 id_=handler_id,
                 error_interceptor=error_interceptor,
                 exception_formatter=exception_formatter,
+                format_key=format_key,
+                defer_formatting=defer_formatting,
                 levels_ansi_codes=self._core.levels_ansi_codes,
+                levels_lookup=self._core.levels_lookup,
             )
 
             handlers = self._core.handlers.copy()
             handlers[handler_id] = handler
 
-            self._core.min_level = min(self._core.min_level, levelno)
-            self._core.handlers = handlers
+            self._core.update_handlers(handlers)
 
         return handler_id
 
@@ -1108,9 +1473,7 @@ class Logger:
                 handler = handlers.pop(handler_id)
 
                 # This needs to be done first in case "stop()" raises an exception
-                levelnos = (h.levelno for h in handlers.values())
-                self._core.min_level = min(levelnos, default=float("inf"))
-                self._core.handlers = handlers
+                self._core.update_handlers(handlers)
 
                 handler.stop()
 
@@ -1398,6 +1761,10 @@ class Logger:
         Note that it's not possible to chain |opt| calls, the last one takes precedence over the
         others as it will "reset" the options to their default values.
 
+        The returned logger is immutable. Unless an exception object is passed, identical calls
+        return the same logger, so using |opt| repeatedly from a wrapper function is cheap. Such a
+        logger can also be created once (e.g. at module level) and re-used by each logging call.
+
         Parameters
         ----------
         exception : |bool|, |tuple| or |Exception|, optional
@@ -1478,8 +1845,45 @@ class Logger:
                 stacklevel=2,
             )
 
-        args = self._options[-2:]
-        return Logger(self._core, exception, depth, record, lazy, colors, raw, capture, *args)
+        # The returned logger is immutable, so it can be re-used by identical calls (typically made
+        # repeatedly from the same wrapper function). Exception objects are not cached, as they
+        # would be kept alive along with their traceback.
+        if not (exception is None or isinstance(exception, bool)):
+            return self._make_opt(exception, depth, record, lazy, colors, raw, capture)
+
+        # The type of "depth" is part of the key, as "1.0" is equal to "1" but is not a valid depth.
+        key = (exception, depth, type(depth), record, lazy, colors, raw, capture)
+        opt_cache = self._opt_cache
+
+        if opt_cache is None:
+            opt_cache = self._opt_cache = {}
+        else:
+            try:
+                return opt_cache[key]
+            except KeyError:
+                pass
+
+        if len(opt_cache) >= 32:
+            opt_cache.pop(next(iter(opt_cache), None), None)
+
+        opt_cache[key] = logger = self._make_opt(
+            exception, depth, record, lazy, colors, raw, capture
+        )
+        return logger
+
+    def _make_opt(self, exception, depth, record, lazy, colors, raw, capture):
+        # The flags are normalized, so that the equal options sharing a cache entry always create
+        # equivalent loggers.
+        options = (
+            exception,
+            depth,
+            bool(record),
+            bool(lazy),
+            bool(colors),
+            bool(raw),
+            bool(capture),
+        )
+        return Logger(self._core, *options, *self._options[-2:])
 
     def bind(__self, **kwargs):  # noqa: N805
         """Bind attributes to the ``extra`` dict of each logged message record.
@@ -1552,15 +1956,14 @@ class Logger:
         >>> logger.info("Done.")
         Done. | {}
         """
-        with __self._core.lock:
-            new_context = {**context.get(), **kwargs}
-            token = context.set(new_context)
+        # The context variable is local to the current thread or task, it's not shared with the
+        # core and therefore does not require the lock to be updated.
+        token = context.set({**context.get(), **kwargs})
 
         try:
             yield
         finally:
-            with __self._core.lock:
-                context.reset(token)
+            context.reset(token)
 
     def patch(self, patcher):
         """Attach a function to modify the record dict created by each logging call.
@@ -1708,9 +2111,16 @@ class Logger:
         with self._core.lock:
             self._core.levels[name] = level
             self._core.levels_ansi_codes[name] = ansi
-            self._core.levels_lookup[name] = (name, name, no, icon)
+            self._core.levels_lookup[name] = (
+                name,
+                name,
+                no,
+                icon,
+                share_attribute(RecordLevel(name, no, icon)),
+            )
             for handler in self._core.handlers.values():
                 handler.update_format(name)
+            self._core.dispatch_table = {}
 
         return level
 
@@ -1762,7 +2172,81 @@ class Logger:
         """
         self._change_activation(name, True)
 
-    def configure(self, *, handlers=None, levels=None, extra=None, patcher=None, activation=None):
+    def is_enabled(self, level):
+        """Check whether a message with the given level would be logged by the caller.
+
+        This is useful to avoid computing an expensive value which would only be used to build a
+        message discarded right away. The answer takes into account the level of each handler, the
+        modules disabled by |disable|, and the modules rejected by handlers configured with a
+        ``str`` or ``dict`` filter. It relies on the same caches used by logging calls, so it's
+        very cheap to call.
+
+        The answer is ``True`` if the message may be accepted by at least one handler, but it does
+        not guarantee the message will effectively be logged: filters implemented as functions
+        and patchers are not evaluated, as they depend on the record of the message.
+
+        Parameters
+        ----------
+        level : |int| or |str|
+            The level name or severity of the message which would be logged.
+
+        Returns
+        -------
+        :class:`bool`
+            Whether a message logged with the given level from the current module may be accepted
+            by the handlers.
+
+        Examples
+        --------
+        >>> logger.add(sys.stderr, level="INFO")
+        >>> logger.is_enabled("DEBUG")
+        False
+        >>> if logger.is_enabled("INFO"):
+        ...     logger.info("Statistics: {}", compute_statistics())
+        ...
+        [18:04:36] Statistics: {'count': 42}
+        """
+        core = self._core
+
+        try:
+            _, _, level_no, _, _ = core.levels_lookup[level]
+        except (KeyError, TypeError):
+            _, _, level_no, _, _ = core.find_level(level)
+
+        if level_no < core.min_level:
+            return False
+
+        _, depth, _, _, _, _, _, patchers, _ = self._options
+
+        try:
+            frame = get_frame(depth + 1)
+        except ValueError:
+            name = None
+        else:
+            name = frame.f_globals.get("__name__")
+
+        try:
+            enabled, module_level, _ = core.dispatch_table[name]
+        except KeyError:
+            enabled, module_level, _ = core.find_dispatch(name)
+
+        if not enabled:
+            return False
+
+        # Patchers may modify the name or the level of the record, it can't be known in advance.
+        return level_no >= module_level or bool(core.patcher or patchers)
+
+    def configure(
+        self,
+        *,
+        handlers=None,
+        levels=None,
+        extra=None,
+        patcher=None,
+        activation=None,
+        time_resolution=None,
+        writers=None
+    ):
         """Configure the core logger.
 
         It should be noted that ``extra`` values set using this function are available across all
@@ -1796,6 +2280,19 @@ class Logger:
             and |disable| are made accordingly to the list order. This will not modify previously
             activated loggers, so if you need a fresh start prepend your list with ``("", False)``
             or ``("", True)``.
+        time_resolution : |float| or |timedelta|, optional
+            The interval (in seconds) during which the time of logged messages is considered
+            unchanged. By default, the current time is retrieved for each message. When a
+            resolution is set, all the messages logged during the same interval share the same
+            ``record["time"]``, which saves the cost of retrieving it when logging at a very high
+            rate. Setting it to ``0`` restores the default behavior.
+        writers : |int|, optional
+            The number of threads shared by the handlers added afterwards with
+            ``enqueue="thread"`` to write their messages, instead of one thread per handler. The
+            messages of each handler are still written in order, and the handlers are served in
+            turn, one batch at a time. The handlers added beforehand keep their own writer thread
+            (or the pool they were using), unless they're removed through ``handlers``. Setting it
+            to ``0`` restores the default behavior.
 
         Returns
         -------
@@ -1824,7 +2321,47 @@ class Logger:
         >>> # => "foo - Context without bind"
         >>> logger.bind(context="bar").info("Suppress global context")
         >>> # => "bar - Suppress global context"
+
+        >>> # Trade a millisecond of precision for faster logging
+        >>> logger.configure(time_resolution=0.001)
+
+        >>> # Share two threads between many handlers writing in the background
+        >>> logger.configure(writers=2)
+        >>> for tenant in ["foo", "bar", "baz"]:
+        ...     logger.add("%s.log" % tenant, enqueue="thread")
         """
+        # The arguments are validated beforehand, so that an invalid one doesn't leave the logger
+        # partially configured (e.g. without any handler).
+        if time_resolution is not None:
+            if isinstance(time_resolution, timedelta):
+                seconds = time_resolution.total_seconds()
+            elif isinstance(time_resolution, (int, float)) and not isinstance(
+                time_resolution, bool
+            ):
+                seconds = time_resolution
+            else:
+                raise TypeError(
+                    "Invalid time resolution, it should be a number or a timedelta, not: '%s'"
+                    % type(time_resolution).__name__
+                )
+
+            if not math.isfinite(seconds) or seconds < 0:
+                raise ValueError(
+                    "Invalid time resolution, it should be a finite positive value, not: %s"
+                    % time_resolution
+                )
+
+        if writers is not None:
+            if not isinstance(writers, int) or isinstance(writers, bool):
+                raise TypeError(
+                    "Invalid writers, it should be an integer, not: '%s'" % type(writers).__name__
+                )
+
+            if writers < 0:
+                raise ValueError(
+                    "Invalid writers, it should be a positive integer, not: %d" % writers
+                )
+
         if handlers is not None:
             self.remove()
         else:
@@ -1839,9 +2376,10 @@ class Logger:
                 self._core.patcher = patcher
 
         if extra is not None:
+            # The dict is replaced rather than updated, because the records not yet fully computed
+            # keep a reference to the previous one.
             with self._core.lock:
-                self._core.extra.clear()
-                self._core.extra.update(extra)
+                self._core.extra = dict(extra)
 
         if activation is not None:
             for name, state in activation:
@@ -1850,6 +2388,18 @@ class Logger:
                 else:
                     self.disable(name)
 
+        if time_resolution is not None:
+            with self._core.lock:
+                self._core.clock = CoarseClock(seconds) if seconds else aware_now
+
+        if writers is not None:
+            with self._core.lock:
+                writer_pool = self._core.writer_pool
+                self._core.writer_pool = WriterPool(writers) if writers else None
+
+            if writer_pool is not None:
+                writer_pool.close()
+
         return [self.add(**params) for params in handlers]
 
     def reinstall(self):
@@ -1890,14 +2440,9 @@ class Logger:
             )
 
         with self._core.lock:
-            enabled = self._core.enabled.copy()
-
             if name is None:
-                for n in enabled:
-                    if n is None:
-                        enabled[n] = status
                 self._core.activation_none = status
-                self._core.enabled = enabled
+                self._core.dispatch_table = {}
                 return
 
             if name != "":
@@ -1916,12 +2461,8 @@ class Logger:
 
                 activation_list.sort(key=modules_depth, reverse=True)
 
-            for n in enabled:
-                if n is not None and (n + ".")[: len(name)] == name:
-                    enabled[n] = status
-
             self._core.activation_list = activation_list
-            self._core.enabled = enabled
+            self._core.dispatch_table = {}
 
     @staticmethod
     def parse(file, pattern, *, cast={}, chunk=2**16):  # noqa: B006
@@ -2057,22 +2598,9 @@ class Logger:
             return
 
         try:
-            level_id, level_name, level_no, level_icon = core.levels_lookup[level]
+            level_id, level_name, level_no, level_icon, shared_level = core.levels_lookup[level]
         except (KeyError, TypeError):
-            if isinstance(level, str):
-                raise ValueError("Level '%s' does not exist" % level) from None
-            if not isinstance(level, int):
-                raise TypeError(
-                    "Invalid level, it should be an integer or a string, not: '%s'"
-                    % type(level).__name__
-                ) from None
-            if level < 0:
-                raise ValueError(
-                    "Invalid level value, it should be a positive integer, not: %d" % level
-                ) from None
-            cache = (None, "Level %d" % level, level, " ")
-            level_id, level_name, level_no, level_icon = cache
-            core.levels_lookup[level] = cache
+            level_id, level_name, level_no, level_icon, shared_level = core.find_level(level)
 
         if level_no < core.min_level:
             return
@@ -2098,31 +2626,19 @@ class Logger:
             name = None
 
         try:
-            if not core.enabled[name]:
-                return
+            enabled, module_level, handlers = core.dispatch_table[name]
         except KeyError:
-            enabled = core.enabled
-            if name is None:
-                status = core.activation_none
-                enabled[name] = status
-                if not status:
-                    return
-            else:
-                dotted_name = name + "."
-                for dotted_module_name, status in core.activation_list:
-                    if dotted_name[: len(dotted_module_name)] == dotted_module_name:
-                        if status:
-                            break
-                        enabled[name] = False
-                        return
-                enabled[name] = True
-
-        current_datetime = aware_now()
-
-        file_name = basename(co_filename)
+            enabled, module_level, handlers = core.find_dispatch(name)
+
+        if not enabled:
+            return
+
+        # Patchers may modify the name or the level of the record before it is sent to handlers.
+        if level_no < module_level and not (core.patcher or patchers):
+            return
+
+        current_datetime = core.clock()
         thread = current_thread()
-        process = current_process()
-        elapsed = current_datetime - start_time
 
         if exception:
             if isinstance(exception, BaseException):
@@ -2138,28 +2654,45 @@ class Logger:
         if is_template(message):
             message = self._template_to_string(message)
 
-        log_record = {
-            "elapsed": elapsed,
-            "exception": exception,
-            "extra": {**core.extra, **context.get(), **extra},
-            "file": RecordFile(file_name, co_filename),
-            "function": co_name,
-            "level": RecordLevel(level_name, level_no, level_icon),
-            "line": f_lineno,
-            "message": str(message),
-            "module": splitext(file_name)[0],
-            "name": name,
-            "process": RecordProcess(process.ident, process.name),
-            "thread": RecordThread(thread.ident, thread.name),
-            "time": current_datetime,
-        }
-
         if lazy:
             args = [arg() for arg in args]
             kwargs = {key: value() for key, value in kwargs.items()}
 
         if capture and kwargs:
-            log_record["extra"].update(kwargs)
+            extras = (core.extra, context.get(), extra, kwargs)
+        else:
+            extras = (core.extra, context.get(), extra)
+
+        # The attributes of the record are shared between calls, unless patchers may modify them.
+        shared = not (core.patcher or patchers)
+
+        # Values which are costly to compute are left pending in the record. They're computed
+        # right away only if the handlers are known to use them, otherwise on first access.
+        log_record = Record(
+            {
+                "elapsed": PENDING,
+                "exception": exception,
+                "extra": PENDING,
+                "file": PENDING,
+                "function": co_name,
+                "level": shared_level if shared else RecordLevel(level_name, level_no, level_icon),
+                "line": f_lineno,
+                "message": str(message),
+                "module": PENDING,
+                "name": name,
+                "process": PENDING,
+                "thread": PENDING,
+                "time": current_datetime,
+            }
+        )
+        log_record._lazy = (co_filename, current_datetime, start_time, thread, extras, shared)
+
+        record_fields = core.record_fields
+
+        if record_fields is None or not shared:
+            log_record._fill()
+        elif record_fields:
+            log_record._fill(record_fields)
 
         if record:
             if "record" in kwargs:
@@ -2167,7 +2700,7 @@ class Logger:
                     "The message can't be formatted: 'record' shall not be used as a keyword "
                     "argument while logger has been configured with '.opt(record=True)'"
                 )
-            kwargs.update(record=log_record)
+            kwargs = {**kwargs, "record": log_record}
 
         if colors:
             if args or kwargs:
@@ -2188,8 +2721,19 @@ class Logger:
         for patcher in patchers:
             patcher(log_record)
 
-        for handler in core.handlers.values():
-            handler.emit(log_record, level_id, from_decorator, raw, colored_message)
+        if core.patcher or patchers:
+            level_no = log_record["level"].no
+            try:
+                _, _, handlers = core.dispatch_table[log_record["name"]]
+            except KeyError:
+                _, _, handlers = core.find_dispatch(log_record["name"])
+
+        # Messages formatted by a handler are reused by the next ones with the same settings.
+        messages = {} if core.shared_formats else None
+
+        for levelno, handler in handlers:
+            if level_no >= levelno:
+                handler.emit(log_record, level_id, from_decorator, raw, colored_message, messages)
 
     def trace(__self, __message, *args, **kwargs):  # noqa: N805
         r"""Log ``message.format(*args, **kwargs)`` with severity ``'TRACE'``."""
@@ -1,5 +1,12 @@
 import pickle
+import sys
 from collections import namedtuple
+from datetime import timedelta, timezone
+from functools import lru_cache
+from multiprocessing import current_process
+from os.path import basename, splitext
+
+from ._datetime import datetime
 
 
 class RecordLevel:
@@ -43,6 +50,16 @@ class RecordLevel:
         """
         return "(name=%r, no=%r, icon=%r)" % (self.name, self.no, self.icon)
 
+    def __reduce__(self):
+        """Reduce the RecordLevel for pickling.
+
+        Returns
+        -------
+        tuple
+            A tuple containing class and initialization arguments
+        """
+        return (RecordLevel, (self.name, self.no, self.icon))
+
     def __format__(self, spec):
         """Format the RecordLevel instance.
 
@@ -95,6 +112,16 @@ class RecordFile:
         """
         return "(name=%r, path=%r)" % (self.name, self.path)
 
+    def __reduce__(self):
+        """Reduce the RecordFile for pickling.
+
+        Returns
+        -------
+        tuple
+            A tuple containing class and initialization arguments
+        """
+        return (RecordFile, (self.name, self.path))
+
     def __format__(self, spec):
         """Format the RecordFile instance.
 
@@ -147,6 +174,16 @@ class RecordThread:
         """
         return "(id=%r, name=%r)" % (self.id, self.name)
 
+    def __reduce__(self):
+        """Reduce the RecordThread for pickling.
+
+        Returns
+        -------
+        tuple
+            A tuple containing class and initialization arguments
+        """
+        return (RecordThread, (self.id, self.name))
+
     def __format__(self, spec):
         """Format the RecordThread instance.
 
@@ -199,6 +236,16 @@ class RecordProcess:
         """
         return "(id=%r, name=%r)" % (self.id, self.name)
 
+    def __reduce__(self):
+        """Reduce the RecordProcess for pickling.
+
+        Returns
+        -------
+        tuple
+            A tuple containing class and initialization arguments
+        """
+        return (RecordProcess, (self.id, self.name))
+
     def __format__(self, spec):
         """Format the RecordProcess instance.
 
@@ -291,3 +338,461 @@ class RecordException(
             return cls(type_, None, traceback_)
         else:
             return cls(type_, value, traceback_)
+
+
+class _ReadOnlyAttribute:
+    """A mixin preventing the modification of the record attributes shared between records.
+
+    The records passed to patchers have their own attributes, which can be modified freely.
+    """
+
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError(
+            "The '%s' attribute can't be modified because it's shared between records, "
+            "it should be done by a patcher instead" % name
+        )
+
+    def __delattr__(self, name):
+        self.__setattr__(name, None)
+
+
+class _SharedRecordLevel(_ReadOnlyAttribute, RecordLevel):
+    __slots__ = ()
+
+
+class _SharedRecordFile(_ReadOnlyAttribute, RecordFile):
+    __slots__ = ()
+
+
+class _SharedRecordThread(_ReadOnlyAttribute, RecordThread):
+    __slots__ = ()
+
+
+class _SharedRecordProcess(_ReadOnlyAttribute, RecordProcess):
+    __slots__ = ()
+
+
+_shared_attribute_types = {
+    RecordLevel: _SharedRecordLevel,
+    RecordFile: _SharedRecordFile,
+    RecordThread: _SharedRecordThread,
+    RecordProcess: _SharedRecordProcess,
+}
+
+
+def share_attribute(attribute):
+    """Make a record attribute read-only, so that it can be shared between records.
+
+    Parameters
+    ----------
+    attribute : RecordLevel, RecordFile, RecordThread or RecordProcess
+        The attribute to share, which must not be used by any record yet
+
+    Returns
+    -------
+    object
+        The same instance, which can't be modified anymore (it's unpickled as a regular one)
+    """
+    object.__setattr__(attribute, "__class__", _shared_attribute_types[type(attribute)])
+    return attribute
+
+
+@lru_cache(maxsize=1024)
+def _get_shared_file(file_path):
+    file_name = basename(file_path)
+    return share_attribute(RecordFile(file_name, file_path)), splitext(file_name)[0]
+
+
+@lru_cache(maxsize=256)
+def _get_shared_thread(ident, name):
+    return share_attribute(RecordThread(ident, name))
+
+
+@lru_cache(maxsize=16)
+def _get_shared_process(ident, name):
+    return share_attribute(RecordProcess(ident, name))
+
+
+@lru_cache(maxsize=64)
+def _get_shared_timezone(offset, names):
+    return timezone(timedelta(microseconds=offset), *names)
+
+
+_MICROSECOND = timedelta(microseconds=1)
+
+
+class _PendingValue:
+    """The placeholder of a record value which has not been computed yet."""
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return "<pending>"
+
+
+PENDING = _PendingValue()
+
+
+class Record(dict):
+    """A class representing the record dict of a logged message.
+
+    Some values of the record are costly to compute but are rarely used by the handlers. Such
+    values are computed lazily, on first access, from the information captured at the time of the
+    logging call. Until then, their keys are associated to the ``PENDING`` placeholder, so that the
+    keys are always present and ordered as documented. As soon as the record is used as a whole
+    (iterated, compared, copied, pickled...), all the values are computed so that it behaves
+    exactly like a regular dict.
+
+    The ``file``, ``thread`` and ``process`` attributes are deterministic for a given caller. Unless
+    the record is meant to be modified in-place by patchers, they're shared between records instead
+    of being allocated for each one, and are therefore read-only.
+
+    Attributes
+    ----------
+    _lazy : tuple
+        The ``(file_path, datetime, start_time, thread, extras, shared)`` captured during the
+        logging call
+    """
+
+    __slots__ = ("_lazy",)
+
+    lazy_keys = frozenset(("elapsed", "extra", "file", "module", "process", "thread"))
+
+    ordered_keys = (
+        "elapsed",
+        "exception",
+        "extra",
+        "file",
+        "function",
+        "level",
+        "line",
+        "message",
+        "module",
+        "name",
+        "process",
+        "thread",
+        "time",
+    )
+
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        if value is PENDING:
+            # The value is replaced in-place, the dict is never reorganized since the record may be
+            # read concurrently by other threads.
+            value = self._compute(key)
+            dict.__setitem__(self, key, value)
+        return value
+
+    def _compute(self, key):
+        """Compute the value associated to a lazy key.
+
+        Parameters
+        ----------
+        key : str
+            One of the ``lazy_keys``
+
+        Returns
+        -------
+        object
+            The value of the record for this key
+        """
+        file_path, datetime, start_time, thread, extras, shared = self._lazy
+
+        if key == "elapsed":
+            return datetime - start_time
+        if key == "extra":
+            extra = {}
+            for layer in extras:
+                extra.update(layer)
+            return extra
+        if key == "file":
+            if shared:
+                return _get_shared_file(file_path)[0]
+            return RecordFile(basename(file_path), file_path)
+        if key == "module":
+            return _get_shared_file(file_path)[1]
+        if key == "process":
+            # The identifier and the name are part of the cache key, so that a process renamed or
+            # forked gets a new instance.
+            process = current_process()
+            if shared:
+                return _get_shared_process(process.ident, process.name)
+            return RecordProcess(process.ident, process.name)
+        if key == "thread":
+            if shared:
+                return _get_shared_thread(thread.ident, thread.name)
+            return RecordThread(thread.ident, thread.name)
+        raise KeyError(key)
+
+    def _get_extra(self, key):
+        """Retrieve a value of the ``extra`` dict, without building the dict if it's still pending.
+
+        Parameters
+        ----------
+        key
+            The key of the value in the ``extra`` dict
+
+        Returns
+        -------
+        object
+            The value associated to the key
+
+        Raises
+        ------
+        KeyError
+            If the key is not part of the ``extra`` dict
+        """
+        if dict.get(self, "extra") is not PENDING:
+            return self["extra"][key]
+        # The layers are ordered by precedence, the last ones overriding the first ones.
+        for layer in reversed(self._lazy[4]):
+            if key in layer:
+                return layer[key]
+        raise KeyError(key)
+
+    def _fill(self, keys=None):
+        """Compute the values of the given lazy keys (or all of them) immediately.
+
+        Parameters
+        ----------
+        keys : frozenset, optional
+            The keys to compute, all the pending ones are computed if ``None``
+        """
+        for key in Record.lazy_keys if keys is None else keys:
+            if dict.get(self, key) is PENDING:
+                dict.__setitem__(self, key, self._compute(key))
+
+    def __iter__(self):
+        self._fill()
+        return dict.__iter__(self)
+
+    def __eq__(self, other):
+        self._fill()
+        if isinstance(other, Record):
+            other._fill()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other):
+        self._fill()
+        if isinstance(other, Record):
+            other._fill()
+        return dict.__ne__(self, other)
+
+    def __repr__(self):
+        self._fill()
+        return dict.__repr__(self)
+
+    def __reduce__(self):
+        self._fill()
+        # The keys are not pickled if they're the usual ones, only the values are.
+        if dict.__len__(self) == len(Record.ordered_keys) and all(
+            dict.__contains__(self, key) for key in Record.ordered_keys
+        ):
+            values = self._to_compact_values()
+            if values is not None:
+                return (Record._from_compact_values, (values,))
+            return (Record._from_values, (tuple(map(self.__getitem__, Record.ordered_keys)),))
+        return (Record, (dict(self.items()),))
+
+    def _to_compact_values(self):
+        """Flatten the values of the usual keys into plain values cheap to pickle.
+
+        The record attributes are replaced by their fields, the values which can be deduced from
+        the file path are omitted, and the time is reduced to its binary state. This is only
+        possible if the values have their usual types, ``None`` is returned otherwise.
+
+        Returns
+        -------
+        tuple or None
+            The flattened values, to be restored by ``_from_compact_values()``
+        """
+        elapsed, level, file, process, thread, time = (
+            dict.__getitem__(self, "elapsed"),
+            dict.__getitem__(self, "level"),
+            dict.__getitem__(self, "file"),
+            dict.__getitem__(self, "process"),
+            dict.__getitem__(self, "thread"),
+            dict.__getitem__(self, "time"),
+        )
+
+        if (
+            type(elapsed) is not timedelta
+            or type(level) not in (RecordLevel, _SharedRecordLevel)
+            or type(file) not in (RecordFile, _SharedRecordFile)
+            or type(process) not in (RecordProcess, _SharedRecordProcess)
+            or type(thread) not in (RecordThread, _SharedRecordThread)
+            or type(time) is not datetime
+            or type(time.tzinfo) is not timezone
+            or type(file.path) is not str
+        ):
+            return None
+
+        shared_file, module = _get_shared_file(file.path)
+        if file.name != shared_file.name or dict.__getitem__(self, "module") != module:
+            return None
+
+        # The pickled state of the time is its binary representation followed by the timezone.
+        time_state = time.__reduce__()[1][0]
+        tz_args = time.tzinfo.__getinitargs__()
+
+        return (
+            elapsed // _MICROSECOND,
+            dict.__getitem__(self, "exception"),
+            dict.__getitem__(self, "extra"),
+            file.path,
+            dict.__getitem__(self, "function"),
+            level.name,
+            level.no,
+            level.icon,
+            dict.__getitem__(self, "line"),
+            dict.__getitem__(self, "message"),
+            dict.__getitem__(self, "name"),
+            process.id,
+            process.name,
+            thread.id,
+            thread.name,
+            time_state,
+            tz_args[0] // _MICROSECOND,
+            tz_args[1:],
+        )
+
+    @classmethod
+    def _from_compact_values(cls, values):
+        """Create a Record instance from the values flattened by ``_to_compact_values()``.
+
+        The record attributes are new instances, but the strings deduced from the file path and the
+        timezones are shared between the records unpickled in the same process.
+
+        Parameters
+        ----------
+        values : tuple
+            The flattened values of the usual keys
+
+        Returns
+        -------
+        Record
+            A new instance containing all the keys
+        """
+        (
+            elapsed,
+            exception,
+            extra,
+            file_path,
+            function,
+            level_name,
+            level_no,
+            level_icon,
+            line,
+            message,
+            name,
+            process_id,
+            process_name,
+            thread_id,
+            thread_name,
+            time_state,
+            tz_offset,
+            tz_names,
+        ) = values
+
+        shared_file, module = _get_shared_file(file_path)
+        time = datetime(time_state, _get_shared_timezone(tz_offset, tz_names))
+
+        return cls(
+            elapsed=timedelta(microseconds=elapsed),
+            exception=exception,
+            extra=extra,
+            file=RecordFile(shared_file.name, file_path),
+            function=function,
+            level=RecordLevel(level_name, level_no, level_icon),
+            line=line,
+            message=message,
+            module=module,
+            name=name,
+            process=RecordProcess(process_id, process_name),
+            thread=RecordThread(thread_id, thread_name),
+            time=time,
+        )
+
+    @classmethod
+    def _from_values(cls, values):
+        """Create a Record instance from the values of its usual keys.
+
+        Parameters
+        ----------
+        values : tuple
+            The values associated to the keys, in the order of ``ordered_keys``
+
+        Returns
+        -------
+        Record
+            A new instance containing all the keys
+        """
+        return cls(zip(cls.ordered_keys, values))
+
+    def snapshot(self):
+        """Create a copy of the record unaffected by the later changes made to this one.
+
+        Returns
+        -------
+        Record
+            A new instance containing all the computed values, the ``extra`` dict being copied
+        """
+        snapshot = Record(self.items())
+        extra = dict.get(snapshot, "extra")
+        if type(extra) is dict:
+            dict.__setitem__(snapshot, "extra", extra.copy())
+        return snapshot
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def setdefault(self, key, default=None):
+        if key in self:
+            return self[key]
+        self[key] = default
+        return default
+
+    def keys(self):
+        self._fill()
+        return dict.keys(self)
+
+    def values(self):
+        self._fill()
+        return dict.values(self)
+
+    def items(self):
+        self._fill()
+        return dict.items(self)
+
+    def copy(self):
+        self._fill()
+        return dict.copy(self)
+
+    def pop(self, *args):
+        self._fill()
+        return dict.pop(self, *args)
+
+    def popitem(self):
+        self._fill()
+        return dict.popitem(self)
+
+    if sys.version_info >= (3, 8):
+
+        def __reversed__(self):
+            self._fill()
+            return dict.__reversed__(self)
+
+    if sys.version_info >= (3, 9):
+
+        def __or__(self, other):
+            self._fill()
+            return dict.__or__(self, other)
+
+        def __ror__(self, other):
+            self._fill()
+            return dict.__ror__(self, other)
@@ -0,0 +1,125 @@
+import os
+import pickle
+import struct
+from multiprocessing.context import assert_spawning
+from queue import Full
+from time import monotonic, sleep
+
+try:
+    from multiprocessing.shared_memory import SharedMemory
+except ImportError:  # pragma: no cover
+    SharedMemory = None
+
+
+# The memory starts with the number of bytes ever read and written, followed by the ring of
+# length-prefixed pickled messages. The first counter is only updated by the consumer, the second
+# one by the producers.
+_HEADER = struct.Struct("QQ")
+_COUNTER = struct.Struct("Q")
+_LENGTH = struct.Struct("I")
+
+
+class SharedMemoryQueue:
+    """A queue of messages written by any process and read by a single thread of the owner.
+
+    The producers are serialized by a lock, but the consumer reads the messages without it: the
+    number of written bytes is only updated once a message is entirely written, and the semaphore
+    counting the messages is only released afterwards.
+    """
+
+    def __init__(self, context, size, timeout=None):
+        self._size = size
+        self._timeout = timeout
+        self._memory = SharedMemory(create=True, size=_HEADER.size + size)
+        self._buffer = self._memory.buf
+        self._lock = context.Lock()
+        self._items = context.Semaphore(0)
+        self._owner_pid = os.getpid()
+        _HEADER.pack_into(self._buffer, 0, 0, 0)
+
+    def put(self, obj):
+        data = pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+        length = _LENGTH.size + len(data)
+
+        if length > self._size:
+            raise ValueError(
+                "The message is too large for the shared memory queue: %d bytes" % len(data)
+            )
+
+        # The control messages (stop, confirmation and wake up) must always get through, they wait
+        # for room regardless of the timeout used to drop the log messages.
+        timeout = None if obj is None or obj is True or obj is False else self._timeout
+        deadline = None
+        delay = 0.0001
+
+        while True:
+            with self._lock:
+                read, written = _HEADER.unpack_from(self._buffer, 0)
+                if written - read + length <= self._size:
+                    self._write(written, _LENGTH.pack(len(data)))
+                    self._write(written + _LENGTH.size, data)
+                    _COUNTER.pack_into(self._buffer, _COUNTER.size, written + length)
+                    break
+
+            # The ring is full, the producer waits for the consumer to catch up. This is expected
+            # to be rare enough that polling is preferable to another synchronization primitive.
+            if timeout is not None:
+                if deadline is None:
+                    deadline = monotonic() + timeout
+                if monotonic() >= deadline:
+                    raise Full
+
+            sleep(delay)
+            delay = min(delay * 2, 0.01)
+
+        self._items.release()
+
+    def get(self):
+        self._items.acquire()
+        (read,) = _COUNTER.unpack_from(self._buffer, 0)
+        (length,) = _LENGTH.unpack(self._read(read, _LENGTH.size))
+        data = self._read(read + _LENGTH.size, length)
+        _COUNTER.pack_into(self._buffer, 0, read + _LENGTH.size + length)
+        return pickle.loads(data)
+
+    def empty(self):
+        read, written = _HEADER.unpack_from(self._buffer, 0)
+        return read == written
+
+    def close(self):
+        self._buffer = None
+        self._memory.close()
+        if self._owner_pid == os.getpid():
+            self._memory.unlink()
+
+    def _write(self, position, data):
+        start = _HEADER.size + position % self._size
+        end = start + len(data)
+        limit = _HEADER.size + self._size
+        if end <= limit:
+            self._buffer[start:end] = data
+        else:
+            split = limit - start
+            view = memoryview(data)
+            self._buffer[start:limit] = view[:split]
+            self._buffer[_HEADER.size : end - self._size] = view[split:]
+
+    def _read(self, position, length):
+        start = _HEADER.size + position % self._size
+        end = start + length
+        limit = _HEADER.size + self._size
+        if end <= limit:
+            return bytes(self._buffer[start:end])
+        return bytes(self._buffer[start:limit]) + bytes(
+            self._buffer[_HEADER.size : end - self._size]
+        )
+
+    def __getstate__(self):
+        assert_spawning(self)
+        return (self._memory.name, self._size, self._timeout, self._lock, self._items)
+
+    def __setstate__(self, state):
+        name, self._size, self._timeout, self._lock, self._items = state
+        self._memory = SharedMemory(name=name)
+        self._buffer = self._memory.buf
+        self._owner_pid = None
@@ -1,6 +1,8 @@
+import asyncio
 import inspect
 import logging
 import weakref
+from collections import deque
 
 from ._asyncio_loop import get_running_loop, get_task_loop
 
@@ -32,6 +34,21 @@ class StreamSink:
         if self._flushable:
             self._stream.flush()
 
+    def write_many(self, messages):
+        """Write several messages to the stream, flushing it only once.
+
+        Parameters
+        ----------
+        messages
+            An iterable of the messages to write.
+        """
+        try:
+            for message in messages:
+                self._stream.write(message)
+        finally:
+            if self._flushable:
+                self._stream.flush()
+
     def stop(self):
         """Stop the stream if it supports the stop operation."""
         if self._stoppable:
@@ -113,6 +130,24 @@ class StandardSink:
         return []
 
 
+class _DeferredAwaitable:
+    """An awaitable creating the coroutine to await only once it is actually awaited.
+
+    Parameters
+    ----------
+    function
+        The coroutine function to call when awaited.
+    """
+
+    __slots__ = ("_function",)
+
+    def __init__(self, function):
+        self._function = function
+
+    def __await__(self):
+        return self._function().__await__()
+
+
 class AsyncSink:
     """A sink that handles asynchronous logging operations.
 
@@ -124,13 +159,21 @@ class AsyncSink:
         The event loop to use.
     error_interceptor
         An interceptor for handling errors.
+    batch
+        The maximum number of messages passed at once to the function as a list, or ``None``.
+    max_in_flight
+        The maximum number of calls to the function running concurrently, or ``None``.
     """
 
-    def __init__(self, function, loop, error_interceptor):
+    def __init__(self, function, loop, error_interceptor, batch=None, max_in_flight=None):
         self._function = function
         self._loop = loop
         self._error_interceptor = error_interceptor
+        self._batch = batch
+        self._max_in_flight = max_in_flight
+        self._is_consumed = batch is not None or max_in_flight is not None
         self._tasks = weakref.WeakSet()
+        self._consumers = {}
 
     def write(self, message):
         """Asynchronously write a message.
@@ -145,6 +188,10 @@ class AsyncSink:
         except RuntimeError:
             return
 
+        if self._is_consumed:
+            self._schedule(loop, message)
+            return
+
         coroutine = self._function(message)
         task = loop.create_task(coroutine)
 
@@ -162,6 +209,8 @@ class AsyncSink:
         """Cancel all pending tasks."""
         for task in self._tasks:
             task.cancel()
+        for _, task in list(self._consumers.values()):
+            task.cancel()
 
     def tasks_to_complete(self):
         """Return list of tasks that need to be completed.
@@ -171,6 +220,11 @@ class AsyncSink:
         list
             List of tasks to complete.
         """
+        if self._is_consumed:
+            # The coroutine must only be created if awaited, "logger.complete()" being possibly
+            # called from synchronous code.
+            return [_DeferredAwaitable(self._complete_consumer)]
+
         # To avoid errors due to "self._tasks" being mutated while iterated, the
         # "tasks_to_complete()" method must be protected by the same lock as "write()" (which
         # happens to be the handler lock). However, the tasks must not be awaited while the lock is
@@ -194,14 +248,133 @@ class AsyncSink:
         except Exception:
             pass  # Handled in "check_exception()"
 
+    async def _complete_consumer(self):
+        """Wait for the consumer of the current loop to write all its messages."""
+        loop = get_running_loop()
+
+        # The messages sent from other threads are only added once the loop runs their callbacks.
+        await asyncio.sleep(0)
+
+        while loop in self._consumers:
+            _, task = self._consumers[loop]
+            await asyncio.wait([task])
+
+    def _schedule(self, loop, message):
+        """Pass a message to the consumer task of the loop, from any thread.
+
+        Parameters
+        ----------
+        loop
+            The event loop running the consumer.
+        message
+            The message to write.
+        """
+        try:
+            running_loop = get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        if running_loop is loop:
+            self._put(loop, message)
+        else:
+            loop.call_soon_threadsafe(self._put, loop, message)
+
+    def _put(self, loop, message):
+        """Add a message to the consumer of the loop, starting it if needed.
+
+        Parameters
+        ----------
+        loop
+            The event loop running the consumer, which must be the current one.
+        message
+            The message to write.
+        """
+        # The consumer ends as soon as there is no more message to write, so that no task is left
+        # pending once the loop is closed. It's only started again by the next message.
+        consumer = self._consumers.get(loop)
+        if consumer is not None:
+            consumer[0].append(message)
+            return
+
+        messages = deque([message])
+        task = loop.create_task(self._consume(loop, messages))
+        self._consumers[loop] = (messages, task)
+
+    async def _consume(self, loop, messages):
+        """Write the messages of a loop until there are none left.
+
+        Parameters
+        ----------
+        loop
+            The event loop running the consumer.
+        messages
+            The queue of messages to write, filled by "_put()".
+        """
+        running = set()
+
+        try:
+            if self._max_in_flight in (None, 1):
+                while messages:
+                    await self._call(loop, self._take(messages))
+                return
+
+            while messages or running:
+                while messages and len(running) < self._max_in_flight:
+                    running.add(loop.create_task(self._call(loop, self._take(messages))))
+                _, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in running:
+                task.cancel()
+            del self._consumers[loop]
+
+    def _take(self, messages):
+        """Remove the argument of the next call to the function from the queue.
+
+        Parameters
+        ----------
+        messages
+            The queue of messages to write.
+
+        Returns
+        -------
+        Message or list
+            The next message, or a list of the next messages if they are batched.
+        """
+        if self._batch is None:
+            return messages.popleft()
+        return [messages.popleft() for _ in range(min(self._batch, len(messages)))]
+
+    async def _call(self, loop, argument):
+        """Call the function, reporting its error without interrupting the consumer.
+
+        Parameters
+        ----------
+        loop
+            The event loop running the consumer.
+        argument
+            The message or list of messages to write.
+        """
+        try:
+            await self._function(argument)
+        except Exception as exception:
+            if not self._error_interceptor.should_catch():
+                loop.call_exception_handler(
+                    {"message": "Exception in coroutine sink", "exception": exception}
+                )
+                return
+            record = argument[0].record if self._batch is not None else argument.record
+            self._error_interceptor.print(record, exception=exception)
+
     def __getstate__(self):
         state = self.__dict__.copy()
         state["_tasks"] = None
+        state["_consumers"] = None
         return state
 
     def __setstate__(self, state):
         self.__dict__.update(state)
         self._tasks = weakref.WeakSet()
+        self._consumers = {}
 
 
 class CallableSink:
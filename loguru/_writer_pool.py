@@ -0,0 +1,120 @@
+import os
+import threading
+import weakref
+from queue import SimpleQueue
+from threading import Thread
+
+
+class WriterPool:
+    def __init__(self, size):
+        self._size = size
+        self._reset()
+        pools.add(self)
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._ready = SimpleQueue()
+        self._scheduled = set()
+        self._threads = []
+        self._handlers_count = 0
+
+    @property
+    def size(self):
+        return self._size
+
+    def attach(self):
+        # The threads are started once the first handler is attached, in each process, and stopped
+        # as soon as the last one is detached.
+        if self._pid != os.getpid():
+            self._reset()
+
+        with self._lock:
+            self._handlers_count += 1
+            if self._threads:
+                return
+            for i in range(self._size):
+                thread = Thread(
+                    target=self._worker,
+                    args=(self._ready,),
+                    daemon=True,
+                    name="loguru-writer-pool-%d" % i,
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def detach(self):
+        with self._lock:
+            self._handlers_count -= 1
+        self._stop_if_unused()
+
+    def close(self):
+        # The pool is closed when replaced, but its threads keep serving the handlers using it.
+        self._stop_if_unused()
+
+    def notify(self, handler):
+        # Each handler is scheduled at most once, so that it's never served by two threads at the
+        # same time and its messages are written in order.
+        with self._lock:
+            if handler in self._scheduled:
+                return
+            self._scheduled.add(handler)
+            ready = self._ready
+        ready.put(handler)
+
+    def _stop_if_unused(self):
+        # The stopped threads get their own queue, so that the threads started again by a handler
+        # attached in the meantime can't consume the messages meant to stop them.
+        with self._lock:
+            if self._handlers_count > 0 or not self._threads:
+                return
+            threads, self._threads = self._threads, []
+            ready, self._ready = self._ready, SimpleQueue()
+
+        for _ in threads:
+            ready.put(None)
+
+        for thread in threads:
+            thread.join()
+
+    def _worker(self, ready):
+        while True:
+            handler = ready.get()
+
+            if handler is None:
+                break
+
+            # A handler is served until it has written a batch, then it's put back at the end of
+            # the line if more messages are waiting, so that the handlers are served in turn.
+            handler.serve_queue()
+
+            with self._lock:
+                if not handler.has_queued_messages():
+                    self._scheduled.discard(handler)
+                    continue
+
+            ready.put(handler)
+
+    def __getstate__(self):
+        return {"_size": self._size}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._reset()
+        pools.add(self)
+
+
+pools = weakref.WeakSet()
+
+if hasattr(os, "register_at_fork"):
+    # The threads of the pools don't exist in the child process, they're started again as soon as
+    # the handlers restart their queue. The state is reset beforehand because the lock may have
+    # been acquired by another thread of the parent at the time of the fork (unless a handler
+    # restarted after the fork already did it).
+
+    def reset_pools():
+        for pool in pools:
+            if pool._pid != os.getpid():
+                pool._reset()
+
+    os.register_at_fork(after_in_child=reset_pools)
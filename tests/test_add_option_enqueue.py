@@ -1,10 +1,15 @@
+import datetime
+import json
 import pickle
+import queue as queue_module
 import re
 import sys
+import threading
 import time
 
 import pytest
 
+import loguru
 from loguru import logger
 
 from .conftest import default_threading_excepthook
@@ -292,3 +297,876 @@ def test_logging_not_unpicklable_exception(exception_value):
     assert type_ is ValueError
     assert value is None
     assert traceback_ is None
+
+
+def test_defer_formatting(writer):
+    threads = []
+
+    def formatter(record):
+        threads.append(threading.current_thread())
+        return "{level} {extra[a]} {message}\n"
+
+    logger.add(writer, format=formatter, enqueue=True, defer_formatting=True)
+    logger.bind(a=1).info("Test")
+    logger.complete()
+
+    assert writer.read() == "INFO 1 Test\n"
+    assert threads != [threading.current_thread()]
+    assert threads[0].name.startswith("loguru-writer")
+
+
+def test_defer_formatting_with_exception(writer):
+    logger.add(writer, format="{message}", enqueue=True, defer_formatting=True)
+
+    try:
+        1 / 0  # noqa: B018
+    except ZeroDivisionError:
+        logger.exception("Error")
+
+    logger.complete()
+    lines = writer.read().splitlines()
+
+    assert lines[0] == "Error"
+    assert lines[-1] == "ZeroDivisionError: division by zero"
+
+
+def test_defer_formatting_with_serialize(writer):
+    logger.add(writer, format="{message}", enqueue=True, defer_formatting=True, serialize=True)
+    logger.info("Test")
+    logger.complete()
+
+    assert json.loads(writer.read())["text"] == "Test\n"
+
+
+def test_defer_formatting_error_reported_by_writer(writer, capsys):
+    logger.add(writer, format="{extra[missing]}", enqueue=True, defer_formatting=True, catch=True)
+    logger.info("Test")
+    logger.complete()
+
+    out, err = capsys.readouterr()
+    assert writer.read() == ""
+    assert out == ""
+    assert err.startswith("--- Logging error in Loguru Handler #0 ---")
+    assert "KeyError" in err
+
+
+def test_defer_formatting_without_enqueue(writer):
+    threads = []
+
+    def formatter(record):
+        threads.append(threading.current_thread())
+        return "{message}\n"
+
+    logger.add(writer, format=formatter, defer_formatting=True)
+    logger.info("Test")
+
+    assert writer.read() == "Test\n"
+    assert threads == [threading.current_thread()]
+
+
+def test_enqueue_thread():
+    x = []
+
+    def sink(message):
+        time.sleep(0.1)
+        x.append((message, message.record, threading.current_thread()))
+
+    not_picklable = NotPicklable()
+
+    logger.add(sink, format="{message}", enqueue="thread")
+    logger.bind(obj=not_picklable).debug("Test")
+    assert len(x) == 0
+    logger.complete()
+    assert len(x) == 1
+
+    message, record, thread = x[0]
+    assert message == "Test\n"
+    assert record["extra"]["obj"] is not_picklable
+    assert thread.name.startswith("loguru-writer")
+
+
+def test_enqueue_thread_with_exception():
+    x = []
+
+    def sink(message):
+        x.append(message)
+
+    logger.add(sink, format="{message}", enqueue="thread", catch=False)
+
+    try:
+        1 / 0  # noqa: B018
+    except ZeroDivisionError:
+        logger.exception("Error")
+
+    logger.complete()
+    lines = x[0].splitlines()
+
+    assert lines[0] == "Error"
+    assert lines[-1] == "ZeroDivisionError: division by zero"
+    assert x[0].record["exception"].traceback is not None
+
+
+def test_enqueue_thread_with_defer_formatting(writer):
+    logger.add(writer, format="{level} {message}", enqueue="thread", defer_formatting=True)
+    logger.info("Test")
+    logger.complete()
+
+    assert writer.read() == "INFO Test\n"
+
+
+def test_enqueue_thread_with_defer_formatting_not_affected_by_later_changes():
+    stream = BlockingStream()
+
+    def modify(message):
+        message.record["extra"]["value"] = "Modified"
+        message.record["message"] = "Modified"
+
+    logger.add(
+        stream,
+        format="{extra[value]} {message}",
+        enqueue="thread",
+        defer_formatting=True,
+        batch_size=1,
+    )
+    logger.add(modify, format="{message}")
+
+    logger.bind(value="Start").info("Start")
+    stream.started.wait()
+    logger.bind(value="Original").info("Test")
+    stream.released.set()
+    logger.complete()
+
+    assert stream.written == ["Start Start\n", "Original Test\n"]
+
+
+def test_enqueue_thread_caught_exception_sink_write(capsys):
+    logger.add(NotWritable(), enqueue="thread", catch=True, format="{message}")
+    logger.info("It's fine")
+    logger.bind(fail=True).info("Bye bye...")
+    logger.info("It's fine again")
+    logger.remove()
+
+    out, err = capsys.readouterr()
+    lines = err.strip().splitlines()
+    assert out == "It's fine\nIt's fine again\n"
+    assert lines[0] == "--- Logging error in Loguru Handler #0 ---"
+    assert lines[-1] == "--- End of logging error ---"
+
+
+def test_enqueue_thread_stopped_on_remove():
+    i = logger.add(lambda _: None, enqueue="thread")
+    thread = logger._core.handlers[i]._thread
+    assert thread.is_alive()
+    logger.remove(i)
+    assert not thread.is_alive()
+
+
+def test_invalid_enqueue_value():
+    with pytest.raises(ValueError, match=r"Invalid enqueue, it should be a boolean, 'thread' or"):
+        logger.add(lambda _: None, enqueue="process")
+
+
+class BlockingStream:
+    def __init__(self):
+        self.started = threading.Event()
+        self.released = threading.Event()
+        self.written = []
+        self.flushes = []
+
+    def write(self, message):
+        self.started.set()
+        self.released.wait()
+        if "fail" in message.record["extra"]:
+            raise RuntimeError("You asked me to fail...")
+        self.written.append(message)
+
+    def flush(self):
+        self.flushes.append(len(self.written))
+
+
+def log_batch(stream, count, *, enqueue=True, **kwargs):
+    logger.add(stream, format="{message}", enqueue=enqueue, catch=True, **kwargs)
+    logger.info("Start")
+    stream.started.wait()
+    for i in range(count):
+        logger.info("{}", i)
+    stream.released.set()
+    logger.complete()
+
+
+def test_enqueue_batch():
+    stream = BlockingStream()
+    log_batch(stream, 5)
+    assert stream.written == ["Start\n", "0\n", "1\n", "2\n", "3\n", "4\n"]
+    assert stream.flushes == [1, 6]
+
+
+def test_enqueue_batch_size():
+    stream = BlockingStream()
+    log_batch(stream, 5, batch_size=2)
+    assert len(stream.written) == 6
+    assert stream.flushes == [1, 3, 5, 6]
+
+
+def test_enqueue_batch_bytes():
+    stream = BlockingStream()
+    log_batch(stream, 5, batch_bytes=5)
+    assert len(stream.written) == 6
+    assert stream.flushes == [1, 4, 6]
+
+
+def test_enqueue_batch_with_error(capsys):
+    stream = BlockingStream()
+    logger.add(stream, format="{message}", enqueue=True, catch=True)
+    logger.info("Start")
+    stream.started.wait()
+    logger.info("A")
+    logger.bind(fail=True).info("B")
+    logger.info("C")
+    stream.released.set()
+    logger.complete()
+
+    out, err = capsys.readouterr()
+    lines = err.strip().splitlines()
+    assert stream.written == ["Start\n", "A\n", "C\n"]
+    assert out == ""
+    assert lines[0] == "--- Logging error in Loguru Handler #0 ---"
+    assert lines[1].startswith("Record was: {")
+    assert "'message': 'B'" in lines[1]
+    assert lines[-2] == "RuntimeError: You asked me to fail..."
+    assert lines[-1] == "--- End of logging error ---"
+
+
+@pytest.mark.parametrize("rotation", [None, "1 KB"])
+def test_enqueue_batch_file(tmp_path, rotation):
+    filepath = tmp_path / "test.log"
+    logger.add(filepath, format="{message}", enqueue=True, rotation=rotation)
+    for i in range(100):
+        logger.info("{}", i)
+    logger.remove()
+
+    lines = "".join(f.read_text() for f in sorted(tmp_path.iterdir(), reverse=True)).splitlines()
+    assert sorted(map(int, lines)) == list(range(100))
+
+
+@pytest.mark.parametrize("batch_size", [0, -1])
+def test_invalid_batch_size_value(batch_size):
+    with pytest.raises(ValueError, match=r"Invalid batch_size, it should be a strictly positive"):
+        logger.add(lambda _: None, batch_size=batch_size)
+
+
+@pytest.mark.parametrize("batch_size", [1.0, "1", True])
+def test_invalid_batch_size_type(batch_size):
+    with pytest.raises(TypeError, match=r"Invalid batch_size, it should be an integer"):
+        logger.add(lambda _: None, batch_size=batch_size)
+
+
+@pytest.mark.parametrize("batch_bytes", [0, -1])
+def test_invalid_batch_bytes_value(batch_bytes):
+    with pytest.raises(ValueError, match=r"Invalid batch_bytes, it should be a strictly positive"):
+        logger.add(lambda _: None, batch_bytes=batch_bytes)
+
+
+@pytest.mark.parametrize("batch_bytes", [1.0, "1", True])
+def test_invalid_batch_bytes_type(batch_bytes):
+    with pytest.raises(TypeError, match=r"Invalid batch_bytes, it should be an integer"):
+        logger.add(lambda _: None, batch_bytes=batch_bytes)
+
+
+@pytest.mark.parametrize("enqueue", [True, "thread"])
+def test_queue_size_drop_new(enqueue):
+    stream = BlockingStream()
+    log_batch(stream, 10, enqueue=enqueue, queue_size=2, overflow="drop_new")
+    assert stream.written == [
+        "Start\n",
+        "0\n",
+        "9 messages dropped because the handler could not keep up\n",
+    ]
+
+
+def test_queue_size_drop_old():
+    stream = BlockingStream()
+    log_batch(stream, 10, enqueue="thread", queue_size=2, overflow="drop_old")
+    assert stream.written == [
+        "Start\n",
+        "9\n",
+        "9 messages dropped because the handler could not keep up\n",
+    ]
+
+
+@pytest.mark.parametrize("enqueue", [True, "thread"])
+def test_queue_size_block_timeout(enqueue):
+    stream = BlockingStream()
+    start = time.monotonic()
+    log_batch(stream, 10, enqueue=enqueue, queue_size=2, overflow="block_timeout:0.01")
+    assert time.monotonic() - start < 5
+    assert stream.written == [
+        "Start\n",
+        "0\n",
+        "9 messages dropped because the handler could not keep up\n",
+    ]
+
+
+@pytest.mark.parametrize("enqueue", [True, "thread"])
+def test_queue_size_block(enqueue):
+    written = []
+    pending = []
+
+    def slow_sink(message):
+        time.sleep(0.01)
+        written.append(message)
+
+    logger.add(slow_sink, format="{message}", enqueue=enqueue, queue_size=2, overflow="block")
+    handler = next(iter(logger._core.handlers.values()))
+
+    for i in range(10):
+        logger.info("{}", i)
+        pending.append(i + 1 - len(written))
+
+    logger.complete()
+
+    assert written == ["%d\n" % i for i in range(10)]
+    assert max(pending) == 2
+    assert handler._queue_slots.acquire(False)
+    assert handler._queue_slots.acquire(False)
+
+
+def test_queue_size_dropped_record():
+    stream = BlockingStream()
+    log_batch(stream, 3, enqueue="thread", queue_size=1, overflow="drop_new")
+    record = stream.written[-1].record
+    assert record["level"].name == "WARNING"
+    assert record["message"] == "3 messages dropped because the handler could not keep up"
+    assert record["name"] == "loguru._handler"
+    assert record["thread"].name.startswith("loguru-writer")
+
+
+def test_queue_size_dropped_record_not_sent_to_other_handlers(writer):
+    stream = BlockingStream()
+    logger.add(writer, format="{level} {message}", enqueue="thread")
+    log_batch(stream, 3, enqueue="thread", queue_size=1, overflow="drop_new")
+    assert writer.read() == "INFO Start\nINFO 0\nINFO 1\nINFO 2\n"
+
+
+def test_queue_size_drop_old_keeps_control_messages_in_place():
+    stream = BlockingStream()
+    i = logger.add(stream, format="{message}", enqueue="thread", queue_size=2, overflow="drop_old")
+    handler = logger._core.handlers[i]
+
+    logger.info("Start")
+    stream.started.wait()
+    logger.info("0")
+
+    thread = threading.Thread(target=logger.complete)
+    thread.start()
+    while handler._queue.qsize() < 2:
+        time.sleep(0.001)
+
+    logger.info("1")
+    logger.info("2")
+
+    assert list(handler._queue.queue) == [True, "2\n"]
+
+    stream.released.set()
+    thread.join()
+    logger.complete()
+
+    assert stream.written == [
+        "Start\n",
+        "2 messages dropped because the handler could not keep up\n",
+        "2\n",
+    ]
+
+
+def test_queue_size_drop_old_while_writing():
+    stream = BlockingStream()
+    log_batch(stream, 3, enqueue="thread", queue_size=1, overflow="drop_old")
+    assert stream.written == [
+        "Start\n",
+        "3 messages dropped because the handler could not keep up\n",
+    ]
+
+
+def test_queue_size_slot_released_if_stopped():
+    records = []
+    logger.add(lambda m: records.append(m.record), format="{message}")
+    i = logger.add(lambda _: None, enqueue="thread", queue_size=1, overflow="drop_new")
+    handler = logger._core.handlers[i]
+
+    logger.info("Test")
+    logger.remove(i)
+
+    level_id = logger._core.levels_lookup["INFO"][1]
+    handler.emit(records[0], level_id, False, False, None)
+
+    assert handler._queue_slots.acquire(False)
+
+
+def test_queue_size_without_enqueue(writer):
+    logger.add(writer, format="{message}", queue_size=1, overflow="drop_new")
+    for i in range(3):
+        logger.info("{}", i)
+    assert writer.read() == "0\n1\n2\n"
+
+
+@pytest.mark.parametrize("queue_size", [0, -1])
+def test_invalid_queue_size_value(queue_size):
+    with pytest.raises(ValueError, match=r"Invalid queue_size, it should be a strictly positive"):
+        logger.add(lambda _: None, queue_size=queue_size)
+
+
+@pytest.mark.parametrize("queue_size", [1.0, "1", True])
+def test_invalid_queue_size_type(queue_size):
+    with pytest.raises(TypeError, match=r"Invalid queue_size, it should be an integer or None"):
+        logger.add(lambda _: None, queue_size=queue_size)
+
+
+@pytest.mark.parametrize("overflow", ["", "drop", "block_timeout", "foo:1"])
+def test_invalid_overflow_value(overflow):
+    with pytest.raises(ValueError, match=r"Invalid overflow, it should be"):
+        logger.add(lambda _: None, overflow=overflow)
+
+
+@pytest.mark.parametrize(
+    "overflow",
+    [
+        "block_timeout:",
+        "block_timeout:-1",
+        "block_timeout:abc",
+        "block_timeout:inf",
+        "block_timeout:nan",
+    ],
+)
+def test_invalid_overflow_timeout(overflow):
+    with pytest.raises(ValueError, match=r"Invalid overflow timeout"):
+        logger.add(lambda _: None, overflow=overflow)
+
+
+def test_invalid_overflow_type():
+    with pytest.raises(TypeError, match=r"Invalid overflow, it should be a string"):
+        logger.add(lambda _: None, overflow=1)
+
+
+def test_invalid_overflow_drop_old_with_multiprocessing_queue():
+    with pytest.raises(ValueError, match=r"'drop_old' can only be used with enqueue='thread'"):
+        logger.add(lambda _: None, enqueue=True, queue_size=1, overflow="drop_old")
+
+
+@pytest.fixture
+def shedding_delay(monkeypatch):
+    # The records are all timestamped at the same instant, the writer sees them as late as the
+    # current delay.
+    start = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+    delay = [0.0]
+    monkeypatch.setattr(
+        loguru._handler, "aware_now", lambda: start + datetime.timedelta(seconds=delay[0])
+    )
+    logger.configure(patcher=lambda record: record.update(time=start))
+
+    def set_delay(seconds):
+        delay[0] = seconds
+
+    return set_delay
+
+
+@pytest.mark.parametrize("enqueue", [True, "thread"])
+@pytest.mark.parametrize(
+    ("delay", "expected"),
+    [
+        (0.01, ["W0", "D1", "I1", "W1"]),
+        (0.15, ["W0", "I1", "W1", "1 message dropped because the handler could not keep up"]),
+        (0.3, ["W0", "W1", "2 messages dropped because the handler could not keep up"]),
+    ],
+)
+def test_shedding(shedding_delay, enqueue, delay, expected):
+    stream = BlockingStream()
+
+    logger.add(stream, format="{message}", enqueue=enqueue, batch_size=1, shedding=0.1, catch=False)
+
+    shedding_delay(delay)
+    logger.warning("W0")
+    stream.started.wait()
+
+    logger.debug("D1")
+    logger.info("I1")
+    logger.warning("W1")
+
+    stream.released.set()
+    logger.complete()
+
+    assert [message.strip() for message in stream.written] == expected
+
+
+def test_shedding_without_delay(writer):
+    logger.add(writer, format="{level} {message}", enqueue="thread", shedding=10)
+
+    for _ in range(3):
+        logger.debug("D")
+        logger.info("I")
+        logger.complete()
+
+    assert writer.read() == "DEBUG D\nINFO I\n" * 3
+
+
+def test_shedding_caught_up(shedding_delay):
+    stream = BlockingStream()
+
+    logger.add(stream, format="{message}", enqueue="thread", batch_size=1, shedding=0.1)
+
+    shedding_delay(1)
+    logger.warning("Start")
+    stream.started.wait()
+
+    for i in range(5):
+        logger.debug("{}", i)
+
+    stream.released.set()
+    logger.complete()
+
+    shedding_delay(0)
+    logger.debug("Caught up")
+    logger.complete()
+
+    assert stream.written[0] == "Start\n"
+    assert stream.written[-1] == "Caught up\n"
+    assert "0\n" not in stream.written
+
+
+def test_shedding_skips_formatting(shedding_delay):
+    stream = BlockingStream()
+    formatted = []
+
+    def formatter(record):
+        formatted.append(record["message"])
+        return "{message}\n"
+
+    logger.add(stream, format=formatter, enqueue="thread", batch_size=1, shedding=0.1)
+
+    shedding_delay(1)
+    logger.warning("Start")
+    stream.started.wait()
+
+    logger.debug("Shed")
+    logger.warning("Kept")
+
+    stream.released.set()
+    logger.complete()
+
+    assert formatted == ["Start", "Kept", "1 message dropped because the handler could not keep up"]
+
+
+@pytest.mark.parametrize("time", [datetime.datetime(2020, 1, 1), "2020-01-01"])
+def test_shedding_with_invalid_patched_time(writer, capsys, time):
+    logger.add(writer, format="{message}", enqueue="thread", shedding=0.1, catch=True)
+    logger.patch(lambda record: record.update(time=time)).info("Patched")
+    logger.info("Not patched")
+    logger.complete()
+
+    out, err = capsys.readouterr()
+    assert writer.read() == "Patched\nNot patched\n"
+    assert out == ""
+    assert err.startswith("--- Logging error in Loguru Handler #0 ---\n")
+    assert "Record was: {" in err
+    assert "TypeError" in err
+    assert err.count("--- End of logging error ---") == 1
+
+
+def test_shedding_timedelta(writer):
+    logger.add(writer, format="{message}", enqueue=True, shedding=datetime.timedelta(seconds=1))
+    logger.debug("Test")
+    logger.complete()
+    assert writer.read() == "Test\n"
+
+
+@pytest.mark.parametrize("shedding", [0, -1, datetime.timedelta(seconds=-1)])
+def test_invalid_shedding_value(shedding):
+    with pytest.raises(ValueError, match=r"Invalid shedding, it should be a strictly positive"):
+        logger.add(lambda _: None, shedding=shedding)
+
+
+@pytest.mark.parametrize("shedding", ["1", True, object()])
+def test_invalid_shedding_type(shedding):
+    with pytest.raises(TypeError, match=r"Invalid shedding, it should be a number, a timedelta"):
+        logger.add(lambda _: None, shedding=shedding)
+
+
+@pytest.mark.parametrize("enqueue", [True, "thread"])
+def test_priority(enqueue):
+    stream = BlockingStream()
+    logger.add(stream, format="{message}", enqueue=enqueue, priority="ERROR")
+    logger.info("Start")
+    stream.started.wait()
+    for i in range(3):
+        logger.info("{}", i)
+    logger.error("A")
+    logger.critical("B")
+    stream.released.set()
+    logger.complete()
+
+    assert stream.written == ["Start\n", "A\n", "B\n", "0\n", "1\n", "2\n"]
+    assert [m.sequence for m in stream.written] == [0, 4, 5, 1, 2, 3]
+
+
+def test_priority_global_order_reconstructed():
+    stream = BlockingStream()
+    logger.add(stream, format="{message}", enqueue="thread", priority=30)
+    stream.released.set()
+
+    for i in range(50):
+        logger.log(["INFO", "WARNING"][i % 3 == 0], "{}", i)
+
+    logger.complete()
+
+    ordered = sorted(stream.written, key=lambda m: m.sequence)
+    assert ordered == ["%d\n" % i for i in range(50)]
+
+
+def test_priority_with_deferred_formatting():
+    stream = BlockingStream()
+    log_batch(stream, 2, enqueue="thread", priority="INFO", defer_formatting=True)
+    assert stream.written == ["Start\n", "0\n", "1\n"]
+    assert [m.sequence for m in stream.written] == [0, 1, 2]
+
+
+def test_priority_not_limited_by_queue_size():
+    stream = BlockingStream()
+    logger.add(stream, format="{message}", enqueue="thread", queue_size=1, overflow="drop_new")
+    logger.add(stream, format="{message}", enqueue="thread", priority="ERROR", queue_size=1)
+    logger.info("Start")
+    stream.started.wait()
+    for i in range(3):
+        logger.error("{}", i)
+    stream.released.set()
+    logger.complete()
+
+    assert [m for m in stream.written if m.record["level"].name == "ERROR"] == ["0\n", "1\n", "2\n"]
+    assert "3 messages dropped because the handler could not keep up\n" in stream.written
+
+
+def test_priority_shared_message_not_numbered(writer):
+    messages = []
+    logger.add(messages.append, format="{message}", enqueue="thread", priority="ERROR")
+    logger.add(writer, format="{message}", enqueue="thread")
+    logger.error("Test")
+    logger.complete()
+    assert messages == ["Test\n"]
+    assert messages[0].sequence == 0
+    assert writer.read() == "Test\n"
+
+
+@pytest.mark.parametrize("enqueue", [False, True, "thread"])
+def test_message_sequence_without_priority(enqueue):
+    messages = []
+    logger.add(messages.append, format="{message}", enqueue=enqueue)
+    logger.error("Test")
+    logger.complete()
+    assert messages == ["Test\n"]
+    assert messages[0].sequence is None
+
+
+@pytest.mark.parametrize("enqueue", [True, "thread"])
+def test_priority_sequence(enqueue):
+    messages = []
+    logger.add(messages.append, format="{message}", enqueue=enqueue, priority="ERROR")
+    logger.info("A")
+    logger.error("B")
+    logger.info("C")
+    logger.complete()
+    assert sorted(messages, key=lambda m: m.sequence) == ["A\n", "B\n", "C\n"]
+    assert sorted(m.sequence for m in messages) == [0, 1, 2]
+
+
+def test_priority_without_enqueue(writer):
+    logger.add(writer, format="{message}", priority="ERROR")
+    logger.info("A")
+    logger.error("B")
+    assert writer.read() == "A\nB\n"
+
+
+@pytest.mark.parametrize("priority", ["", "foo", -1])
+def test_invalid_priority_value(priority):
+    with pytest.raises(ValueError, match=r"Level '.*' does not exist|Invalid priority value"):
+        logger.add(lambda _: None, priority=priority)
+
+
+@pytest.mark.parametrize("priority", [1.0, True, object()])
+def test_invalid_priority_type(priority):
+    with pytest.raises(TypeError, match=r"Invalid priority, it should be an integer, a string"):
+        logger.add(lambda _: None, priority=priority)
+
+
+requires_shared_memory = pytest.mark.skipif(
+    sys.version_info < (3, 8), reason="No 'multiprocessing.shared_memory' module"
+)
+
+
+@requires_shared_memory
+def test_shared_memory(writer):
+    logger.add(writer, format="{message}", enqueue="shared_memory")
+    logger.info("Test")
+    logger.complete()
+    assert writer.read() == "Test\n"
+
+
+@requires_shared_memory
+def test_shared_memory_wrap_around(monkeypatch):
+    monkeypatch.setattr(loguru._defaults, "LOGURU_SHARED_MEMORY_SIZE", 1000)
+    written = []
+
+    def slow_sink(message):
+        time.sleep(0.001)
+        written.append(message)
+
+    logger.add(slow_sink, format="{message}", enqueue="shared_memory")
+    for i in range(100):
+        logger.info("{}", i)
+    logger.complete()
+
+    assert written == ["%d\n" % i for i in range(100)]
+
+
+@requires_shared_memory
+@pytest.mark.parametrize("overflow", ["drop_new", "block_timeout:0.01"])
+def test_shared_memory_full(monkeypatch, overflow):
+    monkeypatch.setattr(loguru._defaults, "LOGURU_SHARED_MEMORY_SIZE", 2000)
+    stream = BlockingStream()
+    log_batch(stream, 20, enqueue="shared_memory", overflow=overflow)
+
+    messages = [m for m in stream.written if "dropped" not in m]
+    dropped = [m for m in stream.written if "dropped" in m]
+
+    assert messages == ["Start\n"] + ["%d\n" % i for i in range(len(messages) - 1)]
+    assert len(messages) < 21
+    assert dropped == [
+        "%d messages dropped because the handler could not keep up\n" % (21 - len(messages))
+    ]
+
+
+@requires_shared_memory
+@pytest.mark.parametrize("sentinel", [None, True, False])
+def test_shared_memory_full_control_messages(sentinel):
+    import multiprocessing
+
+    from loguru._shared_memory_queue import SharedMemoryQueue
+
+    # Each integer takes 9 bytes (length prefix and pickle), the ring is entirely filled.
+    queue = SharedMemoryQueue(multiprocessing.get_context(), 9 * 10, timeout=0)
+    errors = []
+
+    def put_sentinel():
+        try:
+            queue.put(sentinel)
+        except Exception as e:
+            errors.append(e)
+
+    try:
+        for i in range(10):
+            queue.put(i)
+
+        with pytest.raises(queue_module.Full):
+            queue.put(10)
+
+        thread = threading.Thread(target=put_sentinel)
+        thread.start()
+        assert queue.get() == 0
+        thread.join()
+
+        assert errors == []
+        assert [queue.get() for _ in range(10)] == [*range(1, 10), sentinel]
+    finally:
+        queue.close()
+
+
+@requires_shared_memory
+@pytest.mark.parametrize("method", ["complete", "remove"])
+def test_shared_memory_full_complete_and_remove(monkeypatch, method):
+    from multiprocessing.shared_memory import SharedMemory
+
+    monkeypatch.setattr(loguru._defaults, "LOGURU_SHARED_MEMORY_SIZE", 2048)
+    stream = BlockingStream()
+
+    i = logger.add(
+        stream, format="{message}", enqueue="shared_memory", overflow="drop_new", catch=False
+    )
+    handler = logger._core.handlers[i]
+    name = handler._queue._memory.name
+
+    logger.info("Start")
+    stream.started.wait()
+    for j in range(20):
+        logger.info("{}", j)
+
+    assert handler._dropped_count.value > 0
+
+    timer = threading.Timer(0.05, stream.released.set)
+    timer.start()
+
+    if method == "complete":
+        logger.complete()
+    logger.remove(i)
+    timer.join()
+
+    assert not handler._thread.is_alive()
+    assert stream.written[0] == "Start\n"
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(name=name)
+
+
+@requires_shared_memory
+def test_shared_memory_message_too_large(monkeypatch, capsys):
+    monkeypatch.setattr(loguru._defaults, "LOGURU_SHARED_MEMORY_SIZE", 1000)
+    written = []
+    logger.add(written.append, format="{message}", enqueue="shared_memory", catch=True)
+    logger.info("x" * 2000)
+    logger.info("Ok")
+    logger.complete()
+
+    _, err = capsys.readouterr()
+    assert written == ["Ok\n"]
+    assert "The message is too large for the shared memory queue" in err
+
+
+@requires_shared_memory
+def test_shared_memory_released_on_remove():
+    from multiprocessing.shared_memory import SharedMemory
+
+    i = logger.add(lambda _: None, enqueue="shared_memory")
+    name = logger._core.handlers[i]._queue._memory.name
+    logger.remove(i)
+
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(name=name)
+
+
+def test_on_fork_without_enqueue(writer):
+    logger.add(writer, format="{message}", on_fork="restart")
+    logger.info("Test")
+    assert writer.read() == "Test\n"
+
+
+@pytest.mark.parametrize("option", [{"rotation": "10 MB"}, {"retention": 3}, {"compression": "gz"}])
+def test_on_fork_restart_with_file_management(tmp_path, option):
+    filepath = tmp_path / "test.log"
+    with pytest.raises(ValueError, match=r"^Invalid on_fork, 'restart' can't be used with a file"):
+        logger.add(filepath, enqueue=True, on_fork="restart", **option)
+    assert not filepath.exists()
+
+
+@pytest.mark.parametrize("option", [{"rotation": "10 MB"}, {"retention": 3}, {"compression": "gz"}])
+def test_on_fork_share_with_file_management(tmp_path, option):
+    filepath = tmp_path / "test.log"
+    logger.add(filepath, format="{message}", enqueue=True, on_fork="share", **option)
+    logger.add(tmp_path / "other.log", on_fork="restart", **option)
+    assert len(logger._core.handlers) == 2
+
+
+@pytest.mark.parametrize("on_fork", ["", "inherit", "Restart"])
+def test_invalid_on_fork_value(on_fork):
+    with pytest.raises(ValueError, match=r"Invalid on_fork, it should be 'share' or 'restart'"):
+        logger.add(lambda _: None, on_fork=on_fork)
+
+
+@pytest.mark.parametrize("on_fork", [None, True, 1])
+def test_invalid_on_fork_type(on_fork):
+    with pytest.raises(TypeError, match=r"Invalid on_fork, it should be a string"):
+        logger.add(lambda _: None, on_fork=on_fork)
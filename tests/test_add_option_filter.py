@@ -2,6 +2,7 @@ import re
 
 import pytest
 
+import loguru
 from loguru import logger
 
 
@@ -149,3 +150,97 @@ def test_invalid_filter_builtin(writer):
         ),
     ):
         logger.add(writer, filter=filter)
+
+
+@pytest.fixture
+def count_records(monkeypatch):
+    calls = []
+    aware_now = loguru._datetime._aware_now
+
+    def counting_aware_now():
+        calls.append(None)
+        return aware_now()
+
+    monkeypatch.setattr(loguru._datetime, "_aware_now", counting_aware_now)
+    return calls
+
+
+@pytest.mark.parametrize(
+    "filter",
+    ["tests.other", {"": False, "tests.other": "DEBUG"}, {"tests": "INFO"}],
+)
+def test_rejected_before_record_creation(writer, count_records, filter):
+    logger.add(writer, format="{message}", filter=filter, level="DEBUG")
+    logger.add(writer, format="{message}", level="WARNING")
+    logger.debug("Rejected")
+    assert count_records == []
+    assert writer.read() == ""
+
+
+def test_not_rejected_if_dynamic_filter(writer, count_records):
+    logger.add(writer, format="{message}", filter=lambda r: False, level="DEBUG")
+    logger.debug("Rejected")
+    assert len(count_records) == 1
+    assert writer.read() == ""
+
+
+def test_module_level_updated_on_add_and_remove(writer):
+    i = logger.add(writer, format="{message}", level="ERROR")
+    logger.info("1")
+    j = logger.add(writer, format="{message}", filter="tests", level="INFO")
+    logger.info("2")
+    logger.remove(j)
+    logger.info("3")
+    logger.remove(i)
+    logger.add(writer, format="{message}", filter={"tests": True}, level="TRACE")
+    logger.trace("4")
+    assert writer.read() == "2\n4\n"
+
+
+def test_module_level_updated_on_activation(writer):
+    logger.add(writer, format="{message}")
+    logger.info("1")
+    logger.disable("tests")
+    logger.info("2")
+    logger.enable("tests")
+    logger.info("3")
+    assert writer.read() == "1\n3\n"
+
+
+def test_module_level_ignored_with_patcher(writer):
+    def patcher(record):
+        record["name"] = "tests.other"
+
+    logger.add(writer, format="{message}", filter="tests.other")
+    logger.info("1")
+    logger.patch(patcher).info("2")
+    assert writer.read() == "2\n"
+
+
+def test_dispatch_only_to_matching_handlers(writer):
+    ids = [logger.add(writer, format="{message}", filter="pkg%d" % i) for i in range(10)]
+    enabled, module_level, handlers = logger._core.find_dispatch("pkg3.module")
+    assert enabled
+    assert module_level == 10
+    assert [handler for _, handler in handlers] == [logger._core.handlers[ids[3]]]
+
+
+def test_dispatch_with_level_per_module(writer):
+    i = logger.add(writer, format="{message}", filter={"pkg": "ERROR", "pkg.sub": False})
+    j = logger.add(writer, format="{message}", filter=lambda r: True, level="INFO")
+    handler_i, handler_j = logger._core.handlers[i], logger._core.handlers[j]
+    assert logger._core.find_dispatch("pkg.module") == (
+        True,
+        20,
+        ((40, handler_i), (20, handler_j)),
+    )
+    assert logger._core.find_dispatch("pkg.sub.module") == (True, 20, ((20, handler_j),))
+    assert logger._core.find_dispatch(None) == (True, 10, ((10, handler_i), (20, handler_j)))
+
+
+def test_dispatch_table_reset_on_changes(writer):
+    logger.add(writer, format="{message}")
+    logger.info("Test")
+    assert "tests.test_add_option_filter" in logger._core.dispatch_table
+    logger.add(writer, format="{message}")
+    assert logger._core.dispatch_table == {}
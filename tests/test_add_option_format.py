@@ -85,3 +85,120 @@ def test_markup_in_field(writer, colorize):
 def test_invalid_format_builtin(writer):
     with pytest.raises(ValueError, match=r".* most likely a mistake"):
         logger.add(writer, format=format)
+
+
+@pytest.mark.parametrize(
+    ("format", "expected"),
+    [
+        ("{{message}} {message}", "{message} Test\n"),
+        ("{message!r:>8}", "  'Test'\n"),
+        ("{message!a} {level.no:03d}", "'Test' 020\n"),
+        ("{extra[a]} {extra[b][0]} {extra[b][1]:.1f}", "A 1 2.0\n"),
+        ("{extra[key with spaces]}", "Space\n"),
+        ("{level.name.lower}", "<built-in method lower of str object at"),
+        ("{message:>{extra[width]}}", "    Test\n"),
+        ("{message:{extra[fill]}>8}", "....Test\n"),
+        ("{extra[a]!s:{extra[fill]}<3}", "A..\n"),
+    ],
+)
+def test_compiled_format(writer, format, expected):
+    logger.add(writer, format=format)
+    logger.bind(a="A", b=(1, 2), width=8, fill=".", **{"key with spaces": "Space"}).info("Test")
+    assert writer.read().startswith(expected)
+
+
+def test_compiled_format_with_int_key(writer):
+    logger.add(writer, format="{extra[items][0]} {extra[mapping][1]}")
+    logger.bind(items=["x"], mapping={1: "y"}).info("Test")
+    assert writer.read() == "x y\n"
+
+
+@pytest.mark.parametrize("format", ["{0}", "{}"])
+def test_format_with_positional_field(writer, capsys, format):
+    logger.add(writer, format=format)
+    logger.info("Test")
+    out, err = capsys.readouterr()
+    assert writer.read() == ""
+    assert out == ""
+    assert "ValueError" in err
+
+
+def test_format_with_missing_key(writer):
+    logger.add(writer, format="{extra[missing]} {message}", catch=False)
+    with pytest.raises(ValueError, match=r"key 'missing' not found"):
+        logger.info("Test")
+
+
+def test_message_shared_between_handlers_with_same_format():
+    first, second, third = [], [], []
+
+    logger.add(first.append, format="{level} {message}")
+    logger.add(second.append, format="{level} {message}", filter="tests")
+    logger.add(third.append, format="{message}")
+    logger.info("Test")
+
+    assert first == second == ["INFO Test\n"]
+    assert first[0] is second[0]
+    assert third == ["Test\n"]
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"format": "{message}!"},
+        {"colorize": True},
+        {"serialize": True},
+        {"backtrace": True},
+        {"diagnose": True},
+        {"filter": lambda r: True},
+        {"format": lambda r: "{message}\n"},
+    ],
+)
+def test_message_not_shared_between_handlers_with_different_settings(kwargs):
+    first, second = [], []
+    options = {"format": "{message}", "colorize": False, "backtrace": False, "diagnose": False}
+
+    logger.add(first.append, **options)
+    logger.add(second.append, **{**options, **kwargs})
+    logger.info("Test")
+
+    assert first[0] is not second[0]
+
+
+def test_message_shared_respects_handlers_level():
+    first, second = [], []
+
+    logger.add(first.append, format="{message}", level="INFO")
+    logger.add(second.append, format="{message}", level="WARNING")
+    logger.info("A")
+    logger.warning("B")
+
+    assert first == ["A\n", "B\n"]
+    assert second == ["B\n"]
+    assert first[1] is second[0]
+
+
+def test_exception_formatted_once_for_shared_handlers(monkeypatch):
+    from loguru._better_exceptions import ExceptionFormatter
+
+    calls = []
+    format_exception = ExceptionFormatter.format_exception
+
+    def counting_format_exception(self, *args, **kwargs):
+        calls.append(None)
+        return format_exception(self, *args, **kwargs)
+
+    monkeypatch.setattr(ExceptionFormatter, "format_exception", counting_format_exception)
+
+    first, second = [], []
+    logger.add(first.append, format="{message}", serialize=True)
+    logger.add(second.append, format="{message}", serialize=True)
+
+    try:
+        1 / 0  # noqa: B018
+    except ZeroDivisionError:
+        logger.exception("Error")
+
+    assert len(calls) == 1
+    assert first == second
+    assert "ZeroDivisionError" in first[0]
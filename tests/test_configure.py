@@ -1,4 +1,7 @@
+import datetime
+import pickle
 import sys
+import threading
 
 import pytest
 
@@ -216,3 +219,268 @@ def test_configure_after_bind(writer):
     logger_b.debug("bbb")
 
     assert writer.read() == ("default_a default_b init\n" "A default_b aaa\n" "default_a B bbb\n")
+
+
+@pytest.mark.parametrize("resolution", [60, 60.0, datetime.timedelta(minutes=1)])
+def test_time_resolution(writer, freeze_time, resolution):
+    logger.add(writer, format="{time:HH:mm:ss.SSS} {elapsed.seconds} {message}")
+    logger.configure(time_resolution=resolution)
+
+    with freeze_time("2020-01-01 12:00:00") as frozen:
+        logger.info("A")
+        frozen.tick(datetime.timedelta(seconds=30))
+        logger.info("B")
+        frozen.tick(datetime.timedelta(seconds=30))
+        logger.info("C")
+
+    lines = writer.read().splitlines()
+    assert [line[:12] for line in lines] == ["12:00:00.000", "12:00:00.000", "12:01:00.000"]
+    assert lines[0] == lines[1].replace("B", "A")
+
+
+def test_time_resolution_records_share_time():
+    records = []
+    logger.add(records.append, format="{message}")
+    logger.configure(time_resolution=3600)
+
+    logger.info("A")
+    logger.info("B")
+
+    first, second = (message.record for message in records)
+    assert first["time"] is second["time"]
+    assert first["elapsed"] == second["elapsed"]
+
+
+def test_time_resolution_reset(writer, freeze_time):
+    logger.add(writer, format="{time:HH:mm:ss.SSS} {message}")
+    logger.configure(time_resolution=60)
+    logger.configure(time_resolution=0)
+
+    with freeze_time("2020-01-01 12:00:00") as frozen:
+        logger.info("A")
+        frozen.tick(datetime.timedelta(milliseconds=1))
+        logger.info("B")
+
+    assert writer.read() == "12:00:00.000 A\n12:00:00.001 B\n"
+
+
+def test_time_resolution_pickled():
+    logger.configure(time_resolution=60)
+    logger.add(lambda _: None, format="{message}")
+    logger.info("A")
+
+    clock = pickle.loads(pickle.dumps(logger._core.clock))
+
+    assert clock.resolution == 60
+    assert clock._cache == (float("-inf"), None)
+
+
+@pytest.mark.parametrize("resolution", ["1s", True, [1]])
+def test_invalid_time_resolution_type(resolution):
+    with pytest.raises(TypeError, match=r"Invalid time resolution"):
+        logger.configure(time_resolution=resolution)
+
+
+@pytest.mark.parametrize(
+    "resolution", [-1, -0.5, datetime.timedelta(seconds=-1), float("nan"), float("inf")]
+)
+def test_invalid_time_resolution_value(resolution):
+    with pytest.raises(ValueError, match=r"Invalid time resolution"):
+        logger.configure(time_resolution=resolution)
+
+
+@pytest.mark.parametrize(
+    ("resolution", "exception"), [("fast", TypeError), (-1, ValueError), (float("nan"), ValueError)]
+)
+def test_invalid_time_resolution_keeps_configuration(writer, resolution, exception):
+    logger.add(writer, format="{message}")
+    logger.configure(extra={"a": 1})
+
+    with pytest.raises(exception, match=r"Invalid time resolution"):
+        logger.configure(
+            handlers=[{"sink": writer, "format": "{extra}"}],
+            extra={"a": 2},
+            time_resolution=resolution,
+        )
+
+    logger.info("Test")
+
+    assert writer.read() == "Test\n"
+    assert logger._core.extra == {"a": 1}
+
+
+def pool_threads():
+    return [t for t in threading.enumerate() if t.name.startswith("loguru-writer-pool")]
+
+
+def test_writers():
+    logger.configure(writers=2)
+    sinks = [[] for _ in range(5)]
+    for sink in sinks:
+        logger.add(sink.append, format="{message}", enqueue="thread", batch_size=3)
+
+    for i in range(20):
+        logger.info("{}", i)
+
+    logger.complete()
+
+    assert all(sink == ["%d\n" % i for i in range(20)] for sink in sinks)
+    assert all(h._thread is None for h in logger._core.handlers.values())
+    assert len(pool_threads()) == 2
+
+    logger.remove()
+    assert pool_threads() == []
+
+
+def test_writers_handlers_served_in_turn():
+    started = threading.Event()
+    released = threading.Event()
+    written = []
+
+    def blocking_sink(message):
+        started.set()
+        released.wait()
+        written.append("A" + message)
+
+    logger.configure(writers=1)
+    logger.add(
+        blocking_sink,
+        format="{message}",
+        filter=lambda r: r["extra"]["to"] == "A",
+        enqueue="thread",
+        batch_size=1,
+    )
+    logger.add(
+        lambda m: written.append("B" + m),
+        format="{message}",
+        filter=lambda r: r["extra"]["to"] == "B",
+        enqueue="thread",
+    )
+
+    logger.bind(to="A").info("0")
+    started.wait()
+    for i in range(1, 4):
+        logger.bind(to="A").info("{}", i)
+    logger.bind(to="B").info("4")
+    released.set()
+    logger.complete()
+
+    assert written == ["A0\n", "B4\n", "A1\n", "A2\n", "A3\n"]
+
+
+def test_writers_error_isolation(capsys):
+    def failing_sink(message):
+        raise RuntimeError("Oops")
+
+    written = []
+    logger.configure(writers=1)
+    logger.add(failing_sink, format="{message}", enqueue="thread", catch=True)
+    logger.add(written.append, format="{message}", enqueue="thread")
+
+    logger.info("A")
+    logger.info("B")
+    logger.complete()
+
+    _, err = capsys.readouterr()
+    assert written == ["A\n", "B\n"]
+    assert err.count("RuntimeError: Oops") == 2
+
+
+def test_writers_remove_handler(writer):
+    logger.configure(writers=1)
+    i = logger.add(writer, format="{message}", enqueue="thread")
+    logger.info("Test")
+    logger.remove(i)
+    logger.info("Nope")
+    assert writer.read() == "Test\n"
+
+
+def test_writers_reset(writer):
+    logger.configure(writers=1)
+    logger.configure(writers=0)
+    logger.add(writer, format="{message}", enqueue="thread")
+    logger.info("Test")
+    logger.complete()
+    assert writer.read() == "Test\n"
+    assert next(iter(logger._core.handlers.values()))._thread is not None
+
+
+def test_writers_replaced_pool_keeps_serving_handlers(writer):
+    logger.configure(writers=1)
+    logger.add(writer, format="{message}", enqueue="thread")
+    logger.configure(writers=2)
+    logger.info("Test")
+    logger.complete()
+    assert writer.read() == "Test\n"
+
+
+def test_writers_handlers_added_beforehand_keep_their_thread(writer):
+    logger.add(writer, format="{message}", enqueue="thread")
+    logger.configure(writers=2)
+    logger.info("Test")
+    logger.complete()
+
+    assert writer.read() == "Test\n"
+    assert next(iter(logger._core.handlers.values()))._thread is not None
+    assert pool_threads() == []
+
+
+def test_writers_idle_pool_stopped():
+    logger.configure(writers=2)
+    logger.configure(writers=3)
+    assert pool_threads() == []
+
+    i = logger.add(lambda _: None, enqueue="thread")
+    assert len(pool_threads()) == 3
+
+    logger.remove(i)
+    assert pool_threads() == []
+
+    i = logger.add(lambda _: None, enqueue="thread")
+    logger.info("Test")
+    logger.complete()
+    assert len(pool_threads()) == 3
+
+    logger.configure(writers=0)
+    assert len(pool_threads()) == 3
+
+    logger.remove(i)
+    assert pool_threads() == []
+
+
+def test_writers_ignored_by_multiprocessing_queue(writer):
+    logger.configure(writers=1)
+    logger.add(writer, format="{message}", enqueue=True)
+    logger.info("Test")
+    logger.complete()
+    assert writer.read() == "Test\n"
+    assert next(iter(logger._core.handlers.values()))._thread is not None
+
+
+@pytest.mark.parametrize("writers", ["1", True, 1.0])
+def test_invalid_writers_type(writers):
+    with pytest.raises(TypeError, match=r"Invalid writers, it should be an integer"):
+        logger.configure(writers=writers)
+
+
+def test_invalid_writers_value():
+    with pytest.raises(ValueError, match=r"Invalid writers, it should be a positive integer"):
+        logger.configure(writers=-1)
+
+
+@pytest.mark.parametrize(("writers", "exception"), [(-1, ValueError), ("2", TypeError)])
+def test_invalid_writers_keeps_configuration(writer, writers, exception):
+    logger.configure(writers=1)
+    pool = logger._core.writer_pool
+    logger.add(writer, format="{message}", enqueue="thread")
+
+    with pytest.raises(exception, match=r"Invalid writers"):
+        logger.configure(
+            handlers=[{"sink": writer, "format": "{level} {message}"}], writers=writers
+        )
+
+    logger.info("Test")
+    logger.complete()
+
+    assert writer.read() == "Test\n"
+    assert logger._core.writer_pool is pool
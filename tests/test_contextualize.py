@@ -211,6 +211,19 @@ def test_context_reset_despite_error(writer):
     assert writer.read() == "Division {'foobar': 456}\nError {}\n"
 
 
+def test_contextualize_does_not_acquire_core_lock(writer):
+    logger.add(writer, format="{message} {extra}")
+
+    with logger._core.lock:
+        with logger.contextualize(foobar=123):
+            pass
+
+    with logger.contextualize(foobar=456):
+        logger.info("Test")
+
+    assert writer.read() == "Test {'foobar': 456}\n"
+
+
 # There is not CI runner available for Python 3.5.2. Consequently, we are just
 # verifying third-library is properly imported to reach 100% coverage.
 def test_contextvars_fallback_352(monkeypatch):
@@ -1,9 +1,11 @@
 import asyncio
+import gc
 import logging
 import multiprocessing
 import re
 import sys
 import threading
+import warnings
 
 import pytest
 
@@ -675,3 +677,226 @@ def test_invalid_coroutine_sink_if_no_loop_with_enqueue():
         ),
     ):
         logger.add(async_writer, enqueue=True, loop=None)
+
+
+def test_batch(capsys):
+    batches = []
+
+    async def sink(messages):
+        await asyncio.sleep(0.01)
+        batches.append([message.record["message"] for message in messages])
+
+    async def main():
+        logger.add(sink, format="{message}", batch=2, catch=False)
+        for i in range(5):
+            logger.info("{}", i)
+        await logger.complete()
+
+    asyncio.run(main())
+
+    out, err = capsys.readouterr()
+    assert out == err == ""
+    assert batches == [["0", "1"], ["2", "3"], ["4"]]
+
+
+def test_batch_single_task(capsys):
+    tasks = set()
+
+    async def sink(messages):
+        tasks.add(asyncio.current_task())
+        await asyncio.sleep(0)
+
+    async def main():
+        logger.add(sink, batch=10, catch=False)
+        for _ in range(100):
+            logger.info("Message")
+        await logger.complete()
+
+    asyncio.run(main())
+
+    assert len(tasks) == 1
+
+
+def test_batch_messages_logged_while_writing(capsys):
+    async def sink(messages):
+        await asyncio.sleep(0.01)
+        print("".join(messages), end="")
+
+    async def main():
+        logger.add(sink, format="{message}", batch=10, catch=False)
+        logger.info("A")
+        await asyncio.sleep(0)
+        logger.info("B")
+        logger.info("C")
+        await logger.complete()
+
+    asyncio.run(main())
+
+    out, err = capsys.readouterr()
+    assert err == ""
+    assert out == "A\nB\nC\n"
+
+
+@pytest.mark.parametrize("max_in_flight", [1, 3])
+def test_max_in_flight(capsys, max_in_flight):
+    running = 0
+    peak = 0
+
+    async def sink(message):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        print(message, end="")
+
+    async def main():
+        logger.add(sink, format="{message}", max_in_flight=max_in_flight, catch=False)
+        for i in range(10):
+            logger.info("{}", i)
+        await logger.complete()
+
+    asyncio.run(main())
+
+    out, err = capsys.readouterr()
+    assert err == ""
+    assert sorted(out.splitlines()) == [str(i) for i in range(10)]
+    assert peak == max_in_flight
+
+
+def test_batch_from_another_thread(capsys):
+    loop = asyncio.new_event_loop()
+    outputs = []
+
+    async def sink(messages):
+        outputs.extend(str(message) for message in messages)
+
+    def worker():
+        for i in range(10):
+            logger.info("{}", i)
+
+    async def main():
+        logger.add(sink, format="{message}", batch=3, loop=loop, catch=False)
+        thread = threading.Thread(target=worker)
+        thread.start()
+        while thread.is_alive():
+            await asyncio.sleep(0.01)
+        thread.join()
+        await logger.complete()
+
+    with set_event_loop_context(loop):
+        loop.run_until_complete(main())
+    loop.close()
+
+    out, err = capsys.readouterr()
+    assert out == err == ""
+    assert outputs == ["%d\n" % i for i in range(10)]
+
+
+def test_batch_exception_caught(capsys):
+    async def sink(messages):
+        raise Exception("Oh no")
+
+    async def main():
+        logger.add(sink, batch=10, catch=True)
+        logger.info("Hello world")
+        await logger.complete()
+
+    asyncio.run(main())
+
+    out, err = capsys.readouterr()
+    lines = err.strip().splitlines()
+
+    assert out == ""
+    assert lines[0] == "--- Logging error in Loguru Handler #0 ---"
+    assert re.match(r"Record was: \{.*Hello world.*\}", lines[1])
+    assert lines[-2] == "Exception: Oh no"
+    assert lines[-1] == "--- End of logging error ---"
+
+
+def test_batch_exception_not_caught(capsys, caplog):
+    calls = []
+
+    async def sink(messages):
+        calls.append(len(messages))
+        raise ValueError("Oh no")
+
+    async def main():
+        logger.add(sink, batch=1, catch=False)
+        logger.info("Hello")
+        logger.info("World")
+        await logger.complete()
+
+    asyncio.run(main())
+
+    out, err = capsys.readouterr()
+    assert out == err == ""
+    assert calls == [1, 1]
+
+    records = caplog.records
+    assert len(records) == 2
+
+    for record in records:
+        assert "Logging error in Loguru Handler" not in record.getMessage()
+        exc_type, exc_value, _ = record.exc_info
+        assert exc_type is ValueError
+        assert str(exc_value) == "Oh no"
+
+
+def test_batch_tasks_cancelled_on_remove(capsys):
+    async def sink(messages):
+        await asyncio.sleep(0.1)
+        print(messages, end="")
+
+    async def main():
+        logger.add(sink, format="{message}", batch=10, max_in_flight=2, catch=False)
+        logger.info("A message")
+        await asyncio.sleep(0.01)
+        logger.remove()
+        await logger.complete()
+
+    asyncio.run(main())
+
+    out, err = capsys.readouterr()
+    assert out == err == ""
+
+
+@pytest.mark.parametrize("parameter", ["batch", "max_in_flight"])
+def test_batch_complete_from_sync_code(capsys, parameter):
+    calls = []
+
+    async def sink(argument):
+        calls.append(argument)
+
+    with new_event_loop_context() as loop:
+        logger.add(sink, format="{message}", loop=loop, catch=False, **{parameter: 10})
+        logger.info("A message")
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            logger.complete()
+            gc.collect()
+
+        loop.run_until_complete(logger.complete())
+
+    out, err = capsys.readouterr()
+    assert out == err == ""
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize("parameter", ["batch", "max_in_flight"])
+@pytest.mark.parametrize("value", [0, -1])
+def test_invalid_batch_parameter_value(parameter, value):
+    with pytest.raises(
+        ValueError, match=r"^Invalid %s, it should be a strictly positive" % parameter
+    ):
+        logger.add(async_writer, **{parameter: value})
+
+
+@pytest.mark.parametrize("parameter", ["batch", "max_in_flight"])
+@pytest.mark.parametrize("value", [1.0, "1", True])
+def test_invalid_batch_parameter_type(parameter, value):
+    with pytest.raises(
+        TypeError, match=r"^Invalid %s, it should be an integer or None" % parameter
+    ):
+        logger.add(async_writer, **{parameter: value})
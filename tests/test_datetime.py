@@ -253,6 +253,53 @@ def test_freezegun_mocking(writer):
     assert writer.read() == "[2000 01 01 18:00:05] Frozen\n"
 
 
+def test_local_timezone_is_cached(writer, freeze_time, monkeypatch):
+    with freeze_time("2011-01-02 03:04:05.6", ("ABC", 7200)):
+        mock = Mock(wraps=loguru._datetime.localtime)
+        monkeypatch.setattr(loguru._datetime, "localtime", mock)
+
+        logger.add(writer, format="{time:HH mm ss SSSSSS ZZ zz} {message}")
+        logger.debug("A")
+        logger.debug("B")
+
+        assert mock.call_count == 1
+        assert writer.read() == "03 04 05 600000 +0200 ABC A\n03 04 05 600000 +0200 ABC B\n"
+
+
+def test_local_timezone_cache_invalidated_on_next_minute(writer, freeze_time, monkeypatch):
+    with freeze_time("2011-01-02 03:04:59", ("ABC", 7200)) as frozen:
+        mock = Mock(wraps=loguru._datetime.localtime)
+        monkeypatch.setattr(loguru._datetime, "localtime", mock)
+
+        logger.add(writer, format="{time:HH mm ss ZZ zz} {message}")
+        logger.debug("A")
+        frozen.tick()
+        logger.debug("B")
+
+        assert mock.call_count == 2
+        assert writer.read() == "03 04 59 +0200 ABC A\n03 05 00 +0200 ABC B\n"
+
+
+@pytest.mark.parametrize("tz", ["UTC", "utc"])
+def test_utc_timezone(writer, monkeypatch, tz):
+    aware_now = loguru._datetime._load_aware_now_function(tz)
+    monkeypatch.setattr(loguru._datetime, "_aware_now", aware_now)
+    logger.add(writer, format="{time:ZZ zz} {message}")
+    logger.debug("Test")
+
+    assert writer.read() == "+0000 %s Test\n" % UTC_NAME
+
+
+@pytest.mark.parametrize("tz", [None, "local", "LOCAL"])
+def test_local_timezone(tz):
+    assert loguru._datetime._load_aware_now_function(tz) is loguru._datetime._aware_now_local
+
+
+def test_invalid_timezone():
+    with pytest.raises(ValueError, match=r"Invalid environment variable 'LOGURU_TZ'"):
+        loguru._datetime._load_aware_now_function("Europe/Paris")
+
+
 @pytest.mark.parametrize(
     "time_format", ["ss.SSSSSSS", "SS.SSSSSSSS.SS", "HH:mm:ss.SSSSSSSSS", "SSSSSSSSSS"]
 )
@@ -34,6 +34,13 @@ def test_int(monkeypatch):
         assert env(key, int) == 42
 
 
+def test_float(monkeypatch):
+    with monkeypatch.context() as context:
+        key = "VALID_FLOAT"
+        context.setenv(key, "0.5")
+        assert env(key, float) == 0.5
+
+
 @pytest.mark.parametrize("value", ["", "a"])
 def test_invalid_int(value, monkeypatch):
     with monkeypatch.context() as context:
@@ -46,6 +53,18 @@ def test_invalid_int(value, monkeypatch):
             env(key, int)
 
 
+@pytest.mark.parametrize("value", ["", "a"])
+def test_invalid_float(value, monkeypatch):
+    with monkeypatch.context() as context:
+        key = "INVALID_FLOAT"
+        context.setenv(key, value)
+        with pytest.raises(
+            ValueError,
+            match=r"^Invalid environment variable 'INVALID_FLOAT' \(expected a number\): '[^']*'$",
+        ):
+            env(key, float)
+
+
 @pytest.mark.parametrize("value", ["", "a"])
 def test_invalid_bool(value, monkeypatch):
     with monkeypatch.context() as context:
@@ -63,4 +82,4 @@ def test_invalid_type(monkeypatch):
         key = "INVALID_TYPE"
         context.setenv(key, "42.0")
         with pytest.raises(ValueError, match=r"^The requested type '[^']+' is not supported"):
-            env(key, float)
+            env(key, complex)
@@ -0,0 +1,95 @@
+import pytest
+
+from loguru import logger
+
+
+def test_no_handler():
+    assert not logger.is_enabled("CRITICAL")
+
+
+@pytest.mark.parametrize(
+    ("level", "expected"),
+    [("TRACE", False), ("DEBUG", False), ("INFO", True), (19, False), (20, True), (50, True)],
+)
+def test_handler_level(writer, level, expected):
+    logger.add(writer, level="INFO")
+    assert logger.is_enabled(level) is expected
+
+
+def test_handlers_minimum_level(writer):
+    logger.add(writer, level="ERROR")
+    logger.add(writer, level="WARNING")
+    assert not logger.is_enabled("INFO")
+    assert logger.is_enabled("WARNING")
+
+
+@pytest.mark.parametrize(
+    ("filter", "expected"),
+    [
+        ("tests", True),
+        ("tests.test_is_enabled", True),
+        ("other", False),
+        ({"": False, "tests": "DEBUG"}, True),
+        ({"tests": "WARNING"}, False),
+        ({"tests.test_is_enabled": False}, False),
+        (lambda r: False, True),
+    ],
+)
+def test_handler_filter(writer, filter, expected):
+    logger.add(writer, level="DEBUG", filter=filter)
+    assert logger.is_enabled("INFO") is expected
+
+
+def test_disabled_module(writer):
+    logger.add(writer)
+    logger.disable("tests")
+    assert not logger.is_enabled("INFO")
+    logger.enable("tests.test_is_enabled")
+    assert logger.is_enabled("INFO")
+
+
+def test_updated_after_configuration_change(writer):
+    assert not logger.is_enabled("DEBUG")
+    i = logger.add(writer, level="DEBUG")
+    assert logger.is_enabled("DEBUG")
+    logger.remove(i)
+    assert not logger.is_enabled("DEBUG")
+
+
+def test_patcher_may_change_name(writer):
+    logger.add(writer, level="DEBUG", filter="other")
+    assert not logger.is_enabled("INFO")
+    assert logger.patch(lambda r: r.update(name="other")).is_enabled("INFO")
+
+
+def test_depth(writer):
+    def function():
+        return logger.opt(depth=1).is_enabled("INFO")
+
+    logger.add(writer, filter="tests")
+    assert function()
+
+    logger.disable("tests")
+    assert not function()
+
+
+def test_custom_level(writer):
+    logger.level("foo", no=15)
+    logger.add(writer, level=15)
+    assert logger.is_enabled("foo")
+
+
+def test_unknown_level():
+    with pytest.raises(ValueError, match=r"Level 'foo' does not exist"):
+        logger.is_enabled("foo")
+
+
+@pytest.mark.parametrize("level", [3.4, object()])
+def test_invalid_level_type(level):
+    with pytest.raises(TypeError, match=r"Invalid level, it should be an integer or a string"):
+        logger.is_enabled(level)
+
+
+def test_invalid_level_value():
+    with pytest.raises(ValueError, match=r"Invalid level value, it should be a positive integer"):
+        logger.is_enabled(-1)
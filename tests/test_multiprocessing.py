@@ -8,10 +8,13 @@ import time
 
 import pytest
 
+import loguru
 from loguru import logger
 
 from .conftest import new_event_loop_context
 
+skip_on_windows = pytest.mark.skipif(os.name == "nt", reason="Windows does not support forking")
+
 
 @pytest.fixture
 def fork_context():
@@ -257,6 +260,57 @@ def test_process_inheritance(fork_context):
     assert writer.read() == "Child\nMain\n"
 
 
+@pytest.mark.skipif(sys.version_info < (3, 8), reason="No 'multiprocessing.shared_memory' module")
+@pytest.mark.parametrize("context_name", ["spawn", pytest.param("fork", marks=skip_on_windows)])
+def test_process_shared_memory(context_name):
+    context = multiprocessing.get_context(context_name)
+    writer = Writer()
+
+    logger.add(writer, context=context, format="{message}", enqueue="shared_memory", catch=False)
+
+    process = context.Process(target=subworker, args=(logger,))
+    process.start()
+    process.join()
+
+    assert process.exitcode == 0
+
+    logger.info("Main")
+    logger.remove()
+
+    assert writer.read() == "Child\nMain\n"
+
+
+def subworker_shared_memory_many(logger_, i):
+    for j in range(50):
+        logger_.info("{} {}", i, j)
+
+
+@pytest.mark.skipif(os.name == "nt", reason="Windows does not support forking")
+@pytest.mark.skipif(sys.version_info < (3, 8), reason="No 'multiprocessing.shared_memory' module")
+def test_process_shared_memory_many_producers(fork_context, monkeypatch):
+    monkeypatch.setattr(loguru._defaults, "LOGURU_SHARED_MEMORY_SIZE", 1000)
+    writer = Writer()
+
+    logger.add(writer, context=fork_context, format="{message}", enqueue="shared_memory")
+
+    processes = [
+        fork_context.Process(target=subworker_shared_memory_many, args=(logger, i))
+        for i in range(4)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    logger.remove()
+
+    assert all(process.exitcode == 0 for process in processes)
+
+    lines = [tuple(map(int, line.split())) for line in writer.read().splitlines()]
+    for i in range(4):
+        assert [j for k, j in lines if k == i] == list(range(50))
+
+
 def test_remove_in_child_process_spawn(spawn_context):
     writer = Writer()
 
@@ -292,6 +346,97 @@ def test_remove_in_child_process_fork(fork_context):
     assert writer.read() == "Child\nMain\n"
 
 
+@pytest.mark.skipif(os.name == "nt", reason="Windows does not support forking")
+def test_enqueue_thread_in_child_process_inheritance(fork_context, tmp_path):
+    filepath = tmp_path / "test.log"
+
+    logger.add(filepath, format="{message}", enqueue="thread", catch=False)
+
+    process = fork_context.Process(target=subworker_remove_inheritance)
+    process.start()
+    process.join()
+
+    assert process.exitcode == 0
+
+    logger.info("Main")
+    logger.remove()
+
+    assert filepath.read_text() == "Child\nMain\n"
+
+
+@pytest.mark.skipif(os.name == "nt", reason="Windows does not support forking")
+def test_writer_pool_in_child_process_inheritance(fork_context, tmp_path):
+    filepath = tmp_path / "test.log"
+
+    logger.configure(writers=2)
+    logger.add(filepath, format="{message}", enqueue="thread", catch=False)
+    logger.info("Parent")
+    logger.complete()
+
+    process = fork_context.Process(target=subworker_remove_inheritance)
+    process.start()
+    process.join()
+
+    assert process.exitcode == 0
+
+    logger.info("Main")
+    logger.remove()
+
+    assert filepath.read_text() == "Parent\nChild\nMain\n"
+
+
+def subworker_on_fork_restart():
+    handler = next(iter(logger._core.handlers.values()))
+    assert handler._owner_process_pid == os.getpid()
+    logger.info("Child")
+
+
+@pytest.mark.skipif(os.name == "nt", reason="Windows does not support forking")
+@pytest.mark.parametrize("enqueue", [True, "thread"])
+def test_on_fork_restart_in_child_process_inheritance(fork_context, tmp_path, enqueue):
+    filepath = tmp_path / "test.log"
+
+    logger.add(
+        filepath,
+        format="{message}",
+        context=fork_context,
+        enqueue=enqueue,
+        on_fork="restart",
+        catch=False,
+    )
+    logger.info("Parent")
+    logger.complete()
+
+    process = fork_context.Process(target=subworker_on_fork_restart)
+    process.start()
+    process.join()
+
+    assert process.exitcode == 0
+
+    logger.info("Main")
+    logger.remove()
+
+    assert filepath.read_text() == "Parent\nChild\nMain\n"
+
+
+@pytest.mark.skipif(os.name == "nt", reason="Windows does not support forking")
+def test_on_fork_share_in_child_process_inheritance(fork_context):
+    writer = Writer()
+
+    logger.add(writer, context=fork_context, format="{message}", enqueue=True, on_fork="share")
+
+    process = fork_context.Process(target=subworker_inheritance)
+    process.start()
+    process.join()
+
+    assert process.exitcode == 0
+
+    logger.info("Main")
+    logger.remove()
+
+    assert writer.read() == "Child\nMain\n"
+
+
 @pytest.mark.skipif(os.name == "nt", reason="Windows does not support forking")
 def test_remove_in_child_process_inheritance(fork_context):
     writer = Writer()
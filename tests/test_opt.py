@@ -1,4 +1,5 @@
 import sys
+import weakref
 from unittest.mock import MagicMock
 
 import pytest
@@ -443,6 +444,59 @@ def test_colors_with_invalid_indexing(writer, colorize, message):
         logger.opt(colors=True).debug(message, 1, 2, 3)
 
 
+@pytest.mark.parametrize("colorize", [True, False])
+def test_colors_with_cached_template(writer, colorize):
+    from loguru._colorizer import parse_template
+
+    logger.add(writer, format="{message}", colorize=colorize)
+    message = "<red>{}</red> fetched <b>{count:03d}</b> rows in {:.1f}ms"
+
+    logger.opt(colors=True).info(message, "foo", 1.23, count=1)
+    hits = parse_template.cache_info().hits
+    logger.opt(colors=True).info(message, "bar", 4.56, count=2)
+
+    assert parse_template.cache_info().hits == hits + 1
+    assert writer.read() == parse(
+        "<red>foo</red> fetched <b>001</b> rows in 1.2ms\n"
+        "<red>bar</red> fetched <b>002</b> rows in 4.6ms\n",
+        strip=not colorize,
+    )
+
+
+@pytest.mark.parametrize(
+    "message", ["<b>{0:0{1}d}</b>", "{} {0}", "<red>{}", "{", "<b>{}</r>", "<foobar>{}</foobar>"]
+)
+def test_colors_with_uncached_template(message):
+    from loguru._colorizer import parse_template
+
+    assert parse_template(message) is None
+
+
+@pytest.mark.parametrize("args", [(), ("foo",)])
+def test_colors_with_long_message_not_cached(writer, args):
+    from loguru._colorizer import MAX_CACHED_MESSAGE_LENGTH, parse_simple_message, parse_template
+
+    logger.add(writer, format="{message}", colorize=False)
+    message = "<red>{}</red>" + "x" * MAX_CACHED_MESSAGE_LENGTH
+    misses = parse_template.cache_info().misses + parse_simple_message.cache_info().misses
+
+    logger.opt(colors=True).info(message, *args)
+
+    assert parse_template.cache_info().misses + parse_simple_message.cache_info().misses == misses
+    assert writer.read() == ("foo" if args else "{}") + "x" * MAX_CACHED_MESSAGE_LENGTH + "\n"
+
+
+@pytest.mark.parametrize("colorize", [True, False])
+def test_colors_with_cached_template_missing_argument(writer, colorize):
+    logger.add(writer, format="{message}", colorize=colorize)
+
+    for _ in range(2):
+        with pytest.raises(ValueError, match=r"could not be formatted with the provided arguments"):
+            logger.opt(colors=True).info("<red>{}</red> {}", "foo")
+
+    assert writer.read() == ""
+
+
 def test_raw(writer):
     logger.add(writer, format="", colorize=True)
     logger.opt(raw=True).info("Raw {}", "message")
@@ -636,3 +690,62 @@ def test_overridden_message_ignore_colors(writer):
     logger.opt(colors=True).info("<red>Message</red>")
 
     assert writer.read() == "Message <blue>[Ignored]</blue> </xyz>\n"
+
+
+def test_opt_returns_cached_logger(writer):
+    logger.add(writer, format="{message} {extra}")
+
+    first = logger.bind(a=1).opt(depth=0, raw=False)
+    assert logger.opt(depth=1) is logger.opt(depth=1)
+    assert logger.opt(depth=1) is not logger.opt(depth=2)
+    assert logger.opt(exception=True) is logger.opt(exception=True)
+    assert logger.bind(a=1).opt() is not logger.opt()
+
+    first.info("Test")
+    assert writer.read() == "Test {'a': 1}\n"
+
+
+def test_opt_with_exception_object_not_cached(writer):
+    logger.add(writer, format="{message}")
+    error = ValueError("Error")
+
+    first = logger.opt(exception=error)
+    second = logger.opt(exception=error)
+
+    assert first is not second
+    assert logger._opt_cache is None
+
+
+def test_opt_cache_bounded():
+    for depth in range(100):
+        logger.opt(depth=depth)
+
+    assert len(logger._opt_cache) == 32
+    assert logger.opt(depth=99) is logger.opt(depth=99)
+
+
+def test_opt_cache_no_reference_cycle():
+    child = logger.bind(a=1)
+    child.opt(depth=1)
+    reference = weakref.ref(child)
+    del child
+    assert reference() is None
+
+
+@pytest.mark.parametrize("first", [True, 1, 1.0])
+def test_opt_cache_depth_typed(writer, first):
+    def wrapper(logger_):
+        logger_.info("Test")
+
+    logger.add(writer, format="{function} {message}")
+
+    logger.opt(depth=first)
+    assert logger.opt(depth=1) is not logger.opt(depth=1.0)
+
+    wrapper(logger.opt(depth=True))
+    wrapper(logger.opt(depth=1))
+
+    with pytest.raises(TypeError):
+        wrapper(logger.opt(depth=1.0))
+
+    assert writer.read() == "test_opt_cache_depth_typed Test\n" * 2
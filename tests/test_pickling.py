@@ -109,6 +109,27 @@ def test_pickling_function_handler(capsys):
     assert err == ""
 
 
+def test_pickling_enqueue_thread_handler(capsys):
+    logger.add(print_, format="{level} - {function} - {message}", enqueue="thread")
+    with copied_logger_though_pickle(logger) as dupe_logger:
+        dupe_logger.debug("A message")
+        dupe_logger.complete()
+        out, err = capsys.readouterr()
+        assert out == "DEBUG - test_pickling_enqueue_thread_handler - A message\n"
+        assert err == ""
+
+
+def test_pickling_enqueue_thread_handler_with_writer_pool(capsys):
+    logger.configure(writers=1)
+    logger.add(print_, format="{level} - {function} - {message}", enqueue="thread")
+    with copied_logger_though_pickle(logger) as dupe_logger:
+        dupe_logger.debug("A message")
+        dupe_logger.complete()
+        out, err = capsys.readouterr()
+        assert out == "DEBUG - test_pickling_enqueue_thread_handler_with_writer_pool - A message\n"
+        assert err == ""
+
+
 def test_pickling_coroutine_function_handler(capsys):
     logger.add(async_print, format="{level} - {function} - {message}")
 
@@ -348,3 +369,14 @@ def test_pickling_no_error(method):
     pickled = pickle.dumps(method)
     unpickled = pickle.loads(pickled)
     assert unpickled
+
+
+def test_pickling_logger_with_cached_opt(writer):
+    logger.opt(depth=0)
+
+    unpickled = pickle.loads(pickle.dumps(logger))
+    assert unpickled._opt_cache is None
+
+    unpickled.add(writer, format="{message}")
+    unpickled.opt(depth=0).info("Test")
+    assert writer.read() == "Test\n"
@@ -1,4 +1,12 @@
+import copy
+import datetime
+import os
+import pickle
 import re
+import sys
+import threading
+
+import pytest
 
 import loguru._recattrs as recattrs
 from loguru import logger
@@ -75,3 +83,476 @@ def test_exception_repr():
     exception = recattrs.RecordException(ValueError, ValueError("Nope"), None)
     regex = r"\(type=<class 'ValueError'>, value=ValueError\('Nope',?\), traceback=None\)"
     assert re.fullmatch(regex, repr(exception))
+
+
+def test_lazy_record_values_computed_on_access():
+    records = []
+
+    def sink(message):
+        records.append(message.record)
+
+    logger.add(sink, format="{time} {level} {message}")
+    logger.bind(foo="bar").info("Test {abc}", abc=123)
+
+    record = records[0]
+    assert record["extra"] == {"foo": "bar", "abc": 123}
+    assert record["file"].name == "test_recattr.py"
+    assert record["module"] == "test_recattr"
+    assert record["thread"].id == threading.get_ident()
+    assert record["thread"].name == threading.current_thread().name
+    assert record["process"].id == os.getpid()
+    assert record["elapsed"].total_seconds() > 0
+
+
+def test_lazy_record_behaves_like_dict():
+    records = []
+
+    def sink(message):
+        records.append(message.record)
+
+    logger.add(sink, format="{message}")
+    logger.info("Test")
+
+    record = records[0]
+    assert isinstance(record, dict)
+    assert len(record) == 13
+    assert "thread" in record
+    assert "foobar" not in record
+    assert record.get("module") == "test_recattr"
+    assert record.get("foobar", 42) == 42
+    assert set(record) == set(record.keys()) == set(dict(record)) == set({**record})
+    assert record == dict(record.items())
+    assert repr(pickle.loads(pickle.dumps(record))) == repr(record)
+    assert repr(copy.deepcopy(record)) == repr(record)
+
+
+def test_lazy_record_thread_resolved_from_caller_thread():
+    records = []
+
+    def sink(message):
+        records.append(message.record)
+
+    def worker():
+        logger.info("From worker")
+
+    logger.add(sink, format="{message}")
+
+    thread = threading.Thread(target=worker, name="LoguruWorker")
+    thread.start()
+    thread.join()
+
+    assert records[0]["thread"].name == "LoguruWorker"
+    assert records[0]["thread"].id == thread.ident
+
+
+def test_lazy_record_extra_not_polluted_by_record_option(writer):
+    records = []
+
+    def sink(message):
+        records.append(message.record)
+
+    logger.add(sink, format="{message}")
+    logger.opt(record=True).info("{record[line]} {abc}", abc=1)
+
+    assert records[0]["extra"] == {"abc": 1}
+
+
+def test_lazy_record_missing_key_error():
+    records = []
+
+    def sink(message):
+        records.append(message.record)
+
+    logger.add(sink, format="{message}")
+    logger.info("Test")
+
+    with pytest.raises(KeyError):
+        records[0]["foobar"]
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "expected"),
+    [
+        ({"format": "{time} {level} {message}"}, frozenset()),
+        ({"format": "{thread} {extra[a]} {message:{module}}"}, {"thread", "module"}),
+        ({"format": "{extra} {message}"}, {"extra"}),
+        ({"format": "{extra.copy} {message}"}, {"extra"}),
+        ({"format": "{message}", "filter": "tests"}, frozenset()),
+        ({"format": "{message}", "filter": {"tests": "INFO"}}, frozenset()),
+        ({"format": "{message}", "filter": lambda r: True}, None),
+        ({"format": lambda r: "{message}\n"}, None),
+        ({"format": "{message}", "serialize": True}, None),
+    ],
+)
+def test_record_fields_required_by_handlers(writer, kwargs, expected):
+    logger.add(writer, **kwargs)
+    assert logger._core.record_fields == expected
+
+
+def test_record_fields_union_of_handlers(writer):
+    logger.add(writer, format="{thread}")
+    logger.add(writer, format="{file}")
+    assert logger._core.record_fields == {"thread", "file"}
+    i = logger.add(writer, format=lambda r: "{message}")
+    assert logger._core.record_fields is None
+    logger.remove(i)
+    assert logger._core.record_fields == {"thread", "file"}
+
+
+def test_record_attributes_shared_between_calls():
+    records = []
+
+    def sink(message):
+        records.append(message.record)
+
+    logger.add(sink, format="{message}")
+    logger.info("A")
+    logger.info("B")
+
+    first, second = records
+    for key in ("level", "file", "thread", "process"):
+        assert first[key] is second[key]
+
+
+@pytest.mark.parametrize(
+    ("key", "attribute"),
+    [("level", "name"), ("file", "name"), ("thread", "name"), ("process", "name")],
+)
+def test_record_attributes_shared_not_modified_by_filter(writer, capsys, key, attribute):
+    def filter_(record):
+        setattr(record[key], attribute, "Modified")
+        return True
+
+    logger.add(writer, format="{%s.%s} {message}" % (key, attribute))
+    logger.add(lambda _: None, filter=filter_, catch=True)
+    logger.info("A")
+    logger.info("B")
+
+    _, err = capsys.readouterr()
+    assert "Modified" not in writer.read()
+    assert err.count("AttributeError: The '%s' attribute can't be modified" % attribute) == 2
+
+
+@pytest.mark.parametrize("key", ["level", "file", "thread", "process"])
+def test_record_attributes_shared_modified_by_sink(key):
+    errors = []
+
+    def sink(message):
+        try:
+            message.record[key].name = "Modified"
+        except AttributeError as e:
+            errors.append(str(e))
+
+    logger.add(sink, format="{message}", catch=False)
+    logger.info("Test")
+
+    assert errors == [
+        "The 'name' attribute can't be modified because it's shared between records, "
+        "it should be done by a patcher instead"
+    ]
+
+
+def test_record_attributes_shared_replaced_by_sink(writer):
+    def sink(message):
+        message.record["level"] = recattrs.RecordLevel("Modified", 20, "")
+
+    logger.add(sink, format="{message}")
+    logger.add(writer, format="{level} {message}")
+    logger.info("Test")
+    logger.info("Test")
+
+    assert writer.read() == "Modified Test\nModified Test\n"
+    assert logger._core.levels_lookup["INFO"][4].name == "INFO"
+
+
+def test_record_attributes_shared_unpickled_as_regular_ones():
+    records = []
+    logger.add(lambda m: records.append(m.record), format="{message}")
+    logger.info("A")
+
+    for key in ("level", "file", "thread", "process"):
+        unpickled = pickle.loads(pickle.dumps(records[0][key]))
+        unpickled.name = "Modified"
+        assert unpickled.name == "Modified"
+        assert records[0][key].name != "Modified"
+
+
+def test_record_attributes_shared_after_logger_unpickled(writer):
+    unpickled = pickle.loads(pickle.dumps(logger))
+    unpickled.add(writer, format="{level} {message}")
+    unpickled.info("A")
+
+    with pytest.raises(AttributeError):
+        unpickled._core.levels_lookup["INFO"][4].name = "Modified"
+
+    assert writer.read() == "INFO A\n"
+
+
+def test_record_attributes_not_shared_with_patchers():
+    records = []
+
+    def sink(message):
+        records.append(message.record)
+
+    def patcher(record):
+        record["level"].name = "PATCHED"
+        record["file"].name = "patched.py"
+
+    logger.add(sink, format="{message}")
+    logger.info("A")
+    logger.patch(patcher).info("B")
+    logger.info("C")
+
+    first, second, third = records
+    assert first["level"].name == third["level"].name == "INFO"
+    assert first["file"].name == third["file"].name == "test_recattr.py"
+    assert second["level"].name == "PATCHED"
+    assert second["file"].name == "patched.py"
+    for key in ("level", "file", "thread", "process"):
+        assert first[key] is not second[key]
+        assert first[key] is third[key]
+
+
+def test_record_thread_updated_when_renamed():
+    threads = []
+
+    def sink(message):
+        threads.append(message.record["thread"])
+
+    logger.add(sink, format="{message}")
+
+    thread = threading.current_thread()
+    name = thread.name
+
+    try:
+        logger.info("A")
+        thread.name = "Renamed"
+        logger.info("B")
+    finally:
+        thread.name = name
+
+    assert threads[0].name == name
+    assert threads[1].name == "Renamed"
+
+
+def test_record_level_updated_when_changed(writer):
+    logger.add(writer, format="{level.icon} {message}")
+    logger.level("Foo", no=12, icon="A")
+    logger.log("Foo", "A")
+    logger.level("Foo", icon="B")
+    logger.log("Foo", "B")
+
+    assert writer.read() == "A A\nB B\n"
+
+
+def test_lazy_record_keys_order():
+    records = []
+
+    def sink(message):
+        records.append(message.record)
+
+    logger.add(sink, format="{thread} {message}")
+    logger.info("Test")
+
+    record = records[0]
+    record["process"]
+    assert list(record) == sorted(record)
+
+
+def test_lazy_record_keys_order_after_reading_each_key():
+    records = []
+
+    def sink(message):
+        records.append(message.record)
+
+    logger.add(sink, format="{message}")
+    logger.info("Test")
+
+    record = records[0]
+    for key in reversed(sorted(recattrs.Record.lazy_keys)):
+        record[key]
+
+    assert list(record) == sorted(record)
+    assert repr(record) == repr(dict(sorted(record.items())))
+
+
+def test_lazy_record_keys_readable_while_filled_concurrently():
+    records = []
+    errors = []
+    done = threading.Event()
+
+    def sink(message):
+        records.append(message.record)
+
+    def reader():
+        while not done.is_set():
+            for record in records:
+                try:
+                    record["level"]
+                except KeyError as e:
+                    errors.append(e)
+
+    logger.add(sink, format="{message}")
+    for _ in range(1000):
+        logger.info("Test")
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        thread = threading.Thread(target=reader)
+        thread.start()
+        for record in records:
+            record.keys()
+        done.set()
+        thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert errors == []
+    assert all(list(record) == sorted(record) for record in records)
+
+
+@pytest.mark.parametrize(
+    "attribute",
+    [
+        recattrs.RecordLevel("DEBUG", 10, "!"),
+        recattrs.RecordFile("file.py", "/path/to/file.py"),
+        recattrs.RecordThread(123, "Thread"),
+        recattrs.RecordProcess(456, "Process"),
+    ],
+)
+def test_attribute_pickling(attribute):
+    unpickled = pickle.loads(pickle.dumps(attribute))
+    assert type(unpickled) is type(attribute)
+    assert repr(unpickled) == repr(attribute)
+
+
+def test_record_pickling_with_additional_keys():
+    records = []
+
+    def sink(message):
+        records.append(message.record)
+
+    logger.add(sink, format="{message}")
+    logger.patch(lambda r: r.update(foo="bar")).info("Test")
+
+    unpickled = pickle.loads(pickle.dumps(records[0]))
+    assert isinstance(unpickled, recattrs.Record)
+    assert list(unpickled) == list(records[0])
+    assert unpickled["foo"] == "bar"
+    assert repr(unpickled) == repr(records[0])
+
+
+def test_extra_values_retrieved_without_building_extra(writer):
+    messages = []
+    logger.add(messages.append, format="{extra[a]} {extra[b]} {extra[c]} {message}")
+    logger.configure(extra={"a": 0, "b": 0, "c": 0})
+
+    with logger.contextualize(b=1, c=1):
+        logger.bind(c=2).info("Test")
+
+    assert messages[0] == "0 1 2 Test\n"
+    assert dict.__getitem__(messages[0].record, "extra") is recattrs.PENDING
+    assert messages[0].record["extra"] == {"a": 0, "b": 1, "c": 2}
+
+
+def test_extra_values_not_changed_by_configure_after_logging():
+    records = []
+    logger.add(lambda m: records.append(m.record), format="{message}")
+
+    logger.configure(extra={"a": 0})
+    logger.info("First")
+    logger.info("Second")
+    logger.configure(extra={"a": 1, "b": 1})
+
+    assert dict.__getitem__(records[0], "extra") is recattrs.PENDING
+    assert records[0]["extra"] == {"a": 0}
+    assert records[1]._get_extra("a") == 0
+    with pytest.raises(KeyError):
+        records[1]._get_extra("b")
+
+
+def test_extra_values_retrieved_from_patched_extra(writer):
+    logger.add(writer, format="{extra[a]} {message}")
+    logger.patch(lambda r: r["extra"].update(a=1)).bind(a=0).info("Test")
+    logger.patch(lambda r: r.update(extra={"a": 2})).bind(a=0).info("Test")
+
+    assert writer.read() == "1 Test\n2 Test\n"
+
+
+def test_extra_values_retrieved_from_captured_kwargs(writer):
+    logger.add(writer, format="{extra[a]} {message}")
+    logger.bind(a=0).info("Test {a}", a=1)
+
+    assert writer.read() == "1 Test 1\n"
+
+
+@pytest.mark.parametrize(
+    "tzinfo",
+    [
+        datetime.timezone.utc,
+        datetime.timezone(datetime.timedelta(hours=2), "CEST"),
+        datetime.timezone(datetime.timedelta(hours=-5, microseconds=1)),
+    ],
+)
+def test_record_pickling_compact(tzinfo):
+    records = []
+
+    def sink(message):
+        records.append(message.record)
+
+    def patch(record):
+        record["time"] = record["time"].astimezone(tzinfo)
+
+    logger.add(sink, format="{message}")
+    logger.patch(patch).bind(foo=1).info("Test")
+
+    record = records[0]
+    first, second = (pickle.loads(pickle.dumps(record)) for _ in range(2))
+
+    assert record._to_compact_values() is not None
+    assert repr(first) == repr(record)
+    assert type(first["time"]) is type(record["time"])
+    assert first["time"].tzinfo is second["time"].tzinfo
+    assert first["module"] is second["module"]
+    for key in ("level", "file", "thread", "process"):
+        assert first[key] is not second[key]
+
+
+@pytest.mark.parametrize(
+    "patch",
+    [
+        lambda r: r.update(module="other"),
+        lambda r: r.update(elapsed=r["elapsed"].total_seconds()),
+        lambda r: r.update(time=r["time"].replace(tzinfo=None)),
+        lambda r: r["file"].__setattr__("name", "other.py"),
+    ],
+)
+def test_record_pickling_not_compact(patch):
+    records = []
+
+    def sink(message):
+        records.append(message.record)
+
+    logger.add(sink, format="{message}")
+    logger.patch(patch).info("Test")
+
+    record = records[0]
+    unpickled = pickle.loads(pickle.dumps(record))
+
+    assert record._to_compact_values() is None
+    assert repr(unpickled) == repr(record)
+
+
+def test_message_pickling():
+    messages = []
+    logger.add(messages.append, format="{message}", enqueue="thread", priority="INFO")
+    logger.info("Test")
+    logger.complete()
+
+    unpickled = pickle.loads(pickle.dumps(messages[0]))
+
+    assert unpickled == "Test\n"
+    assert type(unpickled) is type(messages[0])
+    assert unpickled.sequence == 0
+    assert repr(unpickled.record) == repr(messages[0].record)